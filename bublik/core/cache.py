@@ -3,54 +3,158 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 import functools
+import hashlib
+import lzma
+import pickle
+import threading
+import time
 from typing import ClassVar
+import uuid
+import zlib
 
+from django.conf import settings
 from django.core.cache import caches
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.db.models import Q
 from django.middleware.cache import CacheMiddleware
 from django.utils.cache import add_never_cache_headers
+from django.utils.functional import cached_property
 
 from bublik.core.run.tests_organization import get_run_root
 from bublik.core.utils import key_value_transforming
 from bublik.data import models
 
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class RunCacheCodec:
+    """
+    Serializes and compresses run cache data.
+
+    The encoded data start with a header naming the serializer and the compressor,
+    so the data are decoded by the header no matter what codec is configured now.
+    The msgpack serializer is for JSON-like data only (tuples become lists) and
+    requires the msgpack package.
+    """
+
+    SERIALIZERS: ClassVar[dict] = {'pickle': b'p', 'msgpack': b'm'}
+    COMPRESSORS: ClassVar[dict] = {'none': b'n', 'zlib': b'z', 'lzma': b'x'}
+    DEFAULT_LEVELS: ClassVar[dict] = {'zlib': 1, 'lzma': 0}
+
+    def __init__(self, serializer='pickle', compressor='none', level=None):
+        if serializer not in self.SERIALIZERS:
+            msg = f'Unknown run cache serializer: {serializer}'
+            raise ImproperlyConfigured(msg)
+        if compressor not in self.COMPRESSORS:
+            msg = f'Unknown run cache compressor: {compressor}'
+            raise ImproperlyConfigured(msg)
+        if serializer == 'msgpack' and msgpack is None:
+            msg = 'The msgpack run cache serializer requires the msgpack package'
+            raise ImproperlyConfigured(msg)
+        self.serializer = serializer
+        self.compressor = compressor
+        self.level = self.DEFAULT_LEVELS.get(compressor) if level is None else level
+        self.header = self.SERIALIZERS[serializer] + self.COMPRESSORS[compressor]
+
+    def __str__(self):
+        if self.compressor == 'none':
+            return self.serializer
+        return f'{self.serializer}+{self.compressor}:{self.level}'
+
+    def encode(self, data):
+        if self.serializer == 'msgpack':
+            value = msgpack.packb(data, use_bin_type=True)
+        else:
+            value = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if self.compressor == 'zlib':
+            value = zlib.compress(value, self.level)
+        elif self.compressor == 'lzma':
+            value = lzma.compress(value, preset=self.level)
+
+        return self.header + value
+
+    @classmethod
+    def decode(cls, value):
+        serializer, compressor, value = value[:1], value[1:2], value[2:]
+
+        if compressor == cls.COMPRESSORS['zlib']:
+            value = zlib.decompress(value)
+        elif compressor == cls.COMPRESSORS['lzma']:
+            value = lzma.decompress(value)
+
+        if serializer == cls.SERIALIZERS['msgpack']:
+            return msgpack.unpackb(value, raw=False, strict_map_key=False)
+        return pickle.loads(value)
+
+
 class RunCache:
     """
-    Caches run data with a key {data_key}.{run_id}.
+    Caches run data with a key {run_id}.{data_key}.{data_generation}.{run_generation}.
+
+    Generations are counters kept in the cache: one per run and one per data key
+    for all runs. Incrementing a generation invalidates the data of the run or
+    the data of all runs by one request, the entries with old generations aren't
+    accessed anymore and expire by RUN_CACHE['timeout'] from settings.py. The entries
+    of the former key format {run_id}.{data_key} don't expire, they are deleted
+    by the remove_unused_cache_keys command.
+
+    The data of a data key may have variants cached by separate entries, e.g.
+    the reports by config IDs. The key of a variant is
+    {run_id}.{data_key}:{variant}.{data_generation}.{run_generation}.{run_data_generation},
+    the last generation is per run and data key to invalidate all the variants
+    of the run data.
+
+    The data are encoded by the codec of the data key (see RunCacheCodec), the codecs
+    can be overridden by RUN_CACHE['codecs'] from settings.py.
 
     It's possible to create RunCache object using TestIterationResult object or
     its ID using: by_obj() or by_id() class methods respectively.
     Until there is no cache validation incomplete run's data aren't cached.
 
+    Expensive data are better produced by get_or_set(): only one process produces
+    the data of a run at a time holding a lock in the cache, the others wait for
+    the data to appear in the cache for up to RUN_CACHE['lock_timeout'] seconds.
+
     Usage example:
         cache = RunCache.by_id(run_id, 'stats')
-        stats = cache.data
-        if not stats:
-            cache.data = produce_stats()
+        stats = cache.get_or_set(produce_stats)
     """
 
+    CACHE_ALIAS = 'run'
+    SETTINGS_DEFAULTS: ClassVar[dict] = {
+        'timeout': 60 * 60 * 24 * 30,
+        'lock_timeout': 60,
+        'lock_poll_interval': 0.1,
+    }
+    CODECS_DEFAULTS: ClassVar[dict] = {
+        'default': {'serializer': 'pickle', 'compressor': 'zlib', 'level': 1},
+    }
     KEY_DATA_CHOICES: ClassVar[set] = {
         'stats',
-        'stats_sum',
         'stats_reqs',
         'dashboard-v2',
-        'livelog',
         'tree',
+        'report',
     }
-    KEYS_EARLY_CACHE: ClassVar[set] = {'livelog'}
-    KEYS_TMP_CACHE: ClassVar[set] = {'tree'}
+    KEYS_EARLY_CACHE: ClassVar[set] = set()
+    KEYS_TMP_CACHE: ClassVar[set] = set()
 
-    def __init__(self, run, data_key):
+    def __init__(self, run, data_key, variant=None):
+        self.check_data_key(data_key)
         self.run = run
         self.data_key = data_key
-        self.key = self.__generate_cache_key(data_key)
-        self._data = self.__get_cache()
+        self.variant = variant
 
-    def __generate_cache_key(self, data_key):
-        if data_key not in self.KEY_DATA_CHOICES:
+    @classmethod
+    def check_data_key(cls, data_key):
+        if data_key not in cls.KEY_DATA_CHOICES:
             msg = (
                 'You try to create cache for unknown data_key, check KEY_DATA_CHOICES of '
                 'RunCache class.'
@@ -58,10 +162,89 @@ class RunCache:
             raise Exception(
                 msg,
             )
-        return str(self.run.id) + f'.{data_key}'
 
-    def __get_cache(self):
-        return caches['run'].get(self.key)
+    @classmethod
+    def get_settings(cls):
+        return {**cls.SETTINGS_DEFAULTS, **getattr(settings, 'RUN_CACHE', {})}
+
+    @classmethod
+    def timeout(cls):
+        return cls.get_settings()['timeout']
+
+    @classmethod
+    def codec(cls, data_key):
+        codecs = {**cls.CODECS_DEFAULTS, **getattr(settings, 'RUN_CACHE', {}).get('codecs', {})}
+        return RunCacheCodec(**codecs.get(data_key, codecs['default']))
+
+    @staticmethod
+    def generation_key(name):
+        return f'{name}.generation'
+
+    @classmethod
+    def get_generations(cls, names):
+        """
+        Get the generations by their names, the missing ones are started from
+        unique values not to repeat the expired ones. None is returned if
+        the cache backend doesn't keep them.
+        """
+        content = caches[cls.CACHE_ALIAS]
+        keys = [cls.generation_key(name) for name in names]
+        generations = content.get_many(keys)
+        missing = [key for key in keys if key not in generations]
+        if missing:
+            for key in missing:
+                content.add(key, time.time_ns(), cls.timeout())
+            generations.update(content.get_many(missing))
+            if any(key not in generations for key in missing):
+                return None
+        return [generations[key] for key in keys]
+
+    @classmethod
+    def increment_generation(cls, name):
+        content = caches[cls.CACHE_ALIAS]
+        key = cls.generation_key(name)
+        try:
+            content.incr(key)
+        except ValueError:
+            content.set(key, time.time_ns(), cls.timeout())
+
+    @staticmethod
+    def run_data_generation_name(run_id, data_key):
+        return f'{run_id}.{data_key}'
+
+    @cached_property
+    def key(self):
+        names = [self.data_key, self.run.id]
+        data_key = self.data_key
+        if self.variant is not None:
+            names.append(self.run_data_generation_name(self.run.id, self.data_key))
+            data_key = f'{self.data_key}:{self.variant}'
+        generations = self.get_generations(names)
+        if generations is None:
+            return None
+        return '.'.join(str(item) for item in (self.run.id, data_key, *generations))
+
+    @property
+    def cacheable(self):
+        return self.key is not None and bool(
+            self.run.finish or self.data_key in self.KEYS_EARLY_CACHE,
+        )
+
+    def _get(self):
+        if self.key is None:
+            return None
+        value = caches[self.CACHE_ALIAS].get(self.key)
+        if value is None:
+            return None
+        try:
+            return RunCacheCodec.decode(value)
+        except Exception:
+            # The data cached by the older code are produced again
+            return None
+
+    @cached_property
+    def _data(self):
+        return self._get()
 
     @property
     def data(self):
@@ -69,25 +252,69 @@ class RunCache:
 
     @data.setter
     def data(self, data):
-        timeout = None
+        timeout = self.timeout()
         if self.data_key in self.KEYS_TMP_CACHE:
             timeout = 60 * 20
-        if self.run.finish or self.data_key in self.KEYS_EARLY_CACHE:
-            self._data = caches['run'].set(self.key, data, timeout)
+        if self.cacheable:
+            value = self.codec(self.data_key).encode(data)
+            caches[self.CACHE_ALIAS].set(self.key, value, timeout)
+            self._data = data
 
     @data.deleter
     def data(self):
-        caches['run'].delete(self.key)
+        if self.key is not None:
+            caches[self.CACHE_ALIAS].delete(self.key)
+        self._data = None
+
+    def get_or_set(self, produce, is_valid=bool):
+        """
+        Return the cached data if is_valid(data), otherwise produce the data by
+        produce() and cache them unless they are empty.
+
+        The lock is an entry added next to the data with the lease of
+        RUN_CACHE['lock_timeout'] seconds. If the lock isn't released in time,
+        the waiting process produces the data on its own.
+        """
+        data = self.data
+        if is_valid(data):
+            return data
+        if not self.cacheable:
+            return produce()
+
+        content = caches[self.CACHE_ALIAS]
+        run_cache_settings = self.get_settings()
+        lock_key = f'{self.key}.lock'
+        lock_token = uuid.uuid4().hex
+        deadline = time.monotonic() + run_cache_settings['lock_timeout']
+
+        locked = content.add(lock_key, lock_token, run_cache_settings['lock_timeout'])
+        while not locked and time.monotonic() < deadline:
+            time.sleep(run_cache_settings['lock_poll_interval'])
+            data = self._get()
+            if is_valid(data):
+                self._data = data
+                return data
+            locked = content.add(lock_key, lock_token, run_cache_settings['lock_timeout'])
+
+        try:
+            data = produce()
+            if data:
+                self.data = data
+        finally:
+            # The lock may have expired and been taken by another process
+            if locked and content.get(lock_key) == lock_token:
+                content.delete(lock_key)
+        return data
 
     @classmethod
-    def by_obj(cls, run, data_key):
+    def by_obj(cls, run, data_key, variant=None):
         if not isinstance(run, models.TestIterationResult):
             msg = f'Inappropriate type: {type(run)}, expected TestIterationResult'
             raise TypeError(msg)
-        return cls(run, data_key)
+        return cls(run, data_key, variant)
 
     @classmethod
-    def by_id(cls, run_id, data_key):
+    def by_id(cls, run_id, data_key, variant=None):
         if not (isinstance(run_id, int) or run_id.isdigit()):
             msg = f'Inappropriate type: {type(run_id)}, expected int'
             raise TypeError(msg)
@@ -98,13 +325,136 @@ class RunCache:
             raise Exception(
                 msg,
             ) from ObjectDoesNotExist
-        return cls(run, data_key)
+        return cls(run, data_key, variant)
 
     @classmethod
     def delete_data_for_obj(cls, run, data_keys=KEY_DATA_CHOICES):
+        if set(data_keys) >= cls.KEY_DATA_CHOICES:
+            cls.increment_generation(run.id)
+            return
         for data_key in data_keys:
             self = cls.by_obj(run, data_key)
             del self.data
+            cls.increment_generation(cls.run_data_generation_name(run.id, data_key))
+
+    @classmethod
+    def delete_data_for_all(cls, data_keys=KEY_DATA_CHOICES):
+        for data_key in data_keys:
+            cls.check_data_key(data_key)
+            cls.increment_generation(data_key)
+
+
+class HistoryCache:
+    """
+    Caches test history by the parameters of the history request.
+
+    The key includes the generation of the requested project (or of any project
+    if the history isn't limited to a project) and the generation for all
+    the history. Generations are counters kept in the cache: the project ones
+    are incremented when the history results of a project run are updated
+    (see update_run_history_results()), the one for all the history when
+    the history is invalidated as a whole. The entries with old generations
+    aren't accessed anymore and expire by HISTORY_CACHE['timeout'] from settings.py.
+
+    The full result set of a history is cached apart from its pages by
+    the 'results' data key, so the pages of a history are produced without
+    querying the results again. Nothing is cached if there is no 'history'
+    cache in settings.py.
+
+    Usage example:
+        cache = HistoryCache(project_id, test_name=test_name, **filters)
+        results = cache.get_or_set('results', produce_results)
+    """
+
+    CACHE_ALIAS = 'history'
+    SETTINGS_DEFAULTS: ClassVar[dict] = {
+        'timeout': 60 * 60,
+    }
+    ALL = 'all'
+    ANY_PROJECT = 'any'
+
+    def __init__(self, project_id, **params):
+        self.project_id = project_id or None
+        self.params_hash = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+
+    @classmethod
+    def get_settings(cls):
+        return {**cls.SETTINGS_DEFAULTS, **getattr(settings, 'HISTORY_CACHE', {})}
+
+    @classmethod
+    def content(cls):
+        if cls.CACHE_ALIAS not in settings.CACHES:
+            return None
+        return caches[cls.CACHE_ALIAS]
+
+    @staticmethod
+    def generation_key(name):
+        return f'history:{name}:generation'
+
+    @cached_property
+    def key(self):
+        content = self.content()
+        if content is None:
+            return None
+        names = [self.ALL, self.ANY_PROJECT if self.project_id is None else self.project_id]
+        keys = [self.generation_key(name) for name in names]
+        for key in keys:
+            # Start from a unique value for the counter not to repeat after flushes
+            content.add(key, time.time_ns(), None)
+        generations = content.get_many(keys)
+        if any(key not in generations for key in keys):
+            return None
+        generations = [generations[key] for key in keys]
+        return ':'.join(
+            str(item) for item in ('history', *names, *generations, self.params_hash)
+        )
+
+    @property
+    def cacheable(self):
+        return self.key is not None
+
+    def get(self, data_key):
+        if not self.cacheable:
+            return None
+        value = self.content().get(f'{self.key}:{data_key}')
+        if value is None:
+            return None
+        try:
+            return RunCacheCodec.decode(value)
+        except Exception:
+            return None
+
+    def set(self, data_key, data):
+        if self.cacheable:
+            self.content().set(
+                f'{self.key}:{data_key}',
+                RunCache.codec('default').encode(data),
+                self.get_settings()['timeout'],
+            )
+
+    def get_or_set(self, data_key, produce):
+        data = self.get(data_key)
+        if data is None:
+            data = produce()
+            self.set(data_key, data)
+        return data
+
+    @classmethod
+    def invalidate(cls, project_id=None):
+        """
+        Invalidate the history of the project, or all the history if no
+        project is given.
+        """
+        content = cls.content()
+        if content is None:
+            return
+        names = [cls.ALL] if project_id is None else [project_id, cls.ANY_PROJECT]
+        for name in names:
+            key = cls.generation_key(name)
+            try:
+                content.incr(key)
+            except ValueError:
+                content.set(key, time.time_ns(), None)
 
 
 def cache_page_if_run_done(timeout):
@@ -138,6 +488,119 @@ def cache_page_if_run_done(timeout):
     return _cache_decorator
 
 
+class _ProjectLocalCache:
+    """
+    Process-local LRU layer in front of the project cache in Redis.
+
+    The local entries of a project are valid while the project generation
+    counter in Redis stays the same, every change of the project cache
+    increments it. The counter is checked once per request (see start_request())
+    and at most once per 'check_interval' seconds within a request or out of
+    requests. If the cache backend doesn't keep the counter, the local layer
+    isn't used. The settings are taken from PROJECT_CACHE in settings.py.
+
+    The entries are kept pickled, so every caller gets its own copy of a value
+    as it does from Redis.
+    """
+
+    SETTINGS_DEFAULTS: ClassVar[dict] = {
+        'local_maxsize': 1024,
+        'check_interval': 5,
+    }
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        # Project ID -> (generation, request epoch, check time)
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self):
+        return {**self.SETTINGS_DEFAULTS, **getattr(settings, 'PROJECT_CACHE', {})}
+
+    @staticmethod
+    def generation_key(project_id):
+        return f'project:{project_id}:generation'
+
+    def start_request(self):
+        with self._lock:
+            self._epoch += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def _drop_project(self, project_id):
+        for key in [key for key in self._entries if key[0] == project_id]:
+            del self._entries[key]
+        self._generations.pop(project_id, None)
+
+    def _validate(self, project_id, content):
+        """
+        Return the project generation dropping the local entries of the project
+        if it has changed, None if the cache backend doesn't keep it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._generations.get(project_id)
+            if (
+                state is not None
+                and state[1] == self._epoch
+                and now - state[2] < self.settings['check_interval']
+            ):
+                return state[0]
+            epoch = self._epoch
+
+        generation_key = self.generation_key(project_id)
+        generation = content.get(generation_key)
+        if generation is None:
+            # Start from a unique value for the counter not to repeat after flushes
+            content.add(generation_key, time.time_ns(), None)
+            generation = content.get(generation_key)
+
+        with self._lock:
+            if generation is None or state is None or state[0] != generation:
+                self._drop_project(project_id)
+            if generation is not None:
+                self._generations[project_id] = (generation, epoch, now)
+        return generation
+
+    def get(self, project_id, key, content):
+        if self._validate(project_id, content) is None:
+            return content.get(key)
+
+        with self._lock:
+            if (project_id, key) in self._entries:
+                self._entries.move_to_end((project_id, key))
+                return pickle.loads(self._entries[(project_id, key)])
+
+        value = content.get(key)
+        if value is not None:
+            with self._lock:
+                self._entries[(project_id, key)] = pickle.dumps(value)
+                while len(self._entries) > self.settings['local_maxsize']:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, project_id, content):
+        """
+        Increment the project generation, so the local entries of the project
+        are dropped by all processes.
+        """
+        generation_key = self.generation_key(project_id)
+        try:
+            content.incr(generation_key)
+        except ValueError:
+            content.set(generation_key, time.time_ns(), None)
+        with self._lock:
+            self._drop_project(project_id)
+
+
+_project_local_cache = _ProjectLocalCache()
+
+
 class ProjectCache:
     CACHE_ALIAS = 'project'
 
@@ -145,6 +608,13 @@ class ProjectCache:
         self._project_id = project_id
         self._content = caches[self.CACHE_ALIAS]
 
+    @staticmethod
+    def start_request():
+        """
+        Make the process-local layer check the projects generations again.
+        """
+        _project_local_cache.start_request()
+
     @property
     def configs(self):
         return _ConfigsCache(self)
@@ -191,15 +661,21 @@ class _ProjectSectionCache:
 
     def get(self, data_key: str):
         self._validate(data_key)
-        return self._project._content.get(self._cache_key(data_key))
+        return _project_local_cache.get(
+            self._project._project_id,
+            self._cache_key(data_key),
+            self._project._content,
+        )
 
     def set(self, data_key: str, value, timeout: int | None = None):
         self._validate(data_key)
         self._project._content.set(self._cache_key(data_key), value, timeout)
+        _project_local_cache.invalidate(self._project._project_id, self._project._content)
 
     def delete(self, data_key: str):
         self._validate(data_key)
         self._project._content.delete(self._cache_key(data_key))
+        _project_local_cache.invalidate(self._project._project_id, self._project._content)
 
     def clear_all(self):
         for data_key in self.KEY_DATA_CHOICES:
@@ -12,12 +12,7 @@ from bublik.core.config.services import ConfigServices
 from bublik.core.datetime_formatting import date_str_to_db
 from bublik.core.exceptions import UnprocessableEntityError
 from bublik.core.importruns.live.check import livelog_check_run_timeout
-from bublik.core.run.stats import (
-    get_run_conclusion,
-    get_run_stats,
-    get_run_status,
-    get_run_status_by_nok,
-)
+from bublik.core.run.summary import get_runs_summaries
 from bublik.core.utils import dicts_groupby, get_difference
 from bublik.data import models
 from bublik.data.models import GlobalConfigs
@@ -81,13 +76,20 @@ class DashboardService:
         if project_id:
             runs = runs.filter(project_id=project_id)
 
-        runs = runs.select_related('project').prefetch_related('meta_results').distinct()
+        runs = list(
+            runs.select_related('project').prefetch_related('meta_results').distinct(),
+        )
+
+        # Finish timed out live runs before their summaries are loaded
+        for run in runs:
+            livelog_check_run_timeout(run)
+        summaries = get_runs_summaries(runs)
 
         # Build rows
         rows_data = []
         for run in runs:
-            conclusion, conclusion_reason = get_run_conclusion(run)
-            row_cells = DashboardService.prepare_row_data(run, columns)
+            summary = summaries[run.id]
+            row_cells = DashboardService.prepare_row_data(run, columns, summary)
             rows_data.append(
                 {
                     'row_cells': row_cells,
@@ -96,10 +98,10 @@ class DashboardService:
                         'project_id': run.project.id,
                         'project_name': run.project.name,
                         'start': run.start.timestamp(),
-                        'status': get_run_status(run),
-                        'status_by_nok': get_run_status_by_nok(run)[0],
-                        'conclusion': conclusion,
-                        'conclusion_reason': conclusion_reason,
+                        'status': summary.status,
+                        'status_by_nok': summary.status_by_nok,
+                        'conclusion': summary.conclusion,
+                        'conclusion_reason': summary.conclusion_reason,
                     },
                 },
             )
@@ -190,20 +192,19 @@ class DashboardService:
                 format_value(item)
 
     @staticmethod
-    def prepare_row_data(run, columns):
+    def prepare_row_data(run, columns, summary):
         """
         Prepare row cells data for a run.
 
         Args:
             run: TestIterationResult instance
             columns: Dictionary mapping column keys to column label and payload
+            summary: RunSummary instance of the run
 
         Returns:
             Dictionary with row cells data
         """
 
-        livelog_check_run_timeout(run)
-
         # Try cache first
         cache = RunCache.by_obj(run, 'dashboard-v2')
         row_data = cache.data
@@ -224,7 +225,7 @@ class DashboardService:
             # Build cells
             row_data = {}
             extended_keys = ['total', 'total_expected', 'progress', 'unexpected']
-            stats = get_run_stats(run.id)
+            stats = summary.stats
             for key, _col_settings in columns.items():
                 if key not in extended_keys:
                     row_data[key] = metabased_dict.get(key, [])
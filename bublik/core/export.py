@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """File-like object returning what is written to it, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iterate_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterate the queryset by a server-side cursor yielding lists of up to
+    chunk_size objects, so that the related data of a chunk can be loaded
+    by a few queries.
+    """
+    objects = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(itertools.islice(objects, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return '; '.join(str(get_csv_value(item)) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+def stream_csv(items, columns):
+    """
+    Yield the CSV lines of the items, the columns map the names of the columns
+    to the functions taking their values from an item.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(list(columns))
+    for item in items:
+        yield writer.writerow([get_csv_value(column(item)) for column in columns.values()])
+
+
+def stream_ndjson(items):
+    for item in items:
+        yield json.dumps(item, cls=DjangoJSONEncoder) + '\n'
+
+
+def get_export_format(export_format):
+    export_format = export_format or 'csv'
+    if export_format not in EXPORT_CONTENT_TYPES:
+        msg = (
+            f'Unknown export format: {export_format}. '
+            f'Possible: {", ".join(EXPORT_CONTENT_TYPES)}.'
+        )
+        raise ValidationError(msg)
+    return export_format
+
+
+def streaming_export_response(items, columns, export_format, filename):
+    """
+    Return the response streaming the items as CSV with the given columns
+    or as NDJSON with the items as they are.
+
+    The items are expected to be a lazy iterable, so the data are produced
+    while the response is sent.
+    """
+    export_format = get_export_format(export_format)
+    content = stream_csv(items, columns) if export_format == 'csv' else stream_ndjson(items)
+
+    response = StreamingHttpResponse(
+        content,
+        content_type=EXPORT_CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -26,15 +26,20 @@ class HashedModelSerializer(ModelSerializer):
         hashable_fields = self.Meta.model.hashable
         return OrderedDict((k, v) for k, v in data.items() if k in hashable_fields)
 
-    def is_valid(self, *args, **kwargs):
+    def is_valid(self, *args, with_hash=True, **kwargs):
+        """
+        Validate data and calculate its hash. Pass with_hash=False to skip
+        the hash calculation, which looks up the database for collisions.
+        """
         status_valid = super().is_valid(*args, **kwargs)
-        if status_valid:
-            self._validated_data_and_hash = copy.deepcopy(self._validated_data)
-            self._validated_data_and_hash.update(
-                {'hash': self.create_hash(self._validated_data)},
-            )
+        if status_valid and with_hash:
+            self.set_hash(self.create_hash(self._validated_data))
         return status_valid
 
+    def set_hash(self, data_hash):
+        self._validated_data_and_hash = copy.deepcopy(self._validated_data)
+        self._validated_data_and_hash.update({'hash': data_hash})
+
     def create_hash(self, data, hasher=DEFAULT_HASHER):
         """
         Getting an object by its hash this function checks if its fields
@@ -53,11 +58,7 @@ class HashedModelSerializer(ModelSerializer):
             if not obj:
                 return data_hash
 
-            hashable_data = OrderedDict(hashable_data)
-            obj_data = OrderedDict(self.__class__(instance=obj).data)
-            hashable_obj_data = self.hashable_data(obj_data)
-            diff = DeepDiff(hashable_data, hashable_obj_data, ignore_order=True)
-            if not diff:
+            if self.matches_instance(data, obj):
                 """Just Get the same object"""
                 return data_hash
 
@@ -78,6 +79,20 @@ class HashedModelSerializer(ModelSerializer):
             """
             salted_data['salt'] = salted_data.get('salt', 0) + 1
 
+    def create_unsalted_hash(self, data, hasher=DEFAULT_HASHER):
+        """
+        Calculate the hash without checking it for collisions. The result is
+        the same as the create_hash() one unless a collision has occurred.
+        """
+        salted_data = {'data': copy.deepcopy(self.hashable_data(data))}
+        return DeepHash(salted_data, hasher=hasher)[salted_data]
+
+    def matches_instance(self, data, obj):
+        hashable_data = OrderedDict(self.hashable_data(data))
+        obj_data = OrderedDict(self.__class__(instance=obj).data)
+        hashable_obj_data = self.hashable_data(obj_data)
+        return not DeepDiff(hashable_data, hashable_obj_data, ignore_order=True)
+
     def get_or_none(self, **kwargs):
         try:
             return self.Meta.model.objects.get(**kwargs)
@@ -97,6 +112,62 @@ class HashedModelSerializer(ModelSerializer):
         obj = self.Meta.model.objects.create(**self.validated_data_and_hash)
         return obj, True
 
+    @classmethod
+    def get_or_create_many(cls, data_list):
+        """
+        Get or create objects for each item of data_list.
+
+        Unlike calling get_or_create() for every item, existing objects are
+        fetched by one query on their hashes and missing ones are created by
+        bulk_create_instances(). Items hitting a hash collision are handled
+        one by one the usual way.
+
+        Returns a list of (obj, created) tuples in the order of data_list.
+        """
+        serializers = []
+        for data in data_list:
+            serializer = cls(data=data)
+            serializer.is_valid(raise_exception=True, with_hash=False)
+            serializer.set_hash(serializer.create_unsalted_hash(serializer.validated_data))
+            serializers.append(serializer)
+
+        hashes = {serializer.validated_data_and_hash['hash'] for serializer in serializers}
+        existing = cls.bulk_queryset().in_bulk(hashes, field_name='hash')
+
+        results = [None] * len(serializers)
+        to_create = {}
+        for idx, serializer in enumerate(serializers):
+            data_hash = serializer.validated_data_and_hash['hash']
+            obj = existing.get(data_hash)
+            if obj is None:
+                to_create.setdefault(data_hash, []).append(idx)
+            elif serializer.matches_instance(serializer.validated_data, obj):
+                results[idx] = (obj, False)
+            else:
+                serializer.set_hash(serializer.create_hash(serializer.validated_data))
+                results[idx] = serializer.get_or_create()
+
+        created_objs = cls.bulk_create_instances(
+            [serializers[indices[0]] for indices in to_create.values()],
+        )
+        for indices, obj in zip(to_create.values(), created_objs):
+            results[indices[0]] = (obj, True)
+            for idx in indices[1:]:
+                results[idx] = (obj, False)
+
+        return results
+
+    @classmethod
+    def bulk_queryset(cls):
+        return cls.Meta.model.objects.all()
+
+    @classmethod
+    def bulk_create_instances(cls, serializers):
+        model = cls.Meta.model
+        return model.objects.bulk_create(
+            [model(**serializer.validated_data_and_hash) for serializer in serializers],
+        )
+
     @property
     def validated_data_and_hash(self):
         if not hasattr(self, '_validated_data_and_hash'):
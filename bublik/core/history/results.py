@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef, Subquery
+from django.db.models.functions import MD5
+
+from bublik.core.cache import HistoryCache
+from bublik.data.models import (
+    HistoryResult,
+    MeasurementResult,
+    MetaResult,
+    TestIterationResult,
+)
+
+
+def get_history_results_rows(run_id):
+    """
+    Return the queryset selecting the history rows of the run test iterations
+    results and the names of the history columns in the order of the values.
+    """
+    metas = MetaResult.objects.filter(result=OuterRef('id'))
+    verdicts_hash = (
+        metas.filter(meta__type='verdict')
+        .order_by()
+        .values('result')
+        .annotate(
+            verdicts_hash=MD5(StringAgg('meta__value', delimiter='\n', order_by='serial')),
+        )
+        .values('verdicts_hash')
+    )
+    rows = {
+        'result_id': F('id'),
+        'run_id': F('test_run_id'),
+        'run_start': F('test_run__start'),
+        'test_id': F('iteration__test_id'),
+        'iteration_id': F('iteration_id'),
+        'iteration_hash': F('iteration__hash'),
+        'start': F('start'),
+        'finish': F('finish'),
+        'obtained_result': Subquery(
+            metas.filter(meta__type='result').values('meta__value')[:1],
+        ),
+        'verdicts_hash': Subquery(verdicts_hash),
+        'unexpected': Exists(metas.filter(meta__type='err')),
+        'has_measurements': Exists(MeasurementResult.objects.filter(result=OuterRef('id'))),
+    }
+
+    # The aliases don't clash with the fields of the results
+    return (
+        TestIterationResult.objects.filter(test_run_id=run_id, iteration__hash__isnull=False)
+        .annotate(**{f'history_{column}': value for column, value in rows.items()})
+        .order_by()
+        .values(*(f'history_{column}' for column in rows))
+    ), list(rows)
+
+
+@transaction.atomic
+def update_run_history_results(run_id, finished_only=False):
+    """
+    Write the history rows of the run results by one INSERT ... SELECT query.
+
+    The rows of the run are rebuilt, or only the rows of the finished results
+    that don't have them yet are added if finished_only is set, that is cheap
+    enough to be repeated while a live run goes on. The cached history of
+    the run project is invalidated after the commit.
+    """
+    rows, columns = get_history_results_rows(run_id)
+    if finished_only:
+        rows = rows.filter(finish__isnull=False, history__isnull=True)
+    else:
+        HistoryResult.objects.filter(run_id=run_id).delete()
+
+    sql, params = rows.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {HistoryResult._meta.db_table} ({", ".join(columns)}) {sql}',
+            params,
+        )
+
+    project_id = (
+        TestIterationResult.objects.filter(id=run_id)
+        .values_list('project_id', flat=True)
+        .first()
+    )
+    transaction.on_commit(lambda: HistoryCache.invalidate(project_id))
@@ -3,12 +3,18 @@
 
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
+from typing import ClassVar
+
 from django.conf import settings
-from django.db.models import Exists, F, OuterRef, Q
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count, Exists, F, OuterRef, Q, QuerySet
+from django.utils import timezone
 
-from bublik.core.cache import ProjectCache
+from bublik.core.cache import HistoryCache, ProjectCache
 from bublik.core.datetime_formatting import display_to_date_in_numbers
 from bublik.core.exceptions import NotFoundError
+from bublik.core.export import iterate_chunks
 from bublik.core.history.v2.utils import (
     group_results,
     group_results_by_iteration,
@@ -26,7 +32,7 @@ from bublik.core.run.filter_expression import filter_by_expression
 from bublik.core.run.tests_organization import get_test_ids_by_name
 from bublik.core.run.utils import prepare_dates_period
 from bublik.data.models import (
-    MeasurementResult,
+    HistoryResult,
     Meta,
     MetaResult,
     TestArgument,
@@ -41,6 +47,22 @@ class HistoryService:
     """
 
     EXPECTED_KEY_VALUE_PARTS = 2
+    EXPORT_COLUMNS: ClassVar[dict] = {
+        'result_id': lambda result: result['result_id'],
+        'run_id': lambda result: result['run_id'],
+        'project_name': lambda result: result['project_name'],
+        'iteration_id': lambda result: result['iteration_id'],
+        'start_date': lambda result: result['start_date'],
+        'finish_date': lambda result: result['finish_date'],
+        'duration': lambda result: result['duration'],
+        'result_type': lambda result: result['obtained_result']['result_type'],
+        'verdicts': lambda result: result['obtained_result']['verdicts'],
+        'has_error': lambda result: result['has_error'],
+        'has_measurements': lambda result: result['has_measurements'],
+        'parameters': lambda result: result['parameters'],
+        'important_tags': lambda result: result['important_tags'],
+        'relevant_tags': lambda result: result['relevant_tags'],
+    }
 
     @staticmethod
     def build_history_queryset(  # noqa: PLR0913
@@ -115,7 +137,7 @@ class HistoryService:
         )
 
         # Step 3: Apply run filters
-        runs_results_ids, runs_results = HistoryService._apply_run_filters(
+        runs_results = HistoryService._apply_run_filters(
             runs_results=runs_results,
             from_date_obj=from_date_obj,
             to_date_obj=to_date_obj,
@@ -135,10 +157,36 @@ class HistoryService:
 
         # Early return if no runs found
         if not runs_results.exists():
-            return TestIterationResult.objects.none(), from_date_obj, to_date_obj
+            return (
+                HistoryService._finalize_queryset(HistoryResult.objects.none()),
+                from_date_obj,
+                to_date_obj,
+            )
 
-        # Step 4: Filter test results by runs
-        test_results = TestIterationResult.objects.filter(test_run__in=runs_results_ids)
+        # Step 4: Filter test results by runs, the rows of the history results
+        # are queried instead of the test results themselves. The period is
+        # taken by the run starts of the rows in the current time zone.
+        test_results = HistoryResult.objects.filter(
+            run_start__gte=timezone.make_aware(datetime.combine(from_date_obj, time.min)),
+            run_start__lt=timezone.make_aware(
+                datetime.combine(to_date_obj + timedelta(days=1), time.min),
+            ),
+        )
+        run_filters = (
+            project_id,
+            run_ids,
+            branches,
+            revisions,
+            labels,
+            tags,
+            branch_expr,
+            rev_expr,
+            label_expr,
+            tag_expr,
+            run_properties,
+        )
+        if any(run_filters):
+            test_results = test_results.filter(run__in=runs_results.values('id'))
 
         # Step 5: Apply iteration filters
         test_results = HistoryService._apply_iteration_filters(
@@ -204,9 +252,9 @@ class HistoryService:
         tag_expr: str | None,
         run_properties: str | None,
         query_delimiter: str,
-    ) -> tuple[list[int], TestIterationResult]:
+    ) -> TestIterationResult:
         """
-        Apply run-level filters and return run IDs and filtered queryset.
+        Apply run-level filters and return filtered queryset.
 
         Args:
             runs_results: Base queryset of runs
@@ -226,7 +274,7 @@ class HistoryService:
             query_delimiter: Delimiter for splitting multi-value strings
 
         Returns:
-            Tuple of (run_ids_list, filtered_runs_queryset)
+            Filtered runs queryset
         """
         # Apply project filter if provided
         if project_id:
@@ -268,20 +316,18 @@ class HistoryService:
                 run_properties.split(query_delimiter),
             )
 
-        # Return run IDs and filtered queryset
-        runs_results_ids = list(runs_results.values_list('id', flat=True))
-        return runs_results_ids, runs_results
+        return runs_results
 
     @staticmethod
     def _apply_iteration_filters(
-        test_results: TestIterationResult,
+        test_results: HistoryResult,
         test_ids: list[int],
         iteration_hash: str | None,
         test_args: str | None,
         test_arg_expr: str | None,
         query_delimiter: str,
         test_arg_delimiter: str,
-    ) -> TestIterationResult:
+    ) -> HistoryResult:
         """
         Apply iteration-level filters to test results.
 
@@ -343,18 +389,18 @@ class HistoryService:
 
         # Filter results by iterations
         test_iteration_ids = list(test_iterations.values_list('id', flat=True))
-        return test_results.filter(iteration__in=test_iteration_ids)
+        return test_results.filter(test__in=test_ids, iteration__in=test_iteration_ids)
 
     @staticmethod
     def _apply_result_filters(
-        test_results: TestIterationResult,
+        test_results: HistoryResult,
         result_statuses: str | None,
         verdict: str | None,
         verdict_lookup: str | None,
         verdict_expr: str | None,
         result_types: str | None,
         query_delimiter: str,
-    ) -> TestIterationResult:
+    ) -> HistoryResult:
         """
         Apply result-level filters to test results.
 
@@ -372,13 +418,9 @@ class HistoryService:
         """
         # Filter by result statuses
         if result_statuses:
-            result_meta_ids = list(
-                Meta.objects.filter(
-                    type='result',
-                    value__in=result_statuses.split(query_delimiter),
-                ).values_list('id', flat=True),
+            test_results = test_results.filter(
+                obtained_result__in=result_statuses.split(query_delimiter),
             )
-            test_results = test_results.filter(meta_results__meta__in=result_meta_ids)
 
         # Filter by verdicts
         if verdict:
@@ -394,9 +436,16 @@ class HistoryService:
             verdict_meta_ids = list(
                 Meta.objects.filter(**verdict_meta_filter).values_list('id', flat=True),
             )
-            test_results = test_results.filter(meta_results__meta__in=verdict_meta_ids)
+            test_results = test_results.filter(
+                Exists(
+                    MetaResult.objects.filter(
+                        result=OuterRef('result'),
+                        meta__in=verdict_meta_ids,
+                    ),
+                ),
+            )
         elif not verdict and verdict_lookup == 'none':
-            test_results = test_results.exclude(meta_results__meta__type='verdict')
+            test_results = test_results.filter(verdicts_hash__isnull=True)
 
         # Filter by verdict expression
         if verdict_expr:
@@ -408,48 +457,64 @@ class HistoryService:
 
         # Filter by result types
         if result_types:
-            test_results = test_results.filter_by_result_classification(
-                result_types.split(query_delimiter),
-            )
+            result_types = result_types.split(query_delimiter)
+            if ('expected' in result_types) ^ ('unexpected' in result_types):
+                test_results = test_results.filter(unexpected='unexpected' in result_types)
 
         return test_results
 
     @staticmethod
-    def _finalize_queryset(test_results: TestIterationResult):
+    def _finalize_queryset(test_results: HistoryResult):
         """
-        Apply final annotations and ordering to queryset.
+        Apply final ordering to queryset and select the values of the results.
 
         Args:
-            test_results: Filtered queryset of test results
+            test_results: Filtered queryset of history results
 
         Returns:
-            Annotated and ordered queryset
+            Ordered queryset of the values of the results
         """
-        return (
-            test_results.select_related('test_run', 'iteration')
-            .annotate(
-                run_id=F('test_run__id'),
-                iteration_hash=F('iteration__hash'),
-                has_error=Exists(
-                    MetaResult.objects.filter(result__id=OuterRef('id'), meta__type='err'),
-                ),
-                is_measurements=Exists(
-                    MeasurementResult.objects.filter(result__id=OuterRef('id')),
-                ),
-            )
-            .order_by('-start', 'id')
-            .distinct('start', 'id')
-            .values(
-                'id',
-                'start',
-                'finish',
-                'iteration_id',
-                'iteration_hash',
-                'run_id',
-                'has_error',
-                'is_measurements',
-            )
+        return test_results.order_by('-start', 'result').values(
+            'start',
+            'finish',
+            'iteration_id',
+            'iteration_hash',
+            'run_id',
+            'verdicts_hash',
+            id=F('result_id'),
+            has_error=F('unexpected'),
+            is_measurements=F('has_measurements'),
+        )
+
+    @staticmethod
+    def get_results_counts(test_results) -> tuple[dict, list[int], int]:
+        """
+        Count the results of the history by one aggregate query.
+
+        Args:
+            test_results: Queryset of test results
+
+        Returns:
+            Tuple of (counts dict, IDs of all the results, number of iteration groups)
+        """
+        aggregated = test_results.order_by().aggregate(
+            total_results=Count('id'),
+            unexpected_results=Count('id', filter=Q(has_error=True)),
+            runs=Count('run_id', distinct=True),
+            iterations=Count('iteration_id', distinct=True),
+            iteration_groups=Count('iteration_hash', distinct=True),
+            results_ids=ArrayAgg('id', default=[]),
         )
+        total_results = aggregated['total_results']
+        unexpected_results = aggregated['unexpected_results']
+        counts = {
+            'runs': aggregated['runs'],
+            'iterations': aggregated['iterations'],
+            'total_results': total_results,
+            'expected_results': total_results - unexpected_results,
+            'unexpected_results': unexpected_results,
+        }
+        return counts, aggregated['results_ids'], aggregated['iteration_groups']
 
     @staticmethod
     def prepare_results_data(test_results):
@@ -457,10 +522,10 @@ class HistoryService:
         Prepare results data for response.
 
         Args:
-            test_results: Queryset of test results
+            test_results: Rows of the test results to be shown
 
         Returns:
-            Tuple of (data dict, counts dict, runs_ids, iterations_ids, results_ids)
+            Tuple of (data dict, runs_ids, iterations_ids, results_ids)
         """
         # Collect IDs
         runs_ids = set()
@@ -473,18 +538,6 @@ class HistoryService:
             iterations_ids.add(result['iteration_id'])
             results_ids.add(result['id'])
 
-        # Calculate counts
-        total_results = len(test_results_list)
-        unexpected_results = sum([result['has_error'] is True for result in test_results_list])
-
-        counts = {
-            'runs': len(runs_ids),
-            'iterations': len(iterations_ids),
-            'total_results': total_results,
-            'expected_results': total_results - unexpected_results,
-            'unexpected_results': unexpected_results,
-        }
-
         # Get related data
         important_tags, relevant_tags = get_tags_by_runs(runs_ids)
         data = {
@@ -497,7 +550,55 @@ class HistoryService:
             'relevant_tags': relevant_tags,
         }
 
-        return data, counts, runs_ids, iterations_ids, results_ids
+        return data, runs_ids, iterations_ids, results_ids
+
+    @staticmethod
+    def get_history_results(
+        test_name: str,
+        history_cache: HistoryCache | None = None,
+        **filters,
+    ) -> dict:
+        """
+        Get the results of the history with their counts.
+
+        If the history is cached, the rows of all the results are loaded and cached
+        at once, so the pages are taken from them. Otherwise the queryset of
+        the results is returned to be paged by the database.
+
+        Args:
+            test_name: Name of the test
+            history_cache: Cache of the history
+            **filters: Filter parameters (see build_history_queryset for details)
+
+        Returns:
+            Dictionary with the results, their counts and the dates period
+        """
+
+        def build_history_results():
+            test_results, from_date_obj, to_date_obj = HistoryService.build_history_queryset(
+                test_name,
+                **filters,
+            )
+            counts, results_ids, iteration_groups = HistoryService.get_results_counts(
+                test_results,
+            )
+            return {
+                'test_results': test_results,
+                'counts': counts,
+                'results_ids': results_ids,
+                'iteration_groups': iteration_groups,
+                'from_date': display_to_date_in_numbers(from_date_obj),
+                'to_date': display_to_date_in_numbers(to_date_obj),
+            }
+
+        def build_history_rows():
+            history_results = build_history_results()
+            history_results['test_results'] = list(history_results['test_results'])
+            return history_results
+
+        if history_cache is None or not history_cache.cacheable:
+            return build_history_results()
+        return history_cache.get_or_set('results', build_history_rows)
 
     @staticmethod
     def get_history(
@@ -509,6 +610,9 @@ class HistoryService:
         """
         Get test history (linear format).
 
+        Only the results of the requested page are hydrated. The pages and
+        the results of the history are cached by HistoryCache.
+
         Args:
             test_name: Name of the test
             page: Page number (default: 1)
@@ -521,25 +625,30 @@ class HistoryService:
         Raises:
             UnprocessableEntityError: if invalid parameters
         """
+        history_cache = HistoryCache(filters.get('project_id'), test_name=test_name, **filters)
+        page_key = f'list:{page}:{page_size}'
+        history = history_cache.get(page_key)
+        if history is not None:
+            return history
 
-        # Build queryset
-        test_results, from_date_obj, to_date_obj = HistoryService.build_history_queryset(
+        history_results = HistoryService.get_history_results(
             test_name,
+            history_cache,
             **filters,
         )
 
-        # Prepare data
-        data, counts, _runs_ids, _iterations_ids, results_ids = (
-            HistoryService.prepare_results_data(test_results)
-        )
-
         # Apply pagination to test_results
         paginated_data = PaginatedResult.paginate_queryset(
-            data['test_results'],
+            history_results['test_results'],
             page,
             page_size,
+            count=history_results['counts']['total_results'],
+        )
+
+        # Prepare data
+        data, _runs_ids, _iterations_ids, _results_ids = HistoryService.prepare_results_data(
+            paginated_data['results'],
         )
-        data['test_results'] = paginated_data['results']
 
         # Aggregate results
         response_list = prepare_list_results(
@@ -552,14 +661,16 @@ class HistoryService:
             data['verdicts'],
         )
 
-        return {
-            'from_date': display_to_date_in_numbers(from_date_obj),
-            'to_date': display_to_date_in_numbers(to_date_obj),
-            'counts': counts,
+        history = {
+            'from_date': history_results['from_date'],
+            'to_date': history_results['to_date'],
+            'counts': history_results['counts'],
             'pagination': paginated_data['pagination'],
             'results': response_list,
-            'results_ids': list(results_ids),
+            'results_ids': history_results['results_ids'],
         }
+        history_cache.set(page_key, history)
+        return history
 
     @staticmethod
     def get_history_grouped(
@@ -571,6 +682,10 @@ class HistoryService:
         """
         Get test history grouped by iteration.
 
+        The groups are paginated, only the results of the iterations on
+        the requested page are hydrated. The pages and the results of
+        the history are cached by HistoryCache.
+
         Args:
             test_name: Name of the test
             page: Page number (default: 1)
@@ -583,30 +698,62 @@ class HistoryService:
         Raises:
             UnprocessableEntityError: if invalid parameters
         """
+        history_cache = HistoryCache(filters.get('project_id'), test_name=test_name, **filters)
+        page_key = f'grouped:{page}:{page_size}'
+        history = history_cache.get(page_key)
+        if history is not None:
+            return history
 
-        # Build queryset
-        test_results, from_date_obj, to_date_obj = HistoryService.build_history_queryset(
+        history_results = HistoryService.get_history_results(
             test_name,
+            history_cache,
             **filters,
         )
+        test_results = history_results['test_results']
+
+        # Apply pagination to the iteration hashes
+        if isinstance(test_results, QuerySet):
+            iteration_hashes = (
+                test_results.order_by('iteration_hash')
+                .values_list('iteration_hash', flat=True)
+                .distinct()
+            )
+        else:
+            iteration_hashes = sorted({result['iteration_hash'] for result in test_results})
+        paginated_data = PaginatedResult.paginate_queryset(
+            iteration_hashes,
+            page,
+            page_size,
+            count=history_results['iteration_groups'],
+        )
+        page_hashes = list(paginated_data['results'])
 
         # Prepare data
-        data, counts, _runs_ids, _iterations_ids, results_ids = (
-            HistoryService.prepare_results_data(test_results)
+        if isinstance(test_results, QuerySet):
+            page_results = test_results.filter(iteration_hash__in=page_hashes)
+        else:
+            page_hashes_set = set(page_hashes)
+            page_results = [
+                result for result in test_results if result['iteration_hash'] in page_hashes_set
+            ]
+        data, _runs_ids, _iterations_ids, _results_ids = HistoryService.prepare_results_data(
+            page_results,
         )
 
         # Group by iteration
-        test_results_by_iteration = group_results_by_iteration(data['test_results'])
-        grouped_results = []
-        for _iteration_hash, iteration_results in test_results_by_iteration:
-            grouped_results.append(list(iteration_results))
-
-        # Apply pagination to grouped results
-        paginated_data = PaginatedResult.paginate_queryset(grouped_results, page, page_size)
+        results_by_iteration = {
+            iteration_hash: list(iteration_results)
+            for iteration_hash, iteration_results in group_results_by_iteration(
+                data['test_results'],
+            )
+        }
+        grouped_results = [
+            results_by_iteration[iteration_hash] for iteration_hash in page_hashes
+        ]
 
         # Aggregate results
         response_list = group_results(
-            paginated_data['results'],
+            grouped_results,
             data['important_tags'],
             data['relevant_tags'],
             data['parameters_by_iterations'],
@@ -614,14 +761,57 @@ class HistoryService:
             data['verdicts'],
         )
 
-        return {
-            'from_date': display_to_date_in_numbers(from_date_obj),
-            'to_date': display_to_date_in_numbers(to_date_obj),
-            'counts': counts,
+        history = {
+            'from_date': history_results['from_date'],
+            'to_date': history_results['to_date'],
+            'counts': history_results['counts'],
             'pagination': paginated_data['pagination'],
             'results': response_list,
-            'results_ids': list(results_ids),
+            'results_ids': history_results['results_ids'],
         }
+        history_cache.set(page_key, history)
+        return history
+
+    @staticmethod
+    def export_history(test_name: str, **filters):
+        """
+        Get all the results of the history for export.
+
+        The results are read by a server-side cursor and hydrated by chunks,
+        so the memory consumption doesn't depend on the number of results.
+        The filters are checked before the results are read.
+
+        Args:
+            test_name: Name of the test
+            **filters: Filter parameters (see build_history_queryset for details)
+
+        Returns:
+            Iterator over the results in the format of get_history()
+
+        Raises:
+            NotFoundError: if test name is invalid
+        """
+        test_results, _from_date_obj, _to_date_obj = HistoryService.build_history_queryset(
+            test_name,
+            **filters,
+        )
+
+        def hydrate_results():
+            for chunk in iterate_chunks(test_results):
+                data, _runs_ids, _iterations_ids, _results_ids = (
+                    HistoryService.prepare_results_data(chunk)
+                )
+                yield from prepare_list_results(
+                    data['test_results'],
+                    data['important_tags'],
+                    data['relevant_tags'],
+                    data['metadata_by_runs'],
+                    data['parameters_by_iterations'],
+                    data['results'],
+                    data['verdicts'],
+                )
+
+        return hydrate_results()
 
     @staticmethod
     def get_test_search_options(project_id: str | None):
@@ -6,28 +6,16 @@ import hashlib
 from itertools import groupby
 import urllib
 
-from deepdiff import DeepHash
 from django.conf import settings
 
 from bublik.core.datetime_formatting import get_duration
 from bublik.core.report.services import ReportService
-from bublik.core.run.stats import get_expected_results
+from bublik.core.run.stats import get_results_expected_results
 from bublik.core.run.utils import prepare_dates_period
 from bublik.core.utils import key_value_dict_transforming
 from bublik.data.models import ResultStatus, TestIterationResult
 
 
-def generate_hashkey(request):
-    hashkey = hashlib.md5()
-
-    for key, value in request.GET.items():
-        if any(key == k for k in ('page', 'clicksearch', 'subsearch')) or not value:
-            continue
-        hashkey.update(f'{key}={value!s}%'.encode())
-
-    return hashkey.hexdigest()
-
-
 def prepare_list_results(
     test_results,
     important_tags,
@@ -37,6 +25,20 @@ def prepare_list_results(
     results,
     verdicts,
 ):
+    # Load the objects, the expected results and the report configs of the page at once
+    test_results_objs = TestIterationResult.objects.select_related(
+        'project',
+        'test_run',
+    ).in_bulk([test_result['id'] for test_result in test_results])
+    expected_results = get_results_expected_results(test_results_objs.values())
+    report_configs = ReportService.get_most_recent_configs_for_runs_reports(
+        {
+            test_result_obj.test_run
+            for test_result_obj in test_results_objs.values()
+            if test_result_obj.test_run is not None
+        },
+    )
+
     results_to_response = []
     for test_result in test_results:
         run_id = test_result['run_id']
@@ -44,12 +46,10 @@ def prepare_list_results(
         result_id = test_result['id']
         result_start = test_result['start']
         result_finish = test_result['finish']
+        test_result_obj = test_results_objs[result_id]
 
         # Handle expected result
-        test_result_obj = TestIterationResult.objects.select_related('project', 'test_run').get(
-            id=result_id,
-        )
-        expected_results_data = get_expected_results(test_result_obj)
+        expected_results_data = expected_results[result_id]
 
         # Handle obtained result
         obtained_result_data = {
@@ -58,7 +58,9 @@ def prepare_list_results(
         }
 
         # Handle parameters
-        parameters_list = key_value_dict_transforming(parameters_by_iterations[iteration_id])
+        parameters_list = list(
+            key_value_dict_transforming(parameters_by_iterations[iteration_id]),
+        )
 
         # Handle metadata
         metadata = metadata_by_runs.get(run_id, [])
@@ -80,9 +82,7 @@ def prepare_list_results(
             'project_name': test_result_obj.project.name,
             'result_id': result_id,
             'iteration_id': iteration_id,
-            'report_config_id': ReportService.get_most_recent_config_for_run_report(
-                test_result_obj.test_run,
-            ),
+            'report_config_id': report_configs.get(test_result_obj.test_run_id),
         }
 
         results_to_response.append(result)
@@ -99,15 +99,20 @@ def group_results_by_iteration(test_results):
 
 
 def group_results_by_verdict(test_results, important_tags, relevant_tags):
-    def verdicts_grouper(result):
-        data = {key: result[key] for key in ('result_type', 'verdict')}
-        return DeepHash(data)[data]
-
+    """
+    Group the results by the obtained result and the hash of the obtained
+    verdicts, the groups are in the order of their most recent results.
+    """
     # Group by verdicts
+    results_groups = {}
+    for result in test_results:
+        results_groups.setdefault(
+            (result['result_type'], result['verdicts_hash']),
+            [],
+        ).append(result)
+
     results_by_verdicts = []
-    data = sorted(test_results, key=verdicts_grouper)
-    for verdict_hash, result_groups in groupby(data, key=verdicts_grouper):
-        results = list(result_groups)
+    for (result_type, verdicts_hash), results in results_groups.items():
         result_status = results[0]
 
         results_data = []
@@ -126,7 +131,7 @@ def group_results_by_verdict(test_results, important_tags, relevant_tags):
 
         results_by_verdicts.append(
             {
-                'key': verdict_hash,
+                'key': hashlib.md5(f'{result_type}:{verdicts_hash}'.encode()).hexdigest(),
                 'result_type': result_status['result_type'],
                 'has_error': result_status['has_error'],
                 'verdict': result_status['verdict'],
@@ -152,7 +157,9 @@ def group_results(
         iteration_id = group['iteration_id']
 
         # Handle parameters
-        parameters_list = key_value_dict_transforming(parameters_by_iterations[iteration_id])
+        parameters_list = list(
+            key_value_dict_transforming(parameters_by_iterations[iteration_id]),
+        )
 
         iteration_group = {
             'hash': group['iteration_hash'],
@@ -173,6 +180,7 @@ def group_results(
                     'start_date': test_result['start'].isoformat(),
                     'result_type': results[result_id],
                     'verdict': verdicts.get(result_id, []),
+                    'verdicts_hash': test_result['verdicts_hash'],
                     'has_error': test_result['has_error'],
                 },
             )
@@ -140,7 +140,7 @@ def import_run(
         )
         if log_file:
             args = (process_dir, log_file) if log_file == 'bublik.json' else (process_dir,)
-            json_data = JSONLog().convert_from_dir(*args)
+            json_data = JSONLog(streamed=True).convert_from_dir(*args)
             logger.info(
                 f'run logs were downloaded from {os.path.join(run_source_url, log_file)}',
             )
@@ -248,9 +248,11 @@ def import_run(
         add_import_id(run, task_id)
         add_run_log(run, suffix_url, logs_base)
         categorization.categorize_metas(meta_data=meta_data, project_id=project.id)
-        prepare_cache_for_completed_run(run)
         with MeasureTime('fixing timestamps'):
-            call_command('fix_result_timestamps', '-i', run.id)
+            # The history results are built once by preparing the cache
+            call_command('fix_result_timestamps', '-i', run.id, '--skip-history-results')
+        # The cached data and the history results copy the fixed timestamps
+        prepare_cache_for_completed_run(run)
 
         logger.info(f'run id is {run.id}')
 
@@ -4,9 +4,11 @@
 from datetime import timedelta
 import logging
 
-from bublik.core.cache import RunCache
+from bublik.core.history.results import update_run_history_results
 from bublik.core.importruns import ImportMode
+from bublik.core.importruns.live.store import LiveLogStore
 from bublik.core.run.objects import set_run_status
+from bublik.core.run.summary import update_run_summary
 from bublik.data.models.result import TestIterationResult
 
 
@@ -24,12 +26,8 @@ def livelog_check_run_timeout(run):
     if run.import_mode != ImportMode.LIVE:
         return False
 
-    # Try to fetch the context
-    cache = RunCache.by_obj(run, 'livelog')
-    ctx = cache.data
-
-    # If it's not there, mark the run finished
-    if not ctx:
+    # If there is no context, mark the run finished
+    if not LiveLogStore(run.id).exists():
         logger.info(f'no live import context for run {run.id}, cleaning up')
 
         # Finish pending tests and the run itself
@@ -52,6 +50,8 @@ def livelog_check_run_timeout(run):
         run.save()
 
         set_run_status(run, 'RUN_STATUS_ERROR')
+        update_run_summary(run)
+        update_run_history_results(run.id)
         return True
 
     return False
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import collections
-from datetime import timedelta
+from datetime import datetime, timedelta
+import functools
+import time
 from typing import ClassVar
 
 from django.conf import settings
@@ -12,8 +14,10 @@ from rest_framework import status
 from rest_framework.response import Response
 
 from bublik.core.datetime_formatting import utc_ts_to_dt
+from bublik.core.history.results import update_run_history_results
 from bublik.core.importruns import ImportMode, identify_run
 from bublik.core.importruns.live.plan_tracking import PlanItem, PlanTracker
+from bublik.core.importruns.live.store import LiveLogStore
 from bublik.core.importruns.milog import HandlerArtifacts
 from bublik.core.logging import get_task_or_server_logger
 from bublik.core.run.metadata import MetaData
@@ -28,6 +32,7 @@ from bublik.core.run.objects import (
     set_run_import_mode,
     set_run_status,
 )
+from bublik.core.run.summary import update_run_summary
 from bublik.data.models.result import (
     ResultType,
     Test,
@@ -79,11 +84,13 @@ class NodeIDConverter:
 
     HISTORY_SIZE = 20
 
-    def __init__(self):
-        self.items = []
+    def __init__(self, items=()):
+        self.items = [tuple(item) for item in items]
+        self.new_items = []
 
     def add_rule(self, node_id, result_id):
         self.items.append((node_id, result_id))
+        self.new_items.append((node_id, result_id))
         if len(self.items) > self.HISTORY_SIZE:
             self.items.pop(0)
 
@@ -95,7 +102,12 @@ class NodeIDConverter:
 
 
 class TestStackItem:
-    """Description of the currently running entity in Bublik terms."""
+    """
+    Description of the currently running entity in Bublik terms.
+
+    Only IDs of the model objects are stored, the objects are loaded
+    on the first access.
+    """
 
     def __init__(
         self,
@@ -111,15 +123,72 @@ class TestStackItem:
         self.seqno = seqno
         self.node_id = node_id
         self.plan_id = plan_id
-        self.test = test
-        self.iteration = iteration
-        self.result = result
+        self._test = test
+        self._iteration = iteration
+        self._result = result
+        self.test_id = test.id if test else None
+        self.iteration_id = iteration.id if iteration else None
+        self.result_id = result.id if result else None
+
+    @property
+    def test(self):
+        if self._test is None:
+            self._test = Test.objects.get(id=self.test_id)
+        return self._test
+
+    @property
+    def iteration(self):
+        if self._iteration is None:
+            self._iteration = TestIteration.objects.get(id=self.iteration_id)
+        return self._iteration
+
+    @property
+    def result(self):
+        if self._result is None:
+            self._result = TestIterationResult.objects.get(id=self.result_id)
+        return self._result
+
+    def to_state(self):
+        return [
+            self.test_stack_type,
+            self.seqno,
+            self.node_id,
+            self.plan_id,
+            self.test_id,
+            self.iteration_id,
+            self.result_id,
+        ]
+
+    @classmethod
+    def from_state(cls, state):
+        test_stack_type, seqno, node_id, plan_id, *ids = state
+        item = cls(
+            test_stack_type=test_stack_type,
+            seqno=seqno,
+            node_id=node_id,
+            plan_id=plan_id,
+        )
+        item.test_id, item.iteration_id, item.result_id = ids
+        return item
+
+
+@functools.lru_cache(maxsize=32)
+def get_plan_root(run_id):
+    """
+    Build the execution plan of the live import once per process,
+    plan items are not changed while tracking except for their IDs,
+    which are restored from the plan cursor.
+    """
+    return PlanItem(LiveLogStore(run_id).load_plan_tree())
 
 
 class LiveLogContext:
     """
     Context that should be preserved between the heartbeats of TE
     log streaming protocol.
+
+    The context is kept in LiveLogStore, save() writes only the fields
+    changed since the context was created or loaded.
     """
 
     # Additional time to allow a request to reach Bublik
@@ -127,6 +196,8 @@ class LiveLogContext:
     TRIP_TIME = 60
     # Node ID assigned to test items that were lost
     LOST_ITEM_NODE_ID = -1
+    # The minimal interval in seconds between updates of the run summary
+    SUMMARY_SETTINGS_DEFAULTS: ClassVar[dict] = {'live_update_interval': 30}
 
     REQUIRED_EVENT_DATA: ClassVar[dict[str, list[str]]] = {
         'test_start': ['id', 'parent', 'plan_id', 'ts', 'node_type', 'name'],
@@ -150,7 +221,7 @@ class LiveLogContext:
             )
 
     def __init__(self, data):
-        self.run = None
+        self._run = None
 
         meta_data = None
         tags = None
@@ -186,9 +257,9 @@ class LiveLogContext:
                         msg = 'start time not specified'
                         raise LLInvalidInputError(msg)
                 meta_data = MetaData(data['meta_data'])
-                self.run = identify_run(meta_data.key_metas)
+                run_id = identify_run(meta_data.key_metas)
                 self.last_ts = meta_data.run_start
-                self.project = meta_data.project
+                self.project_id = meta_data.project.id
             except Exception as e:
                 err = e if isinstance(e, str) else 'error occurred while processing metadata'
                 raise LLInternalError(err) from err
@@ -197,16 +268,17 @@ class LiveLogContext:
             raise LLInvalidInputError(msg)
 
         force_update = True
-        if self.run is None:
+        if run_id is None:
             run_data = {
                 'test_run': None,
                 'start': meta_data.run_start,
-                'project_id': self.project.id,
+                'project_id': self.project_id,
             }
-            self.run = TestIterationResult.objects.create(**run_data)
+            self._run = TestIterationResult.objects.create(**run_data)
+            self.run_id = self._run.id
             force_update = False
         else:
-            msg = f'this run already exists ({self.run})'
+            msg = f'this run already exists ({run_id})'
             raise LLInvalidInputError(msg)
 
         meta_data.handle(self.run, force_update)
@@ -215,7 +287,8 @@ class LiveLogContext:
             add_tags(self.run, tags)
 
         if data.get('plan') is not None:
-            plan_root = PlanItem(data['plan'])
+            self.plan_data = data['plan']
+            plan_root = PlanItem(self.plan_data)
             self.plan_tracker = PlanTracker(plan_root)
         else:
             msg = 'no execution plan provided'
@@ -232,28 +305,96 @@ class LiveLogContext:
         self.current_seqno = 1
         self.max_node_id = 0
         self.node_conv = NodeIDConverter()
+        self.summary_ts = None
+        self.stored = {'state': {}, 'tests': {}, 'plan': {}}
+
+    @property
+    def run(self):
+        if self._run is None:
+            self._run = TestIterationResult.objects.get(id=self.run_id)
+        return self._run
+
+    def to_state(self):
+        """Split the context into the fields of LiveLogStore hashes."""
+        return {
+            'state': {
+                'run_id': self.run_id,
+                'project_id': self.project_id,
+                'heartbeat': self.heartbeat,
+                'last_ts': self.last_ts.isoformat(),
+                'current_seqno': self.current_seqno,
+                'max_node_id': self.max_node_id,
+                'plan_next_id': self.plan_tracker.next_id,
+                'summary_ts': self.summary_ts,
+            },
+            'tests': {
+                str(depth): item.to_state() for depth, item in enumerate(self.test_stack)
+            },
+            'plan': {
+                str(depth): list(item) for depth, item in enumerate(self.plan_tracker.cursor())
+            },
+        }
+
+    @classmethod
+    def load(cls, run_id):
+        """Restore the context of the run, returns None if there is no context."""
+        stored = LiveLogStore(run_id).load()
+        if stored is None:
+            return None
 
-    def serialize(self):
-        """Prepare the stack to be cached, deflate model objects."""
-        if isinstance(self.run, int):
-            return
+        ctx = cls.__new__(cls)
+        state = stored['state']
+        ctx._run = None
+        ctx.run_id = state['run_id']
+        ctx.project_id = state['project_id']
+        ctx.heartbeat = state['heartbeat']
+        ctx.last_ts = datetime.fromisoformat(state['last_ts'])
+        ctx.current_seqno = state['current_seqno']
+        ctx.max_node_id = state['max_node_id']
+        ctx.summary_ts = state.get('summary_ts')
+        ctx.plan_data = None
+        ctx.plan_tracker = PlanTracker.from_cursor(
+            get_plan_root(run_id),
+            [stored['plan'][str(depth)] for depth in range(len(stored['plan']))],
+            state['plan_next_id'],
+        )
+        ctx.test_stack = collections.deque(
+            TestStackItem.from_state(stored['tests'][str(depth)])
+            for depth in range(len(stored['tests']))
+        )
+        ctx.node_conv = NodeIDConverter(stored['nodes'])
+        ctx.stored = stored
+        return ctx
+
+    def save(self):
+        """Write the changes of the context to LiveLogStore."""
+        state = self.to_state()
+        changes = {}
+        for section, fields in state.items():
+            stored_fields = self.stored[section]
+            changes[section] = {
+                field: value
+                for field, value in fields.items()
+                if stored_fields.get(field) != value
+            }
+            changes[section].update(
+                dict.fromkeys(set(stored_fields) - set(fields)),
+            )
+        changes['nodes'] = self.node_conv.new_items
 
-        self.run = self.run.id
-        for item in self.test_stack:
-            item.test = item.test.id
-            item.iteration = item.iteration.id
-            item.result = item.result.id
+        LiveLogStore(self.run_id).save(
+            changes,
+            plan_tree=self.plan_data,
+            nodes_limit=NodeIDConverter.HISTORY_SIZE,
+        )
 
-    def deserialize(self):
-        """Inflate model objects after the stack was extracted from cache."""
-        if isinstance(self.run, TestIterationResult):
-            return
+        state['nodes'] = self.node_conv.items
+        self.stored = state
+        self.plan_data = None
+        self.node_conv.new_items = []
 
-        self.run = TestIterationResult.objects.get(id=self.run)
-        for item in self.test_stack:
-            item.test = Test.objects.get(id=item.test)
-            item.iteration = TestIteration.objects.get(id=item.iteration)
-            item.result = TestIterationResult.objects.get(id=item.result)
+    def delete(self):
+        LiveLogStore(self.run_id).delete()
 
     def executing_test(self):
         return self.test_stack and self.test_stack[-1].test_stack_type == ResultType.TEST
@@ -339,7 +480,7 @@ class LiveLogContext:
             test_iteration = add_iteration(test, None, '', parent_iter, len(self.test_stack))
             # Create TestIterationResult
             test_iteration_result = add_iteration_result(
-                project_id=self.project.id,
+                project_id=self.project_id,
                 start_time=self.last_ts,
                 iteration=test_iteration,
                 run=self.run,
@@ -474,7 +615,7 @@ class LiveLogContext:
         # Add TestIterationResult
         logger.debug('adding result')
         test_iteration_result = add_iteration_result(
-            project_id=self.project.id,
+            project_id=self.project_id,
             start_time=self.last_ts,
             iteration=test_iteration,
             run=self.run,
@@ -605,6 +746,27 @@ class LiveLogContext:
                         'artifact processing failure: missing test iteration result',
                     )
 
+        self.update_summary()
+
+    def update_summary(self):
+        """
+        Update the run summary and add the history results of the finished
+        tests unless it has been done recently.
+        """
+        summary_settings = {
+            **self.SUMMARY_SETTINGS_DEFAULTS,
+            **getattr(settings, 'RUN_SUMMARY', {}),
+        }
+        now = time.time()
+        if (
+            self.summary_ts is not None
+            and now - self.summary_ts < summary_settings['live_update_interval']
+        ):
+            return
+        update_run_summary(self.run)
+        update_run_history_results(self.run.id, finished_only=True)
+        self.summary_ts = now
+
     def finish(self, data):
         """Initialize import using TE log streaming protocol."""
         if 'ts' not in data:
@@ -125,6 +125,36 @@ class PlanTracker:
         self.stack = [PlanStackItem(root_item)]
         self.next_id = 1
 
+    def cursor(self):
+        """
+        Return the position in the plan as a list of (current child, running,
+        item ID) of the stack items, the stack items are the descendants of
+        each other, so the position can be restored with the plan only.
+        """
+        return [
+            (stack_item.current_child, stack_item.running, stack_item.item.id)
+            for stack_item in self.stack
+        ]
+
+    @classmethod
+    def from_cursor(cls, root_item, cursor, next_id):
+        """Restore the tracker at the position returned by cursor()."""
+        tracker = cls(root_item)
+        tracker.stack = []
+        tracker.next_id = next_id
+
+        plan_item = root_item
+        for current_child, running, item_id in cursor:
+            plan_item.id = item_id
+            stack_item = PlanStackItem(plan_item)
+            stack_item.current_child = current_child
+            stack_item.running = running
+            tracker.stack.append(stack_item)
+            if current_child >= 0:
+                plan_item = plan_item.children[current_child]
+
+        return tracker
+
     def next_event(self):
         """Advance one step through the plan."""
         if len(self.stack) == 0:
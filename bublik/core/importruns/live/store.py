@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from __future__ import annotations
+
+import json
+
+from django_redis import get_redis_connection
+
+
+class LiveLogStore:
+    """
+    Redis storage of the live import context of a run.
+
+    The context is kept in small keys updated in place:
+        - '{prefix}:state': hash of the context scalar fields;
+        - '{prefix}:tests': hash of the test stack items by their depth;
+        - '{prefix}:plan': hash of the plan cursor items by their depth;
+        - '{prefix}:nodes': list of the recent node ID to result ID rules;
+        - '{prefix}:plan_tree': the execution plan, it is written only once.
+    All the values are JSON encoded.
+    """
+
+    CACHE_ALIAS = 'run'
+    SECTIONS = ('state', 'tests', 'plan', 'nodes', 'plan_tree')
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.prefix = f'livelog:{run_id}'
+        self.redis = get_redis_connection(self.CACHE_ALIAS)
+
+    def key(self, section):
+        return f'{self.prefix}:{section}'
+
+    def exists(self):
+        return bool(self.redis.exists(self.key('state')))
+
+    def delete(self):
+        self.redis.delete(*[self.key(section) for section in self.SECTIONS])
+
+    @staticmethod
+    def decode_hash(data):
+        return {key.decode(): json.loads(value) for key, value in data.items()}
+
+    def load(self):
+        """
+        Returns the stored context sections except the execution plan,
+        or None if there is no context for the run.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hgetall(self.key('state'))
+        pipe.hgetall(self.key('tests'))
+        pipe.hgetall(self.key('plan'))
+        pipe.lrange(self.key('nodes'), 0, -1)
+        state, tests, plan, nodes = pipe.execute()
+        if not state:
+            return None
+
+        return {
+            'state': self.decode_hash(state),
+            'tests': self.decode_hash(tests),
+            'plan': self.decode_hash(plan),
+            'nodes': [json.loads(node) for node in nodes],
+        }
+
+    def load_plan_tree(self):
+        plan_tree = self.redis.get(self.key('plan_tree'))
+        return json.loads(plan_tree) if plan_tree is not None else None
+
+    def save(self, changes, plan_tree=None, nodes_limit=None):
+        """
+        Write the changed fields of the context sections in one round trip.
+
+        Changes of the hash sections are dicts of the fields to set,
+        None values delete the fields. Nodes are appended to the list
+        keeping at most nodes_limit last ones.
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        for section in ('state', 'tests', 'plan'):
+            fields = changes.get(section) or {}
+            to_set = {
+                field: json.dumps(value) for field, value in fields.items() if value is not None
+            }
+            to_delete = [field for field, value in fields.items() if value is None]
+            if to_set:
+                pipe.hset(self.key(section), mapping=to_set)
+            if to_delete:
+                pipe.hdel(self.key(section), *to_delete)
+
+        nodes = changes.get('nodes')
+        if nodes:
+            pipe.rpush(self.key('nodes'), *[json.dumps(node) for node in nodes])
+            if nodes_limit is not None:
+                pipe.ltrim(self.key('nodes'), -nodes_limit, -1)
+
+        if plan_tree is not None:
+            pipe.set(self.key('plan_tree'), json.dumps(plan_tree))
+
+        pipe.execute()
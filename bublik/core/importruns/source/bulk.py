@@ -0,0 +1,625 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from collections import Counter, defaultdict
+from datetime import timezone
+import json
+
+from django.db.models import Q
+
+from bublik.core.datetime_formatting import get_run_tz, to_db_format, utc_ts_to_dt
+from bublik.core.exceptions import ImportrunsError
+from bublik.core.importruns.milog import HandlerArtifacts
+from bublik.core.meta.categorization import categorize_metas_in_bulk
+from bublik.core.run.keys import prepare_expected_key
+from bublik.core.run.utils import prepare_date
+from bublik.data.models import (
+    Expectation,
+    MetaResult,
+    ResultType,
+    Test,
+    TestIteration,
+    TestIterationRelation,
+    TestIterationResult,
+)
+from bublik.data.serializers import (
+    ExpectationSerializer,
+    MetaSerializer,
+    TestArgumentSerializer,
+)
+
+
+BULK_BATCH_SIZE = 1000
+
+
+class IterationNode:
+    """
+    In-memory representation of one iteration of the parsed run log.
+
+    All the data required to create the corresponding objects is extracted
+    at collection time, ids are filled in when the node is flushed.
+    """
+
+    def __init__(self, data, parent, depth):
+        self.parent = parent
+        self.depth = depth
+
+        self.name = data['name']
+        self.type = data['type']
+        if not self.name and self.type == 'session':
+            self.name = 'session'
+        self.params = data['params']
+        self.hash = data['hash']
+        self.tin = data['tin']
+        self.exec_seqno = data['test_id']
+
+        self.start = None
+        self.finish = None
+        self.prologue_count = None
+        self.metas = []
+        self.expectations = []
+        self.measurements = None
+
+        self.test_id = None
+        self.iteration_id = None
+        self.result = None
+        self.existing = False
+
+    @property
+    def result_type(self):
+        return ResultType.conv(self.type)
+
+    @property
+    def parent_test_id(self):
+        return self.parent.test_id if self.parent else None
+
+    @property
+    def parent_result_id(self):
+        return self.parent.result.id if self.parent else None
+
+    def ancestors(self):
+        node = self.parent
+        while node:
+            yield node
+            node = node.parent
+
+    def add_meta(self, meta_data, serial=0):
+        self.metas.append((meta_data, serial))
+
+
+class BulkIterationsImporter:
+    """
+    Import run iterations in two phases.
+
+    collect() walks the parsed log and keeps every node in memory, flush()
+    resolves tests, iterations, arguments, metas and expectations of the
+    collected nodes with a handful of IN lookups, creates the missing ones
+    with bulk_create() and then creates the results along with their metas.
+
+    Identity maps are kept between flushes, so a run log can be collected
+    and flushed in parts as long as parents are flushed before children.
+    Streamed logs use open_node() and close_node() instead of collect(),
+    as the iteration data becomes complete only after its children are read.
+    """
+
+    def __init__(self, run, project_id, tests_nums_prologues):
+        self.run = run
+        self.project_id = project_id
+        self.tests_nums_prologues = tests_nums_prologues
+
+        self.counter = Counter(iter_obj=0, created_iter_obj=0)
+        self.pending = []
+        self.closed = []
+
+        self.tests = {}
+        self.iterations = {}
+        self.relations = set()
+        self.relations_loaded = set()
+        self.expected_keys = {}
+        self.existing_results = None
+
+    def collect(self, data, parent=None):
+        """
+        Collect the iteration and all its descendants in the pre-order.
+        Returns the node created for the passed iteration.
+        """
+        root = None
+        stack = [(data, parent, parent.depth + 1 if parent else 0)]
+        while stack:
+            data, parent, depth = stack.pop()
+            node = self.collect_node(data, parent, depth)
+            root = root or node
+            stack.extend(
+                (child_data, node, depth + 1) for child_data in reversed(data['iters'] or [])
+            )
+        return root
+
+    def collect_node(self, data, parent, depth):
+        node = self.open_node(data, parent, depth)
+        self.close_node(node, data)
+        return node
+
+    def open_node(self, data, parent, depth=None):
+        """
+        Create the node from the fields identifying the iteration result,
+        the rest of the iteration data is passed to close_node() later.
+        This allows to start saving parents before their children are read.
+        """
+        if depth is None:
+            depth = parent.depth + 1 if parent else 0
+
+        self.counter['iter_obj'] += 1
+        node = IterationNode(data, parent, depth)
+
+        node.start, node.finish = (
+            (
+                utc_ts_to_dt(data[utc_ts_key], timezone.utc)
+                if utc_ts_key in data
+                else to_db_format(data[local_ts_key])
+                .replace(tzinfo=get_run_tz(self.run))
+                .astimezone(timezone.utc)
+            )
+            for utc_ts_key, local_ts_key in [
+                ('start_ts_utc', 'start_ts'),
+                ('end_ts_utc', 'end_ts'),
+            ]
+        )
+
+        self.pending.append(node)
+        return node
+
+    def close_node(self, node, data):
+        """
+        Extract metas, expectations and measurements of the opened node.
+        """
+        node.add_meta({'type': 'objective', 'value': data['objective']})
+        for requirement in data['reqs']:
+            node.add_meta({'type': 'requirement', 'value': requirement})
+
+        obtained = data['obtained']
+        obtained_result = obtained['result']
+
+        plan_id = data['plan_id']
+        if plan_id in self.tests_nums_prologues and obtained_result['status'] not in [
+            'PASSED',
+            'FAKED',
+        ]:
+            node.prologue_count = str(self.tests_nums_prologues[plan_id])
+            node.add_meta(
+                {
+                    'name': 'expected_items_prologue',
+                    'type': 'count',
+                    'value': node.prologue_count,
+                },
+            )
+
+        for serial, verdict in enumerate(obtained_result.get('verdicts') or []):
+            node.add_meta({'type': 'verdict', 'value': verdict}, serial)
+        if obtained_result['status'] is not None:
+            node.add_meta({'type': 'result', 'value': obtained_result['status']})
+        if data['err']:
+            node.add_meta({'type': 'err', 'value': data['err']})
+        for artifact in obtained_result.get('artifacts') or []:
+            node.add_meta({'type': 'artifact', 'value': artifact})
+
+        expected = data.get('expected')
+        if expected:
+            keys = [expected['key']] if 'key' in expected else []
+            notes = [expected['notes']] if 'notes' in expected else []
+            for expected_result in expected['results']:
+                if 'key' in expected_result:
+                    keys.append(expected_result['key'])
+                if 'notes' in expected_result:
+                    notes.append(expected_result['notes'])
+                node.expectations.append(
+                    self.expect_metas(
+                        expected_result['status'],
+                        expected_result.get('verdicts'),
+                        obtained.get('tag_expression'),
+                        keys,
+                        notes,
+                    ),
+                )
+        else:
+            keys = [obtained['key']] if 'key' in obtained else []
+            if 'key' in obtained_result:
+                keys.append(obtained_result['key'])
+            notes = [obtained['notes']] if 'notes' in obtained else []
+            if 'notes' in obtained_result:
+                notes.append(obtained_result['notes'])
+            node.expectations.append(
+                self.expect_metas(
+                    obtained_result['status'],
+                    obtained_result.get('verdicts'),
+                    obtained.get('tag_expression'),
+                    keys,
+                    notes,
+                ),
+            )
+
+        node.measurements = data.get('measurements')
+        self.closed.append(node)
+
+    def expect_metas(self, result, verdicts, tag_expression, keys, notes):
+        """
+        Build expect metas the same way as add_expected_result() does,
+        processing every distinct expected key only once.
+        """
+        expect_metas = []
+        if result is not None:
+            expect_metas.append({'meta': {'type': 'result', 'value': result}})
+        for index, verdict in enumerate(verdicts or []):
+            expect_metas.append(
+                {'meta': {'type': 'verdict_expected', 'value': verdict}, 'serial': index},
+            )
+        if tag_expression is not None:
+            expect_metas.append({'meta': {'type': 'tag_expression', 'value': tag_expression}})
+        for key in keys:
+            if key not in self.expected_keys:
+                self.expected_keys[key] = list(prepare_expected_key(key, self.project_id))
+            expect_metas.extend(self.expected_keys[key])
+        for index, note in enumerate(notes):
+            expect_metas.append({'meta': {'type': 'note', 'value': note}, 'serial': index})
+        return expect_metas
+
+    def flush(self):
+        """
+        Save all the collected nodes to the database.
+
+        Results are saved for all the opened nodes, their metas, expectations
+        and measurements are saved only for the closed ones.
+        """
+        opened, self.pending = self.pending, []
+        if opened:
+            self.resolve_tests(opened)
+            self.resolve_iterations(opened)
+            self.resolve_relations(opened)
+            self.save_results(opened)
+
+        closed, self.closed = self.closed, []
+        if closed:
+            self.save_meta_results(closed)
+            self.save_expectations(closed)
+            self.save_measurements(closed)
+
+    def flush_if_full(self):
+        """
+        Flush the collected nodes once there are enough of them for a batch.
+        """
+        if len(self.closed) >= BULK_BATCH_SIZE:
+            self.flush()
+
+    def resolve_tests(self, nodes):
+        nodes_by_depth = defaultdict(list)
+        for node in nodes:
+            nodes_by_depth[node.depth].append(node)
+
+        for depth in sorted(nodes_by_depth):
+            level_nodes = nodes_by_depth[depth]
+            missing = {
+                (node.name, node.parent_test_id, node.result_type)
+                for node in level_nodes
+                if (node.name, node.parent_test_id, node.result_type) not in self.tests
+            }
+
+            if missing:
+                names = {name for name, _, _ in missing}
+                parent_ids = {parent_id for _, parent_id, _ in missing}
+                parent_query = Q(parent_id__in=parent_ids - {None})
+                if None in parent_ids:
+                    parent_query |= Q(parent__isnull=True)
+                for test_id, name, parent_id, result_type in Test.objects.filter(
+                    parent_query,
+                    name__in=names,
+                ).values_list('id', 'name', 'parent_id', 'result_type'):
+                    self.tests[(name, parent_id, result_type)] = test_id
+
+                to_create = [key for key in missing if key not in self.tests]
+                created = Test.objects.bulk_create(
+                    [
+                        Test(name=name, parent_id=parent_id, result_type=result_type)
+                        for name, parent_id, result_type in to_create
+                    ],
+                )
+                for key, test in zip(to_create, created):
+                    self.tests[key] = test.id
+
+            for node in level_nodes:
+                node.test_id = self.tests[(node.name, node.parent_test_id, node.result_type)]
+
+    def resolve_iterations(self, nodes):
+        for node in nodes:
+            if node.result_type not in ResultType.INV_SET:
+                msg = f'unknown entity type: {node.type}'
+                raise ImportrunsError(message=msg)
+            if ResultType.inv(node.result_type) != ResultType.TEST:
+                node.hash = None
+
+        missing = {
+            (node.test_id, node.hash)
+            for node in nodes
+            if (node.test_id, node.hash) not in self.iterations
+        }
+        if missing:
+            test_ids = {test_id for test_id, _ in missing}
+            hashes = {iteration_hash for _, iteration_hash in missing} - {None}
+            for iteration_id, test_id, iteration_hash in (
+                TestIteration.objects.filter(test_id__in=test_ids)
+                .filter(Q(hash__in=hashes) | Q(hash__isnull=True))
+                .order_by('id')
+                .values_list('id', 'test_id', 'hash')
+            ):
+                self.iterations.setdefault((test_id, iteration_hash), iteration_id)
+
+        to_create = {}
+        for node in nodes:
+            key = (node.test_id, node.hash)
+            if key not in self.iterations and key not in to_create:
+                to_create[key] = node
+        self.counter['created_iter_obj'] += len(to_create)
+
+        created = TestIteration.objects.bulk_create(
+            [TestIteration(test_id=test_id, hash=hash_) for test_id, hash_ in to_create],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        for key, iteration in zip(to_create, created):
+            self.iterations[key] = iteration.id
+
+        for node in nodes:
+            node.iteration_id = self.iterations[(node.test_id, node.hash)]
+
+        self.add_iterations_arguments(
+            [node for node in to_create.values() if node.hash is not None and node.params],
+        )
+
+    def add_iterations_arguments(self, nodes):
+        arguments_data = {}
+        for node in nodes:
+            for name, value in node.params.items():
+                arguments_data.setdefault((name, value), {'name': name, 'value': value})
+        if not arguments_data:
+            return
+
+        arguments = TestArgumentSerializer.get_or_create_many(list(arguments_data.values()))
+        argument_ids = {
+            key: argument.id for key, (argument, _) in zip(arguments_data, arguments)
+        }
+
+        through_model = TestIteration.test_arguments.through
+        through_model.objects.bulk_create(
+            [
+                through_model(
+                    testiteration_id=node.iteration_id,
+                    testargument_id=argument_ids[(name, value)],
+                )
+                for node in nodes
+                for name, value in node.params.items()
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    def resolve_relations(self, nodes):
+        relations = {}
+        for node in nodes:
+            if node.depth == 0:
+                relations[(node.iteration_id, None, 0)] = node
+                continue
+            for depth, ancestor in enumerate(node.ancestors(), start=1):
+                relations[(node.iteration_id, ancestor.iteration_id, depth)] = node
+
+        iteration_ids = {iteration_id for iteration_id, _, _ in relations}
+        not_loaded = iteration_ids - self.relations_loaded
+        if not_loaded:
+            self.relations.update(
+                TestIterationRelation.objects.filter(
+                    test_iteration_id__in=not_loaded,
+                ).values_list('test_iteration_id', 'parent_iteration_id', 'depth'),
+            )
+            self.relations_loaded |= not_loaded
+
+        to_create = [relation for relation in relations if relation not in self.relations]
+        TestIterationRelation.objects.bulk_create(
+            [
+                TestIterationRelation(
+                    test_iteration_id=iteration_id,
+                    parent_iteration_id=parent_iteration_id,
+                    depth=depth,
+                )
+                for iteration_id, parent_iteration_id, depth in to_create
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        self.relations.update(to_create)
+
+    def load_existing_results(self):
+        self.existing_results = defaultdict(list)
+        for result in TestIterationResult.objects.filter(test_run=self.run).values(
+            'id',
+            'exec_seqno',
+            'parent_package_id',
+            'tin',
+        ):
+            self.existing_results[result['exec_seqno']].append(result)
+
+    def get_existing_result(self, node):
+        """
+        Get the result already stored for the node exec_seqno checking it
+        for compliance, the same way add_iteration_result() does.
+        """
+        existing = self.existing_results.get(node.exec_seqno)
+        if not existing:
+            return None
+
+        if len(existing) > 1:
+            msg = 'duplicated TestIterationResult objects were found! Check and clean DB!'
+            debug_details = [
+                f'Run ID: {self.run.id}',
+                f'Duplicated TestIterationResult objects: {[r["id"] for r in existing]}',
+            ]
+            raise ImportrunsError(message=msg, debug_details=debug_details)
+
+        existing = existing[0]
+        existing_tin = existing['tin']
+        if existing['parent_package_id'] != node.parent_result_id or (
+            existing_tin is not None and existing_tin != int(node.tin) and existing_tin > -1
+        ):
+            msg = (
+                f'Test result with sequence number {node.exec_seqno} already exists '
+                'for this run. Duplicate entries are not allowed.'
+            )
+            debug_details = [
+                f'Run ID: {self.run.id}',
+                f'Existing TestIterationResult with passed exec_seqno: {existing}',
+            ]
+            raise ImportrunsError(message=msg, debug_details=debug_details)
+
+        return existing
+
+    def save_results(self, nodes):
+        """
+        Update the results stored by previous imports and create the new ones.
+
+        New results are created in the pre-order of the log, parent packages
+        are linked afterwards, so result ids keep following the tree order.
+        """
+        if self.existing_results is None:
+            self.load_existing_results()
+
+        to_update = []
+        to_create = []
+        for node in nodes:
+            existing = self.get_existing_result(node)
+            node.existing = existing is not None
+            node.result = TestIterationResult(
+                id=existing['id'] if existing else None,
+                test_run=self.run,
+                iteration_id=node.iteration_id,
+                exec_seqno=node.exec_seqno,
+                tin=node.tin,
+                start=prepare_date(node.start),
+                finish=prepare_date(node.finish) if node.finish else None,
+                project_id=self.project_id,
+            )
+            if node.existing:
+                node.result.parent_package_id = existing['parent_package_id']
+                to_update.append(node.result)
+            else:
+                to_create.append(node)
+
+        TestIterationResult.objects.bulk_update(
+            to_update,
+            ['project', 'start', 'finish', 'tin', 'iteration'],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        TestIterationResult.objects.bulk_create(
+            [node.result for node in to_create],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+        to_link = []
+        for node in to_create:
+            if node.parent:
+                node.result.parent_package_id = node.parent_result_id
+                to_link.append(node.result)
+        TestIterationResult.objects.bulk_update(
+            to_link,
+            ['parent_package'],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def save_meta_results(self, nodes):
+        metas_data = {}
+        for node in nodes:
+            for meta_data, _ in node.metas:
+                metas_data.setdefault(self.meta_key(meta_data), meta_data)
+
+        metas = MetaSerializer.get_or_create_many(list(metas_data.values()))
+        categorize_metas_in_bulk([meta for meta, created in metas if created])
+        meta_ids = {key: meta.id for key, (meta, _) in zip(metas_data, metas)}
+
+        existing_ids = [node.result.id for node in nodes if node.existing]
+        existing_meta_results = set()
+        if existing_ids:
+            MetaResult.objects.filter(
+                result_id__in=[
+                    node.result.id
+                    for node in nodes
+                    if node.existing and node.prologue_count is not None
+                ],
+                meta__name='expected_items_prologue',
+                meta__type='count',
+            ).delete()
+            existing_meta_results.update(
+                MetaResult.objects.filter(result_id__in=existing_ids).values_list(
+                    'result_id',
+                    'meta_id',
+                    'serial',
+                ),
+            )
+
+        meta_results = {}
+        for node in nodes:
+            for meta_data, serial in node.metas:
+                key = (node.result.id, meta_ids[self.meta_key(meta_data)], serial)
+                if key not in existing_meta_results:
+                    meta_results.setdefault(key, None)
+
+        MetaResult.objects.bulk_create(
+            [
+                MetaResult(result_id=result_id, meta_id=meta_id, serial=serial)
+                for result_id, meta_id, serial in meta_results
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def save_expectations(self, nodes):
+        expectations_data = {}
+        for node in nodes:
+            for expect_metas in node.expectations:
+                expectations_data.setdefault(
+                    self.expectation_key(expect_metas),
+                    {'expectmeta_set': expect_metas},
+                )
+
+        expectations = ExpectationSerializer.get_or_create_many(
+            list(expectations_data.values()),
+        )
+        expectation_ids = {
+            key: expectation.id
+            for key, (expectation, _) in zip(expectations_data, expectations)
+        }
+
+        # Clear iteration result expectations before adding them, as the fix
+        # for bug #318 may have changed the set of metas identifying an expectation
+        # for the same data, which would cause duplicates on force imports.
+        through_model = Expectation.results.through
+        through_model.objects.filter(
+            testiterationresult_id__in=[node.result.id for node in nodes if node.existing],
+        ).delete()
+
+        through_model.objects.bulk_create(
+            [
+                through_model(
+                    expectation_id=expectation_ids[self.expectation_key(expect_metas)],
+                    testiterationresult_id=node.result.id,
+                )
+                for node in nodes
+                for expect_metas in node.expectations
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    def save_measurements(self, nodes):
+        for node in nodes:
+            if node.measurements:
+                HandlerArtifacts(node.result).handle_mi_artifacts(node.measurements)
+
+    @staticmethod
+    def meta_key(meta_data):
+        return tuple(sorted(meta_data.items()))
+
+    @staticmethod
+    def expectation_key(expect_metas):
+        return json.dumps(expect_metas, sort_keys=True)
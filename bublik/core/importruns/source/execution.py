@@ -1,30 +1,20 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
 
-from collections import Counter
-from datetime import timezone
-
 from django.core.management import call_command
 from django.db import transaction
 
-from bublik.core.datetime_formatting import get_run_tz, to_db_format, utc_ts_to_dt
 from bublik.core.importruns import ImportMode, identify_run
 from bublik.core.importruns.live.plan_tracking import PlanItem
 from bublik.core.importruns.milog import EntryLevel, HandlerArtifacts
+from bublik.core.importruns.source.bulk import BulkIterationsImporter
+from bublik.core.importruns.telog import StreamedIterations
 from bublik.core.importruns.utils import MeasureTime
 from bublik.core.logging import get_task_or_server_logger
 from bublik.core.run.objects import (
-    add_expected_result,
-    add_iteration,
-    add_iteration_result,
-    add_objective,
-    add_obtained_result,
-    add_requirements,
     add_tags,
-    add_test,
     clear_run_count,
     del_blank_iteration_results,
-    set_prologues_counts,
     set_run_count,
     set_run_import_mode,
 )
@@ -32,160 +22,13 @@ from bublik.data.models import TestIterationResult
 
 
 @MeasureTime('handling iterations')
-def handle_iterations(run_log, run, project_id, tests_nums_prologues):
-    for iteration_data in run_log['iters']:
-        handle_iteration(
-            iteration_data,
-            run,
-            project_id,
-            None,
-            None,
-            None,
-            0,
-            tests_nums_prologues,
-        )
-
-
-def handle_iteration(
-    data,
-    run,
-    project_id,
-    parent_iteration,
-    parent_package,
-    parent_test,
-    parent_depth,
-    tests_nums_prologues,
-):
-    handle_iteration.counter['iter_obj'] += 1
-
-    if not data['name'] and data['type'] == 'session':
-        data['name'] = 'session'
-
-    test = add_test(data['name'], data['type'], parent_test)
-
-    iteration = add_iteration(
-        test,
-        data['params'],
-        data['hash'],
-        parent_iteration,
-        parent_depth,
-    )
-    handle_iteration.counter['created_iter_obj'] += add_iteration.counter['created']
-
-    start_ts, end_ts = (
-        (
-            utc_ts_to_dt(data[utc_ts_key], timezone.utc)
-            if utc_ts_key in data
-            else to_db_format(data[local_ts_key])
-            .replace(tzinfo=get_run_tz(run))
-            .astimezone(timezone.utc)
-        )
-        for utc_ts_key, local_ts_key in [('start_ts_utc', 'start_ts'), ('end_ts_utc', 'end_ts')]
-    )
-
-    iteration_result = add_iteration_result(
-        project_id,
-        start_ts,
-        end_ts,
-        iteration,
-        run,
-        parent_package,
-        data['tin'],
-        data['test_id'],
-    )
-
-    add_objective(
-        iteration_result,
-        data['objective'],
-    )
-
-    add_requirements(
-        iteration_result,
-        data['reqs'],
-    )
-
-    obtained = data['obtained']
-
-    plan_id = data['plan_id']
-    if plan_id in tests_nums_prologues and obtained['result']['status'] not in [
-        'PASSED',
-        'FAKED',
-    ]:
-        set_prologues_counts(
-            iteration_result,
-            'expected_items_prologue',
-            tests_nums_prologues[plan_id],
-        )
-
-    obtained_result = obtained['result']
-
-    add_obtained_result(
-        iteration_result,
-        obtained_result['status'],
-        obtained_result.get('verdicts'),
-        data['err'],
-    )
-
-    with transaction.atomic():
-        # Clear iteration result expectations before adding them, as the fix
-        # for bug #318 may have changed the set of metas identifying an expectation
-        # for the same data, which would cause duplicates on force imports.
-        iteration_result.expectations.clear()
-
-        expected = data.get('expected')
-        if expected:
-            keys = [expected['key']] if 'key' in expected else []
-            notes = [expected['notes']] if 'notes' in expected else []
-            for expected_result in expected['results']:
-                if 'key' in expected_result:
-                    keys.append(expected_result['key'])
-                if 'notes' in expected_result:
-                    notes.append(expected_result['notes'])
-                add_expected_result(
-                    iteration_result,
-                    expected_result['status'],
-                    expected_result.get('verdicts'),
-                    obtained.get('tag_expression'),
-                    keys,
-                    notes,
-                )
-        else:
-            keys = [obtained['key']] if 'key' in obtained else []
-            if 'key' in obtained_result:
-                keys.append(obtained_result['key'])
-            notes = [obtained['notes']] if 'notes' in obtained else []
-            if 'notes' in obtained_result:
-                notes.append(obtained_result['notes'])
-            add_expected_result(
-                iteration_result,
-                obtained_result['status'],
-                obtained_result.get('verdicts'),
-                obtained.get('tag_expression'),
-                keys,
-                notes,
-            )
-
-    artifacts = obtained['result'].get('artifacts')
-    if artifacts:
-        HandlerArtifacts(iteration_result).handle_artifacts(artifacts)
-
-    measurements = data.get('measurements')
-    if measurements:
-        HandlerArtifacts(iteration_result).handle_mi_artifacts(measurements)
-
-    if not data['iters']:
-        return
-    for child_data in data['iters']:
-        handle_iteration(
-            child_data,
-            run,
-            project_id,
-            iteration,
-            iteration_result,
-            test,
-            parent_depth + 1,
-            tests_nums_prologues,
-        )
+def handle_iterations(iterations, importer):
+    if isinstance(iterations, StreamedIterations):
+        iterations.feed(importer)
+    else:
+        for iteration_data in iterations:
+            importer.collect(iteration_data)
+    importer.flush()
 
 
 @MeasureTime('incremental import')
@@ -193,8 +36,6 @@ def handle_iteration(
 def incremental_import(run_log, project_id, meta_data, run_completed, force):
     logger = get_task_or_server_logger()
 
-    handle_iteration.counter = Counter(iter_obj=0, created_iter_obj=0)
-
     run_start = meta_data.run_start
     run_finish = meta_data.run_finish if run_completed else None
 
@@ -249,13 +90,14 @@ def incremental_import(run_log, project_id, meta_data, run_completed, force):
         clear_run_count(run, 'expected_items')
 
     if run_log.get('iters') is not None:
-        handle_iterations(run_log, run, project_id, tests_nums_prologues)
+        importer = BulkIterationsImporter(run, project_id, tests_nums_prologues)
+        handle_iterations(run_log['iters'], importer)
         logger.info(
-            f'the number of handled iterations is {handle_iteration.counter["iter_obj"]}',
+            f'the number of handled iterations is {importer.counter["iter_obj"]}',
         )
         logger.info(
             'the number of created iteration objects is '
-            f'{handle_iteration.counter["created_iter_obj"]}',
+            f'{importer.counter["created_iter_obj"]}',
         )
         logger.info(
             f'handling measurements during handling iterations took ['
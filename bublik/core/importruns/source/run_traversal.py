@@ -3,17 +3,22 @@
 
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from functools import wraps
 import re
-from typing import TYPE_CHECKING
-from urllib.parse import urljoin
+import threading
+import time
+from typing import TYPE_CHECKING, ClassVar
+from urllib.parse import urljoin, urlsplit
 
 from bs4 import BeautifulSoup
+from django.conf import settings
 
 from bublik.core.checks import check_run_file
 from bublik.core.exceptions import (
     RunCompromisedError,
+    TraversalLimitError,
     URLFetchError,
 )
 from bublik.core.importruns.utils import indicate_collision, runtime
@@ -116,13 +121,67 @@ def with_run_events(gen_func):
     return wrapper
 
 
+class HostRateLimiter:
+    """
+    Spread requests to every host so that there are at most rate requests
+    per second, requests to different hosts are not limited by each other.
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_slots = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slots.get(host, now))
+            self.next_slots[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class HTTPDirectoryTraverser:
+    """
+    Crawl HTML directory listings looking for runs.
+
+    Listings are fetched and run files are probed by a pool of workers,
+    the traversal is limited with the depth of directories relative to
+    the initial URL and with the time budget. Directories that are skipped
+    due to the limits are reported with TraversalLimitError.
+    The settings are taken from RUNS_TRAVERSAL in settings.py.
+    """
+
+    SETTINGS_DEFAULTS: ClassVar[dict] = {
+        'workers': 8,
+        'host_rate_limit': None,
+        'max_depth': None,
+        'time_budget': None,
+    }
+
     def __init__(self, url, job_id):
         super().__init__()
         self.url = url
         self.job_task_execution = get_import_job_task(job_id)
 
-    def __find_runs(self, url):
+        traversal_settings = {
+            **self.SETTINGS_DEFAULTS,
+            **getattr(settings, 'RUNS_TRAVERSAL', {}),
+        }
+        self.workers = traversal_settings['workers']
+        self.max_depth = traversal_settings['max_depth']
+        self.time_budget = traversal_settings['time_budget']
+        self.rate_limiter = HostRateLimiter(traversal_settings['host_rate_limit'])
+
+    def __visit(self, url):
+        """
+        Returns whether the directory is a run and the URLs of its subdirectories.
+        """
+        self.rate_limiter.wait(url)
         html = fetch_url(url, quiet_404=True)
 
         ast = BeautifulSoup(markup=html, features='html.parser')
@@ -133,26 +192,81 @@ class HTTPDirectoryTraverser:
         ):
             raise RunCompromisedError
 
+        self.rate_limiter.wait(url)
         if check_run_file('meta_data.json', url):
-            yield url, None
-            return
+            return True, []
 
         # NOTE: the parser relies on links to directories ending with a slash "/"
-        for node in ast.find_all(
-            lambda t: (
-                t.name == 'a'
-                and hasattr(t, 'href')
-                and not re.match(r'(\./)?\.\./?', t['href'])
-                and t['href'].endswith('/')
-            ),
-        ):
-            a_href = node['href'].strip()
-            url_next = urljoin(url + '/', a_href)
+        return False, [
+            urljoin(url + '/', node['href'].strip())
+            for node in ast.find_all(
+                lambda t: (
+                    t.name == 'a'
+                    and hasattr(t, 'href')
+                    and not re.match(r'(\./)?\.\./?', t['href'])
+                    and t['href'].endswith('/')
+                ),
+            )
+        ]
+
+    def __find_runs(self, url):
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        depth_error = TraversalLimitError(
+            f'the depth limit of {self.max_depth} directories is reached',
+        )
+        time_error = TraversalLimitError(
+            f'the time budget of {self.time_budget} sec is exhausted',
+        )
+
+        # Errors of the initial URL are raised, errors of subdirectories are yielded
+        is_run, subdirs = self.__visit(url)
+        if is_run:
+            yield url, None
+            return
 
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            queue = [(url_next, 1) for url_next in subdirs]
+            expired = False
             try:
-                yield from self.__find_runs(url_next)
-            except Exception as e:
-                yield url_next, e
+                while queue or pending:
+                    expired = expired or (deadline is not None and time.monotonic() >= deadline)
+                    for url_next, depth in queue:
+                        if expired:
+                            yield url_next, time_error
+                        elif self.max_depth is not None and depth > self.max_depth:
+                            yield url_next, depth_error
+                        else:
+                            future = executor.submit(self.__visit, url_next)
+                            pending[future] = (url_next, depth)
+                    queue = []
+
+                    if expired:
+                        # Drop the directories that haven't been visited yet,
+                        # the ones being visited are still waited for
+                        for future in [future for future in pending if future.cancel()]:
+                            yield pending.pop(future)[0], time_error
+
+                    timeout = None
+                    if deadline is not None and not expired:
+                        timeout = max(deadline - time.monotonic(), 0)
+                    done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        url_next, depth = pending.pop(future)
+                        try:
+                            is_run, subdirs = future.result()
+                        except Exception as e:
+                            yield url_next, e
+                            continue
+
+                        if is_run:
+                            yield url_next, None
+                        else:
+                            queue.extend((subdir, depth + 1) for subdir in subdirs)
+            finally:
+                for future in pending:
+                    future.cancel()
 
     @with_run_events
     def find_runs(self):
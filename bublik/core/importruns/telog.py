@@ -1,11 +1,18 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
 
+import bz2
+import contextlib
+import gzip
 import json
+import lzma
 import os
+import shutil
 import subprocess
+import tempfile
 
 from django.conf import settings
+import ijson
 
 from bublik.core.logging import get_task_or_server_logger
 
@@ -72,12 +79,36 @@ class LogConverter:
         return self
 
 
-class GZipLog(LogConverter):
+class DecompressedLog(LogConverter):
     """
-    Class to decompress GZip files.
+    Abstract converter that decompresses path_in in-process.
+
+    The decompressed log can be either written into path_out by convert()
+    or read by the next consumer directly from the stream returned by open().
     """
 
-    FMT_GZIP_DECOMPRESS = "gzip -d -k '{path_in}' -c > '{path_out}'"
+    DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+    def open(self):
+        raise AssertionError
+
+    def convert(self):
+        logger = get_task_or_server_logger()
+        logger.info('decompressing %s into %s', self.path_in, self.path_out)
+
+        try:
+            with self.open() as log_in, open(self.path_out, 'wb') as log_out:
+                shutil.copyfileobj(log_in, log_out)
+        except self.DECOMPRESSION_ERRORS as e:
+            raise ConverterError(self.log_type, self.path_in, e) from e
+
+        return self
+
+
+class GZipLog(DecompressedLog):
+    """
+    Class to decompress GZip files.
+    """
 
     def __init__(self, path_in=None, path_out=None):
         assert path_in
@@ -87,17 +118,15 @@ class GZipLog(LogConverter):
             path_out = path_in[: -len('.gz')]
         super().__init__(log_type='gz', path_in=path_in, path_out=path_out)
 
-    def convert_cmd(self):
-        return GZipLog.FMT_GZIP_DECOMPRESS.format(path_in=self.path_in, path_out=self.path_out)
+    def open(self):
+        return gzip.open(self.path_in, 'rb')
 
 
-class BZip2Log(LogConverter):
+class BZip2Log(DecompressedLog):
     """
     Class to decompress BZip2 files.
     """
 
-    FMT_BZIP2_DECOMPRESS = "bzip2 -d -k '{path_in}' -c > '{path_out}'"
-
     def __init__(self, path_in=None, path_out=None):
         assert path_in
         assert path_in.endswith('.bz2')
@@ -106,20 +135,15 @@ class BZip2Log(LogConverter):
             path_out = path_in[: -len('.bz2')]
         super().__init__(log_type='bz2', path_in=path_in, path_out=path_out)
 
-    def convert_cmd(self):
-        return BZip2Log.FMT_BZIP2_DECOMPRESS.format(
-            path_in=self.path_in,
-            path_out=self.path_out,
-        )
+    def open(self):
+        return bz2.open(self.path_in, 'rb')
 
 
-class XZLog(LogConverter):
+class XZLog(DecompressedLog):
     """
     Class to decompress XZ files.
     """
 
-    FMT_XZ_DECOMPRESS = "xz -d -k '{path_in}' -c > '{path_out}'"
-
     def __init__(self, path_in=None, path_out=None):
         assert path_in
         assert path_in.endswith('.xz')
@@ -128,8 +152,8 @@ class XZLog(LogConverter):
             path_out = path_in[: -len('.xz')]
         super().__init__(log_type='xz', path_in=path_in, path_out=path_out)
 
-    def convert_cmd(self):
-        return XZLog.FMT_XZ_DECOMPRESS.format(path_in=self.path_in, path_out=self.path_out)
+    def open(self):
+        return lzma.open(self.path_in, 'rb')
 
 
 class XMLLog(LogConverter):
@@ -147,15 +171,65 @@ class XMLLog(LogConverter):
             path_out = os.path.join(os.path.dirname(path_in), 'log.json')
         super().__init__(log_type='xml', path_in=path_in, path_out=path_out)
 
-    def convert_cmd(self):
-        path_xml_parser = os.path.join(settings.BASE_DIR, 'scripts', 'xml_log_parser')
+    @staticmethod
+    def path_xml_parser():
+        return os.path.join(settings.BASE_DIR, 'scripts', 'xml_log_parser')
 
+    def convert_cmd(self):
         return XMLLog.FMT_XML_PARSER.format(
-            path_xml_parser=path_xml_parser,
+            path_xml_parser=self.path_xml_parser(),
             path_in=self.path_in,
             path_out=self.path_out,
         )
 
+    def convert_from(self, source):
+        """
+        Convert the XML log read from the stream of the source converter,
+        the stream is piped to the parser instead of being saved to path_in.
+        """
+        logger = get_task_or_server_logger()
+
+        cmd = [self.path_xml_parser(), '-']
+        logger.info('running command: %s < %s', ' '.join(cmd), source.path_in)
+
+        with open(self.path_out, 'wb') as log_out, tempfile.TemporaryFile() as errors:
+            try:
+                proc = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=log_out,
+                    stderr=errors,
+                )
+            except OSError as e:
+                raise ConverterError(self.log_type, source.path_in, e) from e
+
+            try:
+                with source.open() as log_in:
+                    shutil.copyfileobj(log_in, proc.stdin)
+            except BrokenPipeError:
+                # The parser failed, the error is reported below
+                pass
+            except source.DECOMPRESSION_ERRORS as e:
+                proc.kill()
+                raise ConverterError(source.log_type, source.path_in, e) from e
+            finally:
+                with contextlib.suppress(BrokenPipeError):
+                    proc.stdin.close()
+                proc.wait()
+
+            if proc.returncode != 0:
+                errors.seek(0)
+                logger.error(
+                    f'Failed conversion command: {cmd}\nError: {errors.read()}',
+                )
+                raise ConverterError(
+                    self.log_type,
+                    source.path_in,
+                    Exception(f'Failed conversion command: {cmd}'),
+                )
+
+        return self
+
 
 class RawLog(LogConverter):
     """
@@ -200,39 +274,191 @@ class RawLogBundle(LogConverter):
         )
 
 
+def read_json_value(events, first_event, first_value):
+    """
+    Build the JSON value starting with the passed event
+    consuming the rest of its events from the stream.
+    """
+    if first_event not in ('start_map', 'start_array'):
+        return first_value
+
+    builder = ijson.ObjectBuilder()
+    builder.event(first_event, first_value)
+    depth = 1
+    for event, value in events:
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        if not depth:
+            break
+    return builder.value
+
+
+def skip_json_value(events, first_event):
+    """
+    Consume the events of the JSON value starting with the passed event.
+    """
+    if first_event not in ('start_map', 'start_array'):
+        return
+
+    depth = 1
+    for event, _ in events:
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        if not depth:
+            return
+
+
+class StreamedIterations:
+    """
+    Iterations of the JSON log that are fed to an importer one by one
+    while parsing the log instead of loading the whole tree into memory.
+
+    An iteration is opened as soon as the fields identifying it are read,
+    so its children can be imported before the iteration is closed.
+    If the log has the children of an iteration before these fields,
+    the children subtree is loaded and collected as a whole.
+    """
+
+    HEAD_KEYS = frozenset(('name', 'type', 'params', 'hash', 'tin', 'test_id'))
+    TS_KEYS = (('start_ts_utc', 'start_ts'), ('end_ts_utc', 'end_ts'))
+
+    def __init__(self, json_log):
+        self.json_log = json_log
+
+    def has_head(self, data):
+        return self.HEAD_KEYS.issubset(data) and all(
+            utc_ts_key in data or local_ts_key in data
+            for utc_ts_key, local_ts_key in self.TS_KEYS
+        )
+
+    def feed(self, importer):
+        with self.json_log.open() as json_file:
+            events = ijson.basic_parse(json_file, use_float=True)
+            next(events)
+            for event, key in events:
+                if event == 'end_map':
+                    return
+                event, _ = next(events)
+                if key == 'iters':
+                    if event == 'start_array':
+                        self.feed_iterations(events, importer, None)
+                    return
+                skip_json_value(events, event)
+
+    def feed_iterations(self, events, importer, parent):
+        for event, _ in events:
+            if event == 'end_array':
+                return
+            self.feed_iteration(events, importer, parent)
+
+    def feed_iteration(self, events, importer, parent):
+        data = {}
+        node = None
+        for event, key in events:
+            if event == 'end_map':
+                break
+            event, value = next(events)
+            if key == 'iters' and node is None and self.has_head(data):
+                node = importer.open_node(data, parent)
+                if event == 'start_array':
+                    self.feed_iterations(events, importer, node)
+            else:
+                data[key] = read_json_value(events, event, value)
+
+        if node is None:
+            node = importer.open_node(data, parent)
+            for child_data in data.get('iters') or []:
+                importer.collect(child_data, node)
+        importer.close_node(node, data)
+        importer.flush_if_full()
+
+
+class StreamedJSONLog(dict):
+    """
+    JSON log with all the top-level fields loaded except iterations,
+    which are represented by StreamedIterations to be read on import.
+    The log is read from the stream opened by the source object.
+    """
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+
+        with self.open() as json_file:
+            events = ijson.basic_parse(json_file, use_float=True)
+            next(events)
+            for event, key in events:
+                if event == 'end_map':
+                    break
+                event, value = next(events)
+                if key == 'iters' and event == 'start_array':
+                    skip_json_value(events, event)
+                    self[key] = StreamedIterations(self)
+                else:
+                    self[key] = read_json_value(events, event, value)
+
+    def open(self):
+        return self.source.open()
+
+
 class JSONLog:
     """
     This class keeps a temporary file for JSON log and provides interfaces
     to unpack and load this log.
     """
 
-    def __init__(self, process_dir=None, json_filename='log.json'):
+    def __init__(self, process_dir=None, json_filename='log.json', streamed=False):
         self.path_json_log = None
+        self.streamed = streamed
         self.process_dir = process_dir
         self.json_filename = json_filename
         if self.process_dir:
             self.path_json_log = os.path.join(self.process_dir, self.json_filename)
 
-    def load(self, json_filename=None):
+    def open(self):
+        return open(self.path_json_log, 'rb')
+
+    def load(self, json_filename=None, source=None):
         if json_filename:
             self.path_json_log = os.path.join(self.process_dir, self.json_filename)
 
-        with open(self.path_json_log) as json_file:
+        with (source or self).open() as json_file:
             return json.load(json_file)
 
+    def stream(self, source=None):
+        return StreamedJSONLog(source or self)
+
+    def read(self, source=None):
+        """
+        Load the log or prepare it for streaming, the log is read
+        from the stream opened by the source object, the JSON log file
+        is used by default.
+        """
+        return self.stream(source) if self.streamed else self.load(source=source)
+
     def convert_from_xz_json_log(self, from_filename):
-        XZLog(
+        # The log is decompressed while it is read, so the decompressed
+        # log is never written to disk
+        xzlog = XZLog(
             path_in=os.path.join(self.process_dir, from_filename),
             path_out=self.path_json_log,
-        ).convert()
+        )
 
-        return self.load()
+        try:
+            return self.read(xzlog)
+        except xzlog.DECOMPRESSION_ERRORS as e:
+            raise ConverterError(xzlog.log_type, xzlog.path_in, e) from e
 
     def convert_from_xz_xml_log(self, from_filename):
-        xzlog = XZLog(path_in=os.path.join(self.process_dir, from_filename)).convert()
-        XMLLog(path_in=xzlog.path_out, path_out=self.path_json_log).convert()
+        xzlog = XZLog(path_in=os.path.join(self.process_dir, from_filename))
+        XMLLog(path_in=xzlog.path_out, path_out=self.path_json_log).convert_from(xzlog)
 
-        return self.load()
+        return self.read()
 
     def convert_from_raw_log_bundle(self, from_filename):
         raw_log_bundle = RawLogBundle(
@@ -241,7 +467,7 @@ class JSONLog:
         raw_log = RawLog(path_in=raw_log_bundle.path_out).convert()
         XMLLog(path_in=raw_log.path_out, path_out=self.path_json_log).convert()
 
-        return self.load()
+        return self.read()
 
     def convert_from_bublik_xml(self, from_filename):
         XMLLog(
@@ -249,7 +475,7 @@ class JSONLog:
             path_out=self.path_json_log,
         ).convert()
 
-        return self.load()
+        return self.read()
 
     def convert_from_dir(self, process_dir=None, json_filename=None):
         if json_filename:
@@ -259,7 +485,7 @@ class JSONLog:
             self.path_json_log = os.path.join(self.process_dir, self.json_filename)
 
         if os.path.exists(os.path.join(self.process_dir, 'bublik.json')):
-            return self.load()
+            return self.read()
         if os.path.exists(os.path.join(self.process_dir, 'bublik.xml')):
             return self.convert_from_bublik_xml('bublik.xml')
         if os.path.exists(os.path.join(self.process_dir, 'log.json.xz')):
@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 import re
 
 from django.db.models import F
@@ -19,6 +19,26 @@ def categorize_meta(meta):
             metapattern.category.metas.add(meta)
 
 
+def categorize_metas_in_bulk(metas):
+    """
+    Categorize a batch of metas loading the meta patterns only once.
+    """
+    metas = [meta for meta in metas if meta.name is not None]
+    if not metas:
+        return
+
+    metapatterns_by_type = defaultdict(list)
+    for metapattern in MetaPattern.objects.filter(
+        category__type__in={meta.type for meta in metas},
+    ).select_related('category'):
+        metapatterns_by_type[metapattern.category.type].append(metapattern)
+
+    for meta in metas:
+        for metapattern in metapatterns_by_type[meta.type]:
+            if re.search(metapattern.pattern, meta.name):
+                metapattern.category.metas.add(meta)
+
+
 def skip_meta_name(category, metas):
     # Hide meta names if every meta name matches its category name or
     # there is only one meta of a certain category.
@@ -5,6 +5,7 @@ from __future__ import annotations
 from collections import OrderedDict
 
 from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
 
 from bublik.core.exceptions import NotFoundError
 
@@ -34,14 +35,18 @@ class PaginatedResult:
         queryset,
         page: int | str | None = None,
         page_size: int | str | None = None,
+        count: int | None = None,
     ) -> dict:
         """
         Apply pagination to a queryset and return paginated result.
 
+        A QuerySet isn't evaluated, the page is sliced by the database.
+
         Args:
             queryset: Django QuerySet or list to paginate
             page: Page number (default: 1)
             page_size: Items per page (default: 25, max: 10000)
+            count: Total number of items if it is already known
 
         Returns:
             Dict with 'pagination' and 'results' keys
@@ -72,7 +77,12 @@ class PaginatedResult:
             msg = f'Page size must be <= {max_page_size}, got {page_size}'
             raise ValidationError(msg)
 
-        total_count = len(queryset)
+        if count is not None:
+            total_count = count
+        elif isinstance(queryset, QuerySet):
+            total_count = queryset.count()
+        else:
+            total_count = len(queryset)
         total_pages = max((total_count + page_size - 1) // page_size, 1)
 
         if page > total_pages:
@@ -10,7 +10,7 @@ from django.template.loader import render_to_string
 from rest_framework.exceptions import ValidationError
 
 from bublik.core.exceptions import NotFoundError
-from bublik.core.run.stats import get_run_conclusion, get_run_stats
+from bublik.core.run.summary import get_run_summary
 from bublik.data import models
 from bublik.data.models import TestIterationResult
 from bublik.data.serializers import ProjectSerializer
@@ -313,13 +313,8 @@ class ProjectBadgeService:
         )
 
     @staticmethod
-    def run_conclusion(run) -> tuple:
-        """Return (status_text, color) for a run using Bublik's built-in logic."""
-        try:
-            conclusion, _ = get_run_conclusion(run)
-        except Exception:
-            return 'unknown', ProjectBadgeService.COLORS['unknown']
-
+    def run_conclusion(conclusion) -> tuple:
+        """Return (status_text, color) for a run conclusion."""
         return {
             'run-ok': ('passing', ProjectBadgeService.COLORS['passing']),
             'run-running': ('running', ProjectBadgeService.COLORS['info']),
@@ -356,12 +351,12 @@ class ProjectBadgeService:
             return 'no runs', ProjectBadgeService.COLORS['unknown']
 
         try:
-            stats = get_run_stats(run.id)
+            summary = get_run_summary(run.id)
         except Exception:
             return 'error', ProjectBadgeService.COLORS['failing']
 
-        total = stats.get('total', 0)
-        unexpected = stats.get('unexpected', 0)
+        total = summary.total
+        unexpected = summary.unexpected
         passed = total - unexpected
 
         if metric == 'passed':
@@ -385,6 +380,6 @@ class ProjectBadgeService:
             return ProjectBadgeService._rate_badge(passed, total)
 
         # default: show run conclusion + unexpected count
-        status_text, status_color = ProjectBadgeService.run_conclusion(run)
+        status_text, status_color = ProjectBadgeService.run_conclusion(summary.conclusion)
         value = f'{status_text} ({unexpected} nok)' if unexpected > 0 else status_text
         return value, status_color
@@ -1,11 +1,19 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2024 OKTET Labs Ltd. All rights reserved.
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 from bublik.core.measurement.representation import ReportRecordBuilder
-from bublik.core.run.data import is_result_unexpected
 from bublik.core.utils import parse_number, unordered_group_by
 
 
+if TYPE_CHECKING:
+    from bublik.data.models import Measurement
+
+
 """
 The report has four levels of nesting:
 1. Test level. It contains test common arguments and enabled views.
@@ -18,6 +26,23 @@ The report has four levels of nesting:
 """
 
 
+@dataclass
+class ReportMeasurementResult:
+    """
+    The measurement result data required to build a report point.
+    """
+
+    id: int
+    value: float
+    test_name: str
+    measurement: Measurement
+    measurement_key: tuple
+    iteration_id: int
+    result_id: int
+    has_error: bool
+    args: list[tuple[str, str]]
+
+
 class ReportPoint:
     """
     This class describes the points of records and the function that allows you to group
@@ -26,11 +51,11 @@ class ReportPoint:
 
     def __init__(self, mmr, common_args, report_config):
         """
-        Build the point object based on the measurement result
+        Build the point object based on the measurement result (ReportMeasurementResult)
         according to report config.
         """
         # get test level data
-        self.test_name = mmr.result.iteration.test.name
+        self.test_name = mmr.test_name
         self.test_config = report_config['tests'][self.test_name]
 
         # get argument values level data
@@ -44,7 +69,7 @@ class ReportPoint:
 
         # get measurements level data
         self.measurement = mmr.measurement
-        self.measurement_key = mmr.measurement_group_key
+        self.measurement_key = mmr.measurement_key
 
         # get x-axis data
         self.axis_x_arg = self.test_config['axis_x']['arg']
@@ -52,14 +77,14 @@ class ReportPoint:
         value = None
 
         # collect test argument values, value of series argument and the point
-        for arg in mmr.result.iteration.test_arguments.all():
-            if arg.name == self.axis_x_arg:
-                axis_x_value = parse_number(arg.value)
+        for arg_name, arg_value in mmr.args:
+            if arg_name == self.axis_x_arg:
+                axis_x_value = parse_number(arg_value)
                 value = mmr.value
-            elif arg.name in self.series_args_vals:
-                self.series_args_vals[arg.name] = parse_number(arg.value)
-            elif arg.name not in common_args[self.test_name]:
-                self.args_vals[arg.name] = parse_number(arg.value)
+            elif arg_name in self.series_args_vals:
+                self.series_args_vals[arg_name] = parse_number(arg_value)
+            elif arg_name not in common_args[self.test_name]:
+                self.args_vals[arg_name] = parse_number(arg_value)
 
         # check iteration
         warnings = []
@@ -82,9 +107,9 @@ class ReportPoint:
             axis_x_value: {
                 'y_value': value,
                 'metadata': {
-                    'iteration_id': mmr.result.iteration.id,
-                    'result_id': mmr.result.id,
-                    'has_error': is_result_unexpected(mmr.result),
+                    'iteration_id': mmr.iteration_id,
+                    'result_id': mmr.result_id,
+                    'has_error': mmr.has_error,
                 },
             },
         }
@@ -2,18 +2,28 @@
 # Copyright (C) 2024 OKTET Labs Ltd. All rights reserved.
 from __future__ import annotations
 
+from collections import defaultdict
+
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count, Q
+from django.db.models import Count, F, Q
 from django.forms.models import model_to_dict
 
+from bublik.core.cache import RunCache
 from bublik.core.exceptions import NotFoundError
-from bublik.core.report.components import ReportPoint, ReportTestLevel
+from bublik.core.report.components import (
+    ReportMeasurementResult,
+    ReportPoint,
+    ReportTestLevel,
+)
 from bublik.core.run.services import RunService
 from bublik.core.utils import parse_number, unordered_group_by
 from bublik.data.models import (
     Config,
+    Measurement,
     MeasurementResult,
+    MetaResult,
     TestArgument,
+    TestIteration,
     TestIterationResult,
 )
 from bublik.data.models.result import ResultType
@@ -103,6 +113,65 @@ def filter_by_not_show_args(mmrs_test, not_show_args):
     return mmrs_test.difference(not_show_mmrs)
 
 
+def load_report_measurement_results(mmrs):
+    """
+    Load the data of the passed measurement results required to build the report
+    points by a fixed number of queries: measurement results with their tests,
+    measurements with their metas, iterations arguments and unexpected results.
+    """
+    mmrs_ids = list(mmrs.values_list('id', flat=True))
+    mmrs_data = list(
+        MeasurementResult.objects.filter(id__in=mmrs_ids)
+        .order_by('id')
+        .values(
+            'id',
+            'value',
+            'measurement_id',
+            'result_id',
+            iteration_id=F('result__iteration_id'),
+            test_name=F('result__iteration__test__name'),
+        ),
+    )
+
+    measurements = Measurement.objects.filter(
+        id__in={mmr['measurement_id'] for mmr in mmrs_data},
+    ).prefetch_related('metas')
+    measurements = {
+        measurement.id: (measurement, measurement.group_key()) for measurement in measurements
+    }
+
+    args_by_iterations = defaultdict(list)
+    for iteration_id, arg_name, arg_value in (
+        TestIteration.test_arguments.through.objects.filter(
+            testiteration_id__in={mmr['iteration_id'] for mmr in mmrs_data},
+        )
+        .order_by('id')
+        .values_list('testiteration_id', 'testargument__name', 'testargument__value')
+    ):
+        args_by_iterations[iteration_id].append((arg_name, arg_value))
+
+    unexpected_results = set(
+        MetaResult.objects.filter(
+            result_id__in={mmr['result_id'] for mmr in mmrs_data},
+            meta__type='err',
+        ).values_list('result_id', flat=True),
+    )
+
+    report_mmrs = []
+    for mmr in mmrs_data:
+        measurement, measurement_key = measurements[mmr.pop('measurement_id')]
+        report_mmrs.append(
+            ReportMeasurementResult(
+                **mmr,
+                measurement=measurement,
+                measurement_key=measurement_key,
+                has_error=mmr['result_id'] in unexpected_results,
+                args=args_by_iterations[mmr['iteration_id']],
+            ),
+        )
+    return report_mmrs
+
+
 class ReportService:
     @staticmethod
     def get_report_config(config_id: int) -> tuple[Config, dict, dict]:
@@ -193,11 +262,65 @@ class ReportService:
             otherwise None if no configs exist.
         """
 
-        run_report_configs_data = ReportService.get_configs_for_run_report(run)
-        if run_report_configs_data:
-            # get the ID of the most recent applicable config
-            return max(run_report_configs_data, key=lambda cfg_data: cfg_data['id'])['id']
-        return None
+        return ReportService.get_most_recent_configs_for_runs_reports([run])[run.id]
+
+    @staticmethod
+    def get_most_recent_configs_for_runs_reports(runs) -> dict[int, int | None]:
+        """
+        Get the IDs of the most recent available report configurations for runs
+        by a constant number of queries.
+
+        Args:
+            runs: TestIterationResult instances
+
+        Returns:
+            Dictionary mapping run IDs to report config IDs, None for the runs
+            without available configs.
+        """
+        runs = list(runs)
+
+        # Test names of the valid active report configs by projects
+        configs_test_names = defaultdict(dict)
+        for report_config in Config.objects.filter(
+            type='report',
+            project_id__in={run.project_id for run in runs},
+            is_active=True,
+        ):
+            if 'test_names_order' in report_config.content:
+                configs_test_names[report_config.project_id][report_config.id] = set(
+                    report_config.content['test_names_order'],
+                )
+
+        # Only the test names used by the configs are looked for in the runs
+        runs_test_names = defaultdict(set)
+        for run_id, test_name in (
+            TestIterationResult.objects.filter(
+                test_run__in=runs,
+                iteration__test__result_type=ResultType.conv(ResultType.TEST),
+                iteration__test__name__in={
+                    test_name
+                    for project_configs in configs_test_names.values()
+                    for test_names in project_configs.values()
+                    for test_name in test_names
+                },
+            )
+            .order_by()
+            .values_list('test_run_id', 'iteration__test__name')
+            .distinct()
+        ):
+            runs_test_names[run_id].add(test_name)
+
+        return {
+            run.id: max(
+                (
+                    config_id
+                    for config_id, test_names in configs_test_names[run.project_id].items()
+                    if test_names & runs_test_names[run.id]
+                ),
+                default=None,
+            )
+            for run in runs
+        }
 
     @staticmethod
     def generate_report(run_id: int, config_id: int) -> dict:
@@ -214,10 +337,29 @@ class ReportService:
         Raises:
             NotFoundError: if run not found or config not found
         """
+        run = RunService.get_run(run_id)
+
+        # The reports of a run are cached separately by config IDs
+        cache = RunCache.by_obj(run, 'report', variant=config_id)
+        return cache.get_or_set(lambda: ReportService.build_report(run, config_id))
+
+    @staticmethod
+    def build_report(run, config_id: int) -> dict:
+        """
+        Build full report for a run using specified config.
+
+        Args:
+            run: TestIterationResult instance
+            config_id: The ID of the report config
+
+        Returns:
+            Dictionary with warnings, config, content, unprocessed_iters
+
+        Raises:
+            NotFoundError: if config not found
+        """
         warnings = []
 
-        # Get run
-        run = RunService.get_run(run_id)
         main_pkg = run.root
 
         # Get and validate config
@@ -267,25 +409,23 @@ class ReportService:
 
             mmrs_report = mmrs_report.union(mmrs_test)
 
-        mmrs_report = mmrs_report.order_by('id')
-
         # Build report points
         points = []
         unprocessed_iters = []
 
-        for mmr in mmrs_report:
+        for mmr in load_report_measurement_results(mmrs_report):
             try:
                 points.append(ReportPoint(mmr, common_args, report_config))
             except ValueError as ve:
-                test_name = mmr.result.iteration.test.name
+                test_name = mmr.test_name
                 common_test_args = common_args[test_name]
                 invalid_iteration = {
                     'test_name': test_name,
                     'common_args': common_test_args,
                     'args_vals': {
-                        arg.name: parse_number(arg.value)
-                        for arg in mmr.result.iteration.test_arguments.all()
-                        if arg.name not in common_test_args
+                        arg_name: parse_number(arg_value)
+                        for arg_name, arg_value in mmr.args
+                        if arg_name not in common_test_args
                     },
                     'reasons': ve.args[0],
                 }
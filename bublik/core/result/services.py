@@ -3,12 +3,15 @@
 
 from __future__ import annotations
 
+from typing import ClassVar
+
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from rest_framework.exceptions import ValidationError
 
 from bublik.core.exceptions import NotFoundError
+from bublik.core.export import iterate_chunks
 from bublik.core.measurement.services import (
     get_measurement_charts,
     get_measurement_results,
@@ -25,6 +28,22 @@ from bublik.data import models
 
 
 class ResultService:
+    EXPORT_COLUMNS: ClassVar[dict] = {
+        'result_id': lambda result: result['result_id'],
+        'run_id': lambda result: result['run_id'],
+        'project_name': lambda result: result['project_name'],
+        'name': lambda result: result['name'],
+        'iteration_id': lambda result: result['iteration_id'],
+        'start': lambda result: result['start'],
+        'result_type': lambda result: result['obtained_result']['result_type'],
+        'verdicts': lambda result: result['obtained_result']['verdicts'],
+        'has_error': lambda result: result['has_error'],
+        'has_measurements': lambda result: result['has_measurements'],
+        'parameters': lambda result: result['parameters'],
+        'requirements': lambda result: result['requirements'],
+        'comments': lambda result: result['comments'],
+    }
+
     @staticmethod
     def get_result(result_id: int) -> models.TestIterationResult:
         """
@@ -214,17 +233,37 @@ class ResultService:
 
         return (
             queryset.order_by('-start', 'id')
-            .select_related('iteration', 'project')
+            .select_related('iteration__test', 'project')
             .prefetch_related(
-                'expectations',
-                'expectations__expectmeta_set',
-                'measurement_results',
                 'meta_results__meta',
                 'iteration__test_arguments',
             )
             .distinct('id', 'start')
         )
 
+    @staticmethod
+    def export_results(**filters):
+        """
+        Get all the filtered results with their details for export.
+
+        The results are read by a server-side cursor and their details are
+        generated by chunks, so the memory consumption doesn't depend on
+        the number of results. The filters are checked before the results are read.
+
+        Args:
+            **filters: Filter parameters (see list_results for details)
+
+        Returns:
+            Iterator over the result details in the format of list_results_paginated()
+        """
+        queryset = ResultService.list_results(**filters)
+
+        def generate_details():
+            for chunk in iterate_chunks(queryset):
+                yield from generate_results_details(chunk)
+
+        return generate_details()
+
     @staticmethod
     def list_results_paginated(
         parent_id: int | None = None,
@@ -263,5 +302,6 @@ class ResultService:
             requirements=requirements,
         )
 
-        results_details = generate_results_details(queryset)
-        return PaginatedResult.paginate_queryset(results_details, page, page_size)
+        paginated_results = PaginatedResult.paginate_queryset(queryset, page, page_size)
+        paginated_results['results'] = generate_results_details(paginated_results['results'])
+        return paginated_results
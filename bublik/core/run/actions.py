@@ -4,18 +4,72 @@
 
 from django.db import transaction
 
+from bublik.core.history.results import update_run_history_results
 from bublik.core.importruns.utils import MeasureTime
 from bublik.core.logging import get_task_or_server_logger
+from bublik.core.report.services import ReportService
 from bublik.core.run.stats import get_run_stats_detailed
+from bublik.core.run.summary import update_run_summary
+from bublik.core.tree.services import TreeService
+from bublik.interfaces.celery import tasks
 
 
 @MeasureTime('preparing cache for complited run')
 @transaction.atomic
-def prepare_cache_for_completed_run(run):
+def prepare_cache_for_completed_run(run, background=True):
+    """
+    Update the run summary and the history results of the run and warm up
+    the run cache, by a Celery task after the commit if background is set.
+    """
     logger = get_task_or_server_logger()
+    # The savepoints keep the transaction usable after a failed step
+    try:
+        with transaction.atomic():
+            update_run_summary(run)
+    except Exception as e:
+        logger.warning(f'unable to update run summary: {e}')
+    try:
+        with transaction.atomic():
+            update_run_history_results(run.id)
+    except Exception as e:
+        logger.warning(f'unable to update run history results: {e}')
     if run.finish:
+        if background:
+            transaction.on_commit(lambda: schedule_run_cache_warm_up(run))
+        else:
+            warm_up_run_cache(run)
+
+
+def schedule_run_cache_warm_up(run):
+    logger = get_task_or_server_logger()
+    try:
+        tasks.warm_up_run_cache.delay(run_id=run.id)
+    except Exception as e:
+        logger.warning(f'unable to schedule warming up run cache: {e}')
+
+
+@MeasureTime('warming up cache for completed run')
+def warm_up_run_cache(run):
+    """
+    Produce the run data that are cached on the first opening of the run:
+    the stats, the tree and the reports by all the applicable report configs.
+    """
+    logger = get_task_or_server_logger()
+    warm_ups = {
+        'stats': lambda: get_run_stats_detailed(run.id),
+        'tree': lambda: TreeService.get_tree(run.id),
+    }
+    for report_config in ReportService.get_configs_for_run_report(run):
+        warm_ups[f'report by config {report_config["id"]}'] = (
+            lambda config_id=report_config['id']: ReportService.generate_report(
+                run.id,
+                config_id,
+            )
+        )
+
+    for data_name, warm_up in warm_ups.items():
         try:
-            warn_msg = 'unable to prepare run data'
-            get_run_stats_detailed(run.id)
+            with transaction.atomic():
+                warm_up()
         except Exception as e:
-            logger.warning(f'{warn_msg}: {e}')
+            logger.warning(f'unable to prepare run {data_name}: {e}')
@@ -3,8 +3,10 @@
 
 from django.shortcuts import get_object_or_404
 
+from bublik.core.cache import HistoryCache
 from bublik.core.config.services import ConfigServices
 from bublik.core.queries import get_or_none
+from bublik.core.run.summary import update_run_summary
 from bublik.core.shortcuts import serialize
 from bublik.data.models import GlobalConfigs, MetaResult, TestIterationResult
 from bublik.data.serializers import MetaResultSerializer
@@ -99,6 +101,8 @@ def mark_run_compromised(run_id, comment, bug_id, reference_key):
     )
 
     mr, _ = mr_serialize.get_or_create()
+    update_run_summary(run)
+    HistoryCache.invalidate(run.project_id)
 
     meta_categorization.delay(run.project.name)
 
@@ -108,3 +112,5 @@ def mark_run_compromised(run_id, comment, bug_id, reference_key):
 def unmark_run_compromised(run_id):
     run = get_object_or_404(TestIterationResult, pk=run_id)
     MetaResult.objects.filter(result=run, meta__name='compromised', meta__type='note').delete()
+    update_run_summary(run)
+    HistoryCache.invalidate(run.project_id)
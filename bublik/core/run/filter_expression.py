@@ -1,15 +1,20 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
 
-from copy import deepcopy
+from functools import lru_cache
+import json
 import os
+import re
 
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 import pyparsing as pp
 from sympy import Symbol
-from sympy.logic.boolalg import And, Not, Or, to_dnf
+from sympy.logic.boolalg import And, Not, Or, false, to_dnf, true
 
-from bublik.data.models import TestIterationResult
+from bublik.data.models import MetaResult, TestIteration
+
+
+FILTER_EXPRESSIONS_CACHE_SIZE = 1024
 
 
 class TestRunMeta:
@@ -48,41 +53,22 @@ class TestRunMeta:
         return hash(str(self))
 
     def filter_q(self, negation=False, expr_type=None):
+        """
+        Build the condition of the meta by EXISTS subqueries correlated with
+        the filtered objects: test iterations for the test arguments expressions
+        and test iteration results for the others.
+        """
         if expr_type is None:
             expr_type = 'tag'
 
-        def filter_value(val, op, negation):
+        def filter_value(items, value_field, val, op, negation):
             op_correspondings = {
-                '=': {
-                    'negation': '!=',
-                    'meta_query': lambda val: Q(meta_results__meta__value=val),
-                    'test_arg_query': lambda val: Q(test_arguments__value=val),
-                },
-                '!=': {
-                    'negation': '=',
-                    'meta_query': lambda val: ~Q(meta_results__meta__value=val),
-                    'test_arg_query': lambda val: ~Q(test_arguments__value=val),
-                },
-                '<': {
-                    'negation': '>=',
-                    'meta_query': lambda val: Q(meta_results__meta__value__lt=val),
-                    'test_arg_query': lambda val: Q(test_arguments__value__lt=val),
-                },
-                '<=': {
-                    'negation': '>',
-                    'meta_query': lambda val: Q(meta_results__meta__value__lte=val),
-                    'test_arg_query': lambda val: Q(test_arguments__value__lte=val),
-                },
-                '>': {
-                    'negation': '<=',
-                    'meta_query': lambda val: Q(meta_results__meta__value__gt=val),
-                    'test_arg_query': lambda val: Q(test_arguments__value__gt=val),
-                },
-                '>=': {
-                    'negation': '<',
-                    'meta_query': lambda val: Q(meta_results__meta__value__gte=val),
-                    'test_arg_query': lambda val: Q(test_arguments__value__gte=val),
-                },
+                '=': {'negation': '!=', 'lookup': 'exact'},
+                '!=': {'negation': '=', 'lookup': None},
+                '<': {'negation': '>=', 'lookup': 'lt'},
+                '<=': {'negation': '>', 'lookup': 'lte'},
+                '>': {'negation': '<=', 'lookup': 'gt'},
+                '>=': {'negation': '<', 'lookup': 'gte'},
             }
 
             if negation:
@@ -92,29 +78,31 @@ class TestRunMeta:
                 msg = f"Unknown relation value: '{op}'. Expected: = / != / < / <= / > / >="
                 raise ValueError(msg)
 
-            if expr_type == 'test_argument':
-                return op_correspondings[op]['test_arg_query'](val)
-            return op_correspondings[op]['meta_query'](val)
+            if op == '!=':
+                return Q(Exists(items)) & ~Q(Exists(items.filter(**{value_field: val})))
+            lookup = op_correspondings[op]['lookup']
+            return Q(Exists(items.filter(**{f'{value_field}__{lookup}': val})))
 
         # Create a query corresponding to the expression type and TestRunMeta object
         if expr_type == 'test_argument':
-            query = Q(test_arguments__name=self.name)
-            query &= filter_value(self.value, self.relation, negation)
-        elif expr_type == 'verdict' and self.value == 'None':
+            items = TestIteration.test_arguments.through.objects.filter(
+                testiteration=OuterRef('pk'),
+                testargument__name=self.name,
+            )
+            return filter_value(
+                items, 'testargument__value', self.value, self.relation, negation
+            )
+
+        items = MetaResult.objects.filter(result=OuterRef('pk'), meta__type=expr_type)
+        if expr_type == 'verdict' and self.value == 'None':
             # If the verdict expression is None, return objects without verdicts
-            query = ~Q(meta_results__meta__type=expr_type)
-        else:
-            query = Q(meta_results__meta__type=expr_type)
-            if self.name:
-                query &= Q(
-                    meta_results__meta__name=self.name,
-                )
-            if self.value:
-                query &= filter_value(self.value, self.relation, negation)
-            elif negation:
-                query = ~Q(query)
+            return Q(Exists(items)) if negation else ~Q(Exists(items))
 
-        return query
+        if self.name:
+            items = items.filter(meta__name=self.name)
+        if self.value:
+            return filter_value(items, 'meta__value', self.value, self.relation, negation)
+        return ~Q(Exists(items)) if negation else Q(Exists(items))
 
 
 class TestRunMetasGroup:
@@ -172,110 +160,173 @@ class TestRunMetasGroup:
             raise ValueError(msg)
         return meta
 
-    def expr_str_to_dnf(self, expr_str, expr_type):
-        def create_meta(s, loc, toks):
-            if isinstance(toks[0], str):
-                if expr_type == 'verdict':
-                    meta = TestRunMeta(None, toks[0], '=')
-                else:
-                    meta = TestRunMeta(toks[0])
-            else:
-                meta = TestRunMeta(toks[0][0], toks[0][2], toks[0][1])
-
-            for smeta in self.metas:
-                if str(smeta) == str(meta):
-                    return Symbol(smeta.alias)
-
-            meta.alias = 'talias' + str(len(self.metas))
-            self.metas_append(meta)
-            return Symbol(meta.alias)
+    def get_meta(self, meta_key):
+        """
+        Return the group meta with the passed (name, value, relation) key,
+        add it to the group if there is no such meta yet.
+        """
+        meta = TestRunMeta(*meta_key)
+        for smeta in self.metas:
+            if str(smeta) == str(meta):
+                return smeta
+
+        meta.alias = 'talias' + str(len(self.metas))
+        self.metas_append(meta)
+        return meta
 
+    def expr_str_to_dnf(self, expr_str, expr_type):
+        """
+        Convert the expression into DNF: a tuple of conjunctions of
+        (meta, negation) pairs.
+        """
         if not expr_str:
             return None
 
-        if expr_type == 'verdict':
-            no_verdict = pp.Word('None')
-            verdict = pp.Regex(r'[^"]*')
-            verdict_string = pp.Suppress('"') + verdict + pp.Suppress('"')
-            condition = no_verdict | verdict_string
-        else:
-            operator = pp.Regex('>=|<=|!=|>|<|=').setName('operator')
-            operator_eq_ne = pp.Regex('=|!=').setName('operator')
-
-            identifier_rev = pp.Combine(pp.Word(pp.alphanums.upper()) + pp.Literal('_REV'))
-            identifier_branch = pp.Combine(
-                pp.Word(pp.alphanums.upper()) + pp.Literal('_BRANCH'),
+        return tuple(
+            tuple((self.get_meta(meta_key), negation) for meta_key, negation in conjunction)
+            for conjunction in compile_expression(
+                normalize_expression(expr_str, expr_type), expr_type
             )
+        )
 
-            string = pp.Word(pp.alphanums + '._-/%+:')
-            string_with_sign = pp.Combine(pp.Literal('!') + string)
-            number = pp.Regex(r'[+-]?\d+(:?\.\d*)?(:?[eE][+-]?\d+)?')
-            revision = pp.Combine(pp.Word(pp.hexnums) + pp.Optional(pp.Literal('+')))
-
-            # NB! The order makes sense: specific groups must go first
-            condition = (
-                pp.Group(identifier_rev + operator_eq_ne + revision)
-                | pp.Group(identifier_branch + operator_eq_ne + string)
-                | pp.Group(string + operator_eq_ne + string)
-                | pp.Group(string + operator_eq_ne + string_with_sign)
-                | pp.Group(string + operator + number)
-                | string
-            )
+    def apply_filters(self, qs, expr_dnf, expr_type):
+        """
+        Filter the QuerySet by the DNF with one WHERE clause, the conjunctions
+        are ORed and the metas conditions of each of them are ANDed.
+        """
+        if expr_dnf is None or () in expr_dnf:
+            return qs
+
+        query = Q(pk__in=[])
+        for conjunction in expr_dnf:
+            conjunction_query = Q()
+            for meta, negation in conjunction:
+                conjunction_query &= meta.filter_q(negation=negation, expr_type=expr_type)
+            query |= conjunction_query
+        return qs.filter(query)
+
+
+@lru_cache(maxsize=None)
+def get_expression_grammar(expr_type):
+    """
+    Build the grammar of the expressions of the passed type, it is done once per process.
+
+    The conditions are parsed into sympy symbols named by the JSON encoded
+    (name, value, relation) keys of the corresponding metas.
+    """
 
-        condition.setParseAction(create_meta)
+    def create_meta_symbol(toks):
+        if isinstance(toks[0], str):
+            meta_key = (None, toks[0], '=') if expr_type == 'verdict' else (toks[0], None, None)
+        else:
+            meta_key = (toks[0][0], toks[0][2], toks[0][1])
+        return Symbol(json.dumps(meta_key))
+
+    if expr_type == 'verdict':
+        no_verdict = pp.Word('None')
+        verdict = pp.Regex(r'[^"]*')
+        verdict_string = pp.Suppress('"') + verdict + pp.Suppress('"')
+        condition = no_verdict | verdict_string
+    else:
+        operator = pp.Regex('>=|<=|!=|>|<|=').setName('operator')
+        operator_eq_ne = pp.Regex('=|!=').setName('operator')
+
+        identifier_rev = pp.Combine(pp.Word(pp.alphanums.upper()) + pp.Literal('_REV'))
+        identifier_branch = pp.Combine(
+            pp.Word(pp.alphanums.upper()) + pp.Literal('_BRANCH'),
+        )
 
-        prec = pp.infixNotation(
-            condition,
-            [
-                ('!', 1, pp.opAssoc.RIGHT, lambda t: Not(t[0][1])),
-                ('&', 2, pp.opAssoc.LEFT, lambda t: And(t[0][0], t[0][2])),
-                ('|', 2, pp.opAssoc.LEFT, lambda t: Or(t[0][0], t[0][2])),
-            ],
+        string = pp.Word(pp.alphanums + '._-/%+:')
+        string_with_sign = pp.Combine(pp.Literal('!') + string)
+        number = pp.Regex(r'[+-]?\d+(:?\.\d*)?(:?[eE][+-]?\d+)?')
+        revision = pp.Combine(pp.Word(pp.hexnums) + pp.Optional(pp.Literal('+')))
+
+        # NB! The order makes sense: specific groups must go first
+        condition = (
+            pp.Group(identifier_rev + operator_eq_ne + revision)
+            | pp.Group(identifier_branch + operator_eq_ne + string)
+            | pp.Group(string + operator_eq_ne + string)
+            | pp.Group(string + operator_eq_ne + string_with_sign)
+            | pp.Group(string + operator + number)
+            | string
         )
 
-        try:
-            sympy_expr = prec.parseString(expr_str, parseAll=True)[0]
-        except pp.ParseException as pe:
-            if expr_type == 'verdict':
-                expected = 'None | "Verdict"'
-            elif expr_type == 'test_argument':
-                expected = 'argument1 != 5 & argument2 >= 10'
-            else:
-                expected = 'meta_name1 & meta_name2=32'
-            msg = (
-                f"Faied to parse expression string '{expr_str}'. Expected example: {expected}",
-            )
-            raise pp.ParseException(msg) from pe
+    condition.setParseAction(create_meta_symbol)
 
-        return to_dnf(sympy_expr, simplify=True)
+    return pp.infixNotation(
+        condition,
+        [
+            ('!', 1, pp.opAssoc.RIGHT, lambda t: Not(t[0][1])),
+            ('&', 2, pp.opAssoc.LEFT, lambda t: And(t[0][0], t[0][2])),
+            ('|', 2, pp.opAssoc.LEFT, lambda t: Or(t[0][0], t[0][2])),
+        ],
+    )
+
+
+def normalize_expression(expr_str, expr_type):
+    """
+    Drop the insignificant whitespaces of the expression, spaces inside
+    the quoted verdicts are kept as is.
+    """
+    if expr_type == 'verdict':
+        return expr_str.strip()
+    return re.sub(r'\s*([&|!()<>=])\s*', r'\1', ' '.join(expr_str.split()))
 
-    def apply_filters(self, qs, expr_dnf, expr_type):
-        def filter_meta(qs, var):
 
-            if isinstance(var, Symbol):
-                meta = self.get_meta_by_alias(str(var))
-                return qs.filter(meta.filter_q(expr_type=expr_type))
+def get_dnf_conjunctions(expr):
+    """
+    Return the conjunctions of ((name, value, relation), negation) literals
+    of the sympy expression if it is already in DNF, None otherwise.
+    """
 
-            if isinstance(var, Not):
-                meta = self.get_meta_by_alias(str(var.args[0]))
-                return qs.filter(meta.filter_q(negation=True, expr_type=expr_type))
+    def get_literal(expr):
+        negation = isinstance(expr, Not)
+        if negation:
+            expr = expr.args[0]
+        if not isinstance(expr, Symbol):
+            return None
+        return tuple(json.loads(expr.name)), negation
+
+    def get_conjunction(expr):
+        literals = tuple(
+            get_literal(item) for item in (expr.args if isinstance(expr, And) else (expr,))
+        )
+        return None if None in literals else literals
 
-            if isinstance(var, And):
-                for item in var.args:
-                    qs = filter_meta(qs, item)
-                return qs
+    if expr is true:
+        return ((),)
+    if expr is false:
+        return ()
 
-            if isinstance(var, Or):
-                qs_list = [filter_meta(deepcopy(qs), item) for item in var.args]
-                all_ids = set()
-                for qsi in qs_list:
-                    all_ids.update(qsi.values_list('id', flat=True))
-                return TestIterationResult.objects.filter(id__in=list(all_ids))
+    conjunctions = tuple(
+        get_conjunction(item) for item in (expr.args if isinstance(expr, Or) else (expr,))
+    )
+    return None if None in conjunctions else conjunctions
 
-            msg = f'Unknown variable type {type(var)}: {var!r}'
-            raise TypeError(msg)
 
-        return filter_meta(qs, expr_dnf)
+@lru_cache(maxsize=FILTER_EXPRESSIONS_CACHE_SIZE)
+def compile_expression(expr_str, expr_type):
+    """
+    Parse the normalized expression and convert it into DNF. The conjunctions
+    and disjunctions of conditions are taken as is, the other expressions
+    are simplified by sympy.
+    """
+    try:
+        sympy_expr = get_expression_grammar(expr_type).parseString(expr_str, parseAll=True)[0]
+    except pp.ParseException as pe:
+        if expr_type == 'verdict':
+            expected = 'None | "Verdict"'
+        elif expr_type == 'test_argument':
+            expected = 'argument1 != 5 & argument2 >= 10'
+        else:
+            expected = 'meta_name1 & meta_name2=32'
+        msg = (f"Faied to parse expression string '{expr_str}'. Expected example: {expected}",)
+        raise pp.ParseException(msg) from pe
+
+    conjunctions = get_dnf_conjunctions(sympy_expr)
+    if conjunctions is None:
+        conjunctions = get_dnf_conjunctions(to_dnf(sympy_expr, simplify=True))
+    return conjunctions
 
 
 def filter_by_expression(filtered_qs, expr_str, expr_type=None):
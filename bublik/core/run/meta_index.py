@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import IntegerField, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from bublik.data.models import MetaResult, RunMetaIndex
+
+
+def get_run_metas_ids(run_id):
+    return sorted(
+        MetaResult.objects.filter(result_id=run_id)
+        .values_list('meta_id', flat=True)
+        .distinct(),
+    )
+
+
+def update_run_meta_index(run_id):
+    """
+    Rebuild the index of the run metas, create it if the run has no index yet.
+    """
+    RunMetaIndex.objects.update_or_create(
+        run_id=run_id,
+        defaults={'metas': get_run_metas_ids(run_id)},
+    )
+
+
+def refresh_run_meta_index(result_id):
+    """
+    Rebuild the index of the run metas by one query if the result is a run
+    having the index. Nothing is created, so it's safe to call while the run
+    is being deleted.
+    """
+    metas_ids = (
+        MetaResult.objects.filter(result_id=result_id)
+        .values('result_id')
+        .annotate(metas_ids=ArrayAgg('meta_id', distinct=True))
+        .values('metas_ids')
+    )
+    RunMetaIndex.objects.filter(run_id=result_id).update(
+        metas=Coalesce(
+            Subquery(metas_ids),
+            Value([], output_field=ArrayField(IntegerField())),
+        ),
+    )
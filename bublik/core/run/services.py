@@ -295,7 +295,7 @@ class RunService:
 
         return RunListResult(
             pagination=RunListPagination(**paginated_runs['pagination']),
-            results=generate_runs_details(paginated_runs['results']),
+            results=generate_runs_details(list(paginated_runs['results'])),
         )
 
     @staticmethod
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+import hashlib
 import json
 import re
 
@@ -8,7 +9,7 @@ from django.conf import settings
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
-from django.db.models import Exists, F, OuterRef, Q, Value
+from django.db.models import Exists, F, OuterRef, Subquery, Value
 from django.db.models.functions import Concat
 
 from bublik.core.cache import RunCache
@@ -17,15 +18,13 @@ from bublik.core.datetime_formatting import (
     period_to_str,
 )
 from bublik.core.logging import get_task_or_server_logger
-from bublik.core.measurement.services import exist_measurement_results
 from bublik.core.meta.categorization import get_metas_by_category
 from bublik.core.meta.match_references import build_revision_references
-from bublik.core.queries import MetaResultsQuery, get_or_none
-from bublik.core.run.compromised import get_compromised_details, is_run_compromised
+from bublik.core.queries import MetaResultsQuery
+from bublik.core.run.compromised import get_compromised_details
 from bublik.core.run.data import (
     get_metadata_by_runs,
     get_tags_by_runs,
-    is_result_unexpected,
 )
 from bublik.core.run.dto import (
     RunCompromisedDetails,
@@ -39,15 +38,18 @@ from bublik.core.run.dto import (
     RunSummaryStats,
 )
 from bublik.core.run.filter_expression import filter_by_expression
+from bublik.core.run.summary import get_run_summary, get_runs_summaries
 from bublik.core.utils import key_value_dict_transforming, key_value_list_transforming
 from bublik.data.models import (
+    Expectation,
+    ExpectMeta,
     GlobalConfigs,
+    MeasurementResult,
     Meta,
     MetaResult,
     MetaTest,
+    ResultStatus,
     ResultType,
-    RunConclusion,
-    RunStatusByUnexpected,
     TestIterationResult,
 )
 
@@ -55,161 +57,188 @@ from bublik.data.models import (
 logger = get_task_or_server_logger()
 
 
-def get_children(parent, test_results=TestIterationResult.objects, q=None):
-    query = Q(parent_package=parent)
-    if q:
-        query &= q
-    return test_results.filter(query).order_by('start')
-
-
-def passed(results):
-    return results.filter(meta_results__meta=Meta.passed)
-
-
-def failed(results):
-    return results.filter(meta_results__meta=Meta.failed)
-
+RESULT_STATS_KEYS = (
+    'passed',
+    'failed',
+    'passed_unexpected',
+    'failed_unexpected',
+    'skipped',
+    'skipped_unexpected',
+    'abnormal',
+)
 
-def skipped(results):
-    return results.filter(meta_results__meta=Meta.skipped)
 
+def get_run_results_rows(run_id, available_req_metas=()):
+    """
+    Load the whole result tree of the run by one query. Each row keeps only
+    the fields required to build run statistics: the position of the result
+    in the tree, its test, the obtained result, whether it is unexpected and
+    whether it satisfies all of the passed requirements.
+    """
+    annotations = {
+        'obtained_result': Subquery(
+            MetaResult.objects.filter(result=OuterRef('id'), meta__type='result').values(
+                'meta__value',
+            )[:1],
+        ),
+        'has_error': Exists(
+            MetaResult.objects.filter(result=OuterRef('id'), meta__type='err'),
+        ),
+    }
+    req_annotations = []
+    for idx, req_meta in enumerate(available_req_metas):
+        req_annotation = f'req_{idx}'
+        annotations[req_annotation] = Exists(
+            MetaResult.objects.filter(result=OuterRef('id'), meta=req_meta),
+        )
+        req_annotations.append(req_annotation)
+
+    rows = (
+        TestIterationResult.objects.filter(test_run=run_id)
+        .annotate(**annotations)
+        .order_by('start', 'id')
+        .values(
+            'id',
+            'parent_package_id',
+            'iteration_id',
+            'exec_seqno',
+            'start',
+            'finish',
+            'obtained_result',
+            'has_error',
+            *req_annotations,
+            test_id=F('iteration__test__id'),
+            test_name=F('iteration__test__name'),
+            test_type=F('iteration__test__result_type'),
+        )
+    )
 
-def abnormal(results):
-    return results.filter(meta_results__meta__in=Meta.abnormal)
+    for row in rows:
+        row['meets_reqs'] = all(row.pop(req_annotation) for req_annotation in req_annotations)
+        yield row
 
 
-def generate_result(
-    test_iter_res,
-    parent,
-    period,
-    path,
-    info,
-    objectives,
-    run_results,
-    available_req_metas,
-):
-    test = test_iter_res.iteration.test
-    test_name = test.name
-    path = [*path, test_name]
-    parent_id = test_iter_res.parent_package.id if test_iter_res.parent_package else None
-
-    test_iter_res_info = {
-        'result_id': test_iter_res.id,
-        'exec_seqno': test_iter_res.exec_seqno,
-        'parent_id': parent_id,
-        'type': test.get_result_type_display(),
-        'test_id': test.id,
-        'test_name': test_name,
-        'period': period_to_str(period),
-        'path': path,
-        'objective': objectives.get(test_iter_res.id, ''),
-        'children': [],
-        'stats': {
-            'passed': 0,
-            'failed': 0,
-            'passed_unexpected': 0,
-            'failed_unexpected': 0,
-            'skipped': 0,
-            'skipped_unexpected': 0,
-            'abnormal': 0,
-        },
-    }
+class RunStatsBuilder:
+    """
+    Build detailed run statistics from the rows loaded by get_run_results_rows().
 
-    if ResultType.inv(test_iter_res.iteration.test.result_type) == ResultType.TEST:
-        finish_filter = {}
-        if period[1] is not None:
-            finish_filter['finish__lte'] = period[1]
+    All counters are calculated in memory and rolled up from tests to the main
+    package, so the number of queries doesn't depend on the run size.
+    Consecutive iterations of the same test in a package are merged into one
+    node, the node is dropped if no results are left after filtering.
+    """
 
-        test_iterations = run_results.filter(
-            iteration__test__name=test_iter_res.iteration.test.name,
-            parent_package=parent,
-            start__gte=period[0],
-            **finish_filter,
+    def __init__(self, rows, objectives):
+        self.objectives = objectives
+        self.children = defaultdict(list)
+        self.same_name_results = defaultdict(list)
+        for row in rows:
+            parent_id = row['parent_package_id']
+            self.children[parent_id].append(row)
+            self.same_name_results[(parent_id, row['test_name'])].append(row)
+
+    @property
+    def main_package(self):
+        main_packages = self.children.get(None)
+        return main_packages[0] if main_packages else None
+
+    def build(self):
+        main_package = self.main_package
+        if not main_package:
+            return None
+        return self.build_node(
+            main_package,
+            None,
+            (main_package['start'], main_package['finish']),
+            [],
         )
 
-        # filter tests by requirements
-        for req_meta in available_req_metas:
-            test_iterations = test_iterations.filter(meta_results__meta=req_meta)
-
-        if not test_iterations:
-            test_iter_res_info = None
-        else:
-            all_passed = passed(test_iterations).count()
-            all_failed = failed(test_iterations).count()
-            all_skipped = skipped(test_iterations).count()
-            all_abnormal = abnormal(test_iterations).count()
-
-            unexpected = test_iterations.filter(meta_results__meta__type='err')
+    def build_node(self, row, parent_id, period, path):
+        path = [*path, row['test_name']]
+        node = {
+            'result_id': row['id'],
+            'exec_seqno': row['exec_seqno'],
+            'parent_id': parent_id,
+            'type': ResultType.inv(row['test_type']),
+            'test_id': row['test_id'],
+            'test_name': row['test_name'],
+            'period': period_to_str(period),
+            'path': path,
+            'objective': self.objectives.get(row['id'], ''),
+            'children': [],
+            'stats': dict.fromkeys(RESULT_STATS_KEYS, 0),
+        }
 
-            passed_unexpected = passed(unexpected).distinct().count()
-            failed_unexpected = failed(unexpected).distinct().count()
-            skipped_unexpected = skipped(unexpected).distinct().count()
+        if ResultType.inv(row['test_type']) == ResultType.TEST:
+            test_iterations = self.test_iterations(parent_id, row['test_name'], period)
+            if not test_iterations:
+                return None
+            node['stats'] = self.count_stats(test_iterations)
+            return node
 
-            test_iter_res_info['stats']['passed'] = all_passed - passed_unexpected
-            test_iter_res_info['stats']['failed'] = all_failed - failed_unexpected
-            test_iter_res_info['stats']['passed_unexpected'] = passed_unexpected
-            test_iter_res_info['stats']['failed_unexpected'] = failed_unexpected
-            test_iter_res_info['stats']['skipped'] = all_skipped - skipped_unexpected
-            test_iter_res_info['stats']['skipped_unexpected'] = skipped_unexpected
-            test_iter_res_info['stats']['abnormal'] = all_abnormal
+        for child, child_period in self.group_children(row['id']):
+            child_node = self.build_node(child, row['id'], child_period, path)
+            if child_node:
+                node['children'].append(child_node)
+                for result in node['stats']:
+                    node['stats'][result] += child_node['stats'][result]
 
-    else:
-        children = run_results.filter(parent_package=test_iter_res)
+        if sum(node['stats'].values()) == 0:
+            return None
+        return node
 
+    def group_children(self, parent_id):
+        """
+        Yield the first child of each group of consecutive iterations of
+        the same test along with the period covered by the group.
+        """
         prev_child = None
-        for child in children:
+        for child in self.children.get(parent_id, []):
+            if (
+                prev_child
+                and prev_child['row']['test_name'] == child['test_name']
+                and child['test_type'] == ResultType.conv(ResultType.TEST)
+            ):
+                prev_child['finish'] = child['finish']
+                continue
+
             if prev_child:
-                prev_child_name = prev_child['test_iter_obj'].iteration.test.name
-                child_name = child.iteration.test.name
-                child_result_type = child.iteration.test.result_type
-                if prev_child_name == child_name and child_result_type == ResultType.conv(
-                    ResultType.TEST,
-                ):
-                    prev_child['finish'] = child.finish
-                    continue
-
-                generate_result(
-                    prev_child['test_iter_obj'],
-                    test_iter_res,
-                    (prev_child['start'], prev_child['finish']),
-                    path,
-                    prev_child['info'],
-                    objectives,
-                    run_results,
-                    available_req_metas,
-                )
+                yield prev_child['row'], (prev_child['start'], prev_child['finish'])
 
             prev_child = {
-                'test_iter_obj': child,
-                'info': test_iter_res_info,
-                'start': child.start,
-                'finish': child.finish,
+                'row': child,
+                'start': child['start'],
+                'finish': child['finish'],
             }
 
         if prev_child:
-            generate_result(
-                prev_child['test_iter_obj'],
-                test_iter_res,
-                (prev_child['start'], prev_child['finish']),
-                path,
-                prev_child['info'],
-                objectives,
-                run_results,
-                available_req_metas,
-            )
-
-        if sum(test_iter_res_info['stats'].values()) == 0:
-            test_iter_res_info = None
-
-    if info:
-        if test_iter_res_info:
-            info['children'].append(test_iter_res_info)
-            for result in info['stats']:
-                info['stats'][result] += test_iter_res_info['stats'][result]
-    else:
-        info = test_iter_res_info
+            yield prev_child['row'], (prev_child['start'], prev_child['finish'])
+
+    def test_iterations(self, parent_id, test_name, period):
+        start, finish = period
+        return [
+            row
+            for row in self.same_name_results.get((parent_id, test_name), [])
+            if row['meets_reqs']
+            and row['start'] >= start
+            and (finish is None or (row['finish'] is not None and row['finish'] <= finish))
+        ]
 
-    return info
+    @staticmethod
+    def count_stats(test_iterations):
+        abnormal_statuses = ResultStatus.RESULT_STATUSES_BY_GROUPS['abnormal']
+        stats = dict.fromkeys(RESULT_STATS_KEYS, 0)
+        for row in test_iterations:
+            obtained_result = row['obtained_result']
+            if obtained_result in abnormal_statuses:
+                stats['abnormal'] += 1
+                continue
+            for group in ('passed', 'failed', 'skipped'):
+                if obtained_result in ResultStatus.RESULT_STATUSES_BY_GROUPS[group]:
+                    key = f'{group}_unexpected' if row['has_error'] else group
+                    stats[key] += 1
+                    break
+        return stats
 
 
 def get_run_stats_detailed_with_comments(run_id, requirements):
@@ -261,61 +290,44 @@ def add_comments(node, tests_comments):
             add_comments(child, tests_comments)
 
 
-def get_run_stats_detailed(run_id, requirements=None):
-    requirements = requirements or {}
-    if requirements:
-        requirements = set(requirements.split(settings.QUERY_DELIMITER))
-        stats_cache = RunCache.by_id(run_id, 'stats_reqs')
-        run_stats = stats_cache.data.get('stats') if stats_cache.data else None
-        requirements_cached = stats_cache.data.get('reqs') if stats_cache.data else None
-    else:
-        stats_cache = RunCache.by_id(run_id, 'stats')
-        run_stats = stats_cache.data
-    # Recalculate statistics if they are not cached or do not match the given requirements
-    if not run_stats or (requirements and requirements != requirements_cached):
-        run_results = (
-            TestIterationResult.objects.filter(test_run=run_id)
-            .order_by('start')
-            .select_related('iteration__test')
-        )
-        main_package = run_results.filter(parent_package__isnull=True).first()
-        if not main_package:
+def build_run_stats_detailed(run_id, requirements=()):
+    # get metadata matching passed requirements for further test filtering
+    available_req_metas = []
+    for requirement in requirements:
+        try:
+            available_req_metas.append(
+                Meta.objects.get(type='requirement', value=requirement),
+            )
+        except ObjectDoesNotExist:
             return None
 
-        # get objectives for all run iterations at once
-        objectives = dict(
-            Meta.objects.filter(
-                metaresult__result__test_run=run_id,
-                type='objective',
-            ).values_list('metaresult__result__id', 'value'),
-        )
+    # get objectives for all run iterations at once
+    objectives = dict(
+        Meta.objects.filter(
+            metaresult__result__test_run=run_id,
+            type='objective',
+        ).values_list('metaresult__result__id', 'value'),
+    )
 
-        # get metadata matching passed requirements for further test filtering
-        available_req_metas = []
-        for requirement in requirements:
-            try:
-                available_req_metas.append(
-                    Meta.objects.get(type='requirement', value=requirement),
-                )
-            except ObjectDoesNotExist:
-                return None
+    stats_builder = RunStatsBuilder(
+        get_run_results_rows(run_id, available_req_metas),
+        objectives,
+    )
+    if not stats_builder.main_package:
+        return None
+    return stats_builder.build()
 
-        run_stats = generate_result(
-            test_iter_res=main_package,
-            parent=None,
-            period=(main_package.start, main_package.finish),
-            path=[],
-            info=None,
-            objectives=objectives,
-            run_results=run_results,
-            available_req_metas=available_req_metas,
-        )
 
-        stats_cache.data = (
-            run_stats if not requirements else {'reqs': requirements, 'stats': run_stats}
-        )
+def get_run_stats_detailed(run_id, requirements=None):
+    if not requirements:
+        stats_cache = RunCache.by_id(run_id, 'stats')
+        return stats_cache.get_or_set(lambda: build_run_stats_detailed(run_id))
 
-    return run_stats
+    requirements = set(requirements.split(settings.QUERY_DELIMITER))
+    # The statistics by every set of requirements are cached by a separate entry
+    requirements_hash = hashlib.md5(repr(sorted(requirements)).encode()).hexdigest()
+    stats_cache = RunCache.by_id(run_id, 'stats_reqs', variant=requirements_hash)
+    return stats_cache.get_or_set(lambda: build_run_stats_detailed(run_id, requirements))
 
 
 def get_tests_comments(run_id):
@@ -409,52 +421,17 @@ def get_test_runs(
 
 
 def get_run_stats(run_id):
-    cache = RunCache.by_id(run_id, 'stats_sum')
-    stats = cache.data
-    if not stats:
-        stats = {}
-        run_results = TestIterationResult.objects.filter(
-            test_run=run_id,
-            iteration__hash__isnull=False,
-        )
-        stats['total'] = run_results.count()
-        stats['unexpected'] = run_results.filter(meta_results__meta__type='err').count()
-
-        plan_meta_result = get_or_none(
-            MetaResult.objects,
-            result__id=run_id,
-            meta__name='expected_items',
-            meta__type='count',
-        )
-        if plan_meta_result is not None:
-            plan_tests_num = int(plan_meta_result.meta.value)
-            stats['total_expected'] = plan_tests_num
-
-            prologues_not_passed_tests_nums = Meta.objects.filter(
-                metaresult__result__test_run=run_id,
-                name='expected_items_prologue',
-            ).values_list('value', flat=True)
-            prologues_not_passed_sum = sum([int(i) for i in prologues_not_passed_tests_nums])
-            actual_tests_num = run_results.count() + prologues_not_passed_sum
-            stats['progress'] = actual_tests_num / plan_tests_num
-
-        cache.data = stats
-    return stats
-
+    return get_run_summary(run_id).stats
 
-def get_run_stats_summary(run_id):
-    results = get_run_stats(run_id)
 
-    if not results:
-        return None
-
-    tests_total = results['total']
-    tests_total_nok = results['unexpected']
+def get_run_stats_summary(stats):
+    tests_total = stats['total']
+    tests_total_nok = stats['unexpected']
     tests_total_ok = tests_total - tests_total_nok
 
     try:
-        tests_total_plan_percent = round(results['progress'] * 100)
-    except KeyError:
+        tests_total_plan_percent = round(stats['progress'] * 100)
+    except (KeyError, TypeError):
         tests_total_plan_percent = None
 
     if tests_total != 0:
@@ -481,86 +458,158 @@ def get_run_stats_summary(run_id):
     )
 
 
-def get_expected_results(result):
-    expected_results = []
-    for expectation in result.expectations.all():
-        meta_expect = expectation.expectmeta_set.all()
-        expected_result = {
-            'result_type': None,
-            'verdicts': [],
-            'keys': [],
-        }
+def get_expected_result_keys(key_string, project_id):
+    """
+    Split the expectation key string into parts, the references to issues
+    are converted into links if the project has the issues trackers configured.
+    """
+    keys = []
+    for ref in re.findall(r'ref://[^, ]+', key_string):
+        # Add the information that is before the first ref
+        key_info_part = key_string.partition(ref)[0]
+        if key_info_part:
+            key_part = {'name': key_info_part, 'url': None}
+            keys.append(key_part)
+
+        # Parse the ref
+        ref_type, ref_tail = re.search(r'ref://(.*)/(.*)', ref).group(1, 2)
+
+        # Forming the ref name
+        ref_name = f'{ref_type}:{ref_tail}'
+        key_part = {'name': ref_name, 'url': None}
+
+        # Form the link address, if possible
+        logs = ConfigServices.getattr_from_global(
+            GlobalConfigs.REFERENCES.name,
+            'ISSUES',
+            project_id,
+        )
+        if ref_type in logs and ref_tail:
+            ref_uri = logs[ref_type]['uri']
+            ref_url = f'{ref_uri}{ref_tail}'
+            key_part['url'] = ref_url
 
-        meta_expect_results = meta_expect.filter(meta__type='result')
-        if not meta_expect_results.exists():
-            continue
-        expected_result['result_type'] = meta_expect_results.first().meta.value
-
-        meta_expect_results = meta_expect.filter(meta__type='verdict_expected')
-        if meta_expect_results.exists():
-            expected_result['verdicts'] = list(
-                meta_expect_results.all()
-                .order_by('serial')
-                .values_list('meta__value', flat=True),
-            )
+        keys.append(key_part)
 
-        meta_expect_results = meta_expect.filter(meta__type='key')
-        if meta_expect_results.exists():
-            key_string = meta_expect_results.first().meta.name
-
-            for ref in re.findall(r'ref://[^, ]+', key_string):
-                # Add the information that is before the first ref
-                key_info_part = key_string.partition(ref)[0]
-                if key_info_part:
-                    key_part = {'name': key_info_part, 'url': None}
-                    expected_result['keys'].append(key_part)
-
-                # Parse the ref
-                ref_type, ref_tail = re.search(r'ref://(.*)/(.*)', ref).group(1, 2)
-
-                # Forming the ref name
-                ref_name = f'{ref_type}:{ref_tail}'
-                key_part = {'name': ref_name, 'url': None}
-
-                # Form the link address, if possible
-                logs = ConfigServices.getattr_from_global(
-                    GlobalConfigs.REFERENCES.name,
-                    'ISSUES',
-                    result.project.id,
-                )
-                if ref_type in logs and ref_tail:
-                    ref_uri = logs[ref_type]['uri']
-                    ref_url = f'{ref_uri}{ref_tail}'
-                    key_part['url'] = ref_url
-
-                expected_result['keys'].append(key_part)
-
-                # Trim the key string by the current ref
-                key_string = key_string.partition(ref)[2]
-
-            # Add what is left in the key string
-            if key_string:
-                key_part = {'name': key_string, 'url': None}
-                expected_result['keys'].append(key_part)
-
-        expected_results.append(expected_result)
-    return expected_results
+        # Trim the key string by the current ref
+        key_string = key_string.partition(ref)[2]
 
+    # Add what is left in the key string
+    if key_string:
+        key_part = {'name': key_string, 'url': None}
+        keys.append(key_part)
 
-def get_nok_results_distribution(run):
-    unexpected_result = MetaResult.objects.filter(result__id=OuterRef('id'), meta__type='err')
-    return (
-        TestIterationResult.objects.filter(
-            test_run=run,
-            iteration__test__result_type=ResultType.conv('test'),
+    return keys
+
+
+def get_results_expected_results(results):
+    """
+    Collect the expected results of the passed test results by a constant
+    number of queries, return them by the test results IDs.
+    """
+    projects_by_results = {result.id: result.project_id for result in results}
+
+    expectations_by_results = defaultdict(list)
+    for result_id, expectation_id in (
+        Expectation.results.through.objects.filter(
+            testiterationresult_id__in=projects_by_results,
         )
-        .annotate(is_nok=Exists(unexpected_result))
-        .values_list('is_nok', flat=True)
         .order_by('id')
+        .values_list('testiterationresult_id', 'expectation_id')
+    ):
+        expectations_by_results[result_id].append(expectation_id)
+
+    expect_metas = defaultdict(list)
+    for expectation_id, meta_type, meta_name, meta_value, serial in (
+        ExpectMeta.objects.filter(
+            expectation_id__in={
+                expectation_id
+                for expectations_ids in expectations_by_results.values()
+                for expectation_id in expectations_ids
+            },
+        )
+        .order_by('id')
+        .values_list('expectation_id', 'meta__type', 'meta__name', 'meta__value', 'serial')
+    ):
+        expect_metas[expectation_id].append((meta_type, meta_name, meta_value, serial))
+
+    def get_expected_result(expectation_id, project_id):
+        metas = expect_metas[expectation_id]
+        result_types = [value for meta_type, _, value, _ in metas if meta_type == 'result']
+        if not result_types:
+            return None
+
+        verdicts = sorted(
+            (meta for meta in metas if meta[0] == 'verdict_expected'),
+            key=lambda meta: meta[3],
+        )
+        key_strings = [name for meta_type, name, _, _ in metas if meta_type == 'key']
+        return {
+            'result_type': result_types[0],
+            'verdicts': [value for _, _, value, _ in verdicts],
+            'keys': (
+                get_expected_result_keys(key_strings[0], project_id) if key_strings else []
+            ),
+        }
+
+    # Many results share the same expectations
+    expected_results_data = {}
+    expected_results = {}
+    for result_id, project_id in projects_by_results.items():
+        expected_results[result_id] = []
+        for expectation_id in expectations_by_results[result_id]:
+            data_key = (expectation_id, project_id)
+            if data_key not in expected_results_data:
+                expected_results_data[data_key] = get_expected_result(*data_key)
+            if expected_results_data[data_key] is not None:
+                expected_results[result_id].append(expected_results_data[data_key])
+
+    return expected_results
+
+
+def get_expected_results(result):
+    return get_results_expected_results([result])[result.id]
+
+
+def get_results_details_data(results):
+    """
+    Collect the details of the passed test results which require queries
+    to other tables: the unexpected flags, the measurements existence and
+    the expected results. The number of queries doesn't depend on the number
+    of results.
+    """
+    results_ids = [result.id for result in results]
+    unexpected_results = set(
+        MetaResult.objects.filter(
+            result_id__in=results_ids,
+            meta__type='err',
+        ).values_list('result_id', flat=True),
+    )
+    measured_results = set(
+        MeasurementResult.objects.filter(result_id__in=results_ids)
+        .values_list('result_id', flat=True)
+        .distinct(),
     )
+    expected_results = get_results_expected_results(results)
+
+    return {
+        result_id: {
+            'has_error': result_id in unexpected_results,
+            'has_measurements': result_id in measured_results,
+            'expected_results': expected_results[result_id],
+        }
+        for result_id in results_ids
+    }
+
+
+def get_nok_results_distribution(run):
+    return get_run_summary(run.id).nok_distribution
 
 
 def generate_results_details(test_results):
+    test_results = list(test_results)
+    details_data = get_results_details_data(test_results)
+
     # Gather all results details
     results_details = []
     for test_result in test_results:
@@ -569,8 +618,7 @@ def generate_results_details(test_results):
         iteration_id = iteration.id
         project = test_result.project
 
-        # Handle expected result
-        expected_results_data = get_expected_results(test_result)
+        result_data = details_data[result_id]
 
         # Handle obtained result and comments
         result_type = None
@@ -601,24 +649,24 @@ def generate_results_details(test_results):
         for test_argument in test_result.iteration.test_arguments.all():
             parameters[test_argument.name] = test_argument.value
         parameters = OrderedDict(sorted(parameters.items()))
-        parameters_list = key_value_dict_transforming(parameters)
+        parameters_list = list(key_value_dict_transforming(parameters))
 
         data = {
             'name': iteration.test.name,
             'result_id': result_id,
-            'run_id': test_result.root.id,
+            'run_id': test_result.test_run_id or result_id,
             'project_id': project.id,
             'project_name': project.name,
             'iteration_id': iteration_id,
             'start': test_result.start,
             'obtained_result': obtained_result_data,
-            'expected_results': expected_results_data,
+            'expected_results': result_data['expected_results'],
             'artifacts': artifacts,
             'parameters': parameters_list,
             'comments': comments,
             'requirements': requirements,
-            'has_error': is_result_unexpected(test_result),
-            'has_measurements': exist_measurement_results(test_result),
+            'has_error': result_data['has_error'],
+            'has_measurements': result_data['has_measurements'],
         }
 
         results_details.append(data)
@@ -644,30 +692,13 @@ def get_run_status(run):
 
 
 def get_run_status_by_nok(run):
-    stats = get_run_stats(run.id)
-    project_id = run.project.id
-    return RunStatusByUnexpected.identify(stats, project_id)
-
-
-def get_driver_unload(run):
-    du_meta = MetaResult.objects.filter(result=run, meta__name='driver_unload').first()
-    return du_meta.meta.value if du_meta else None
+    summary = get_run_summary(run.id)
+    return summary.status_by_nok, summary.unexpected_percent
 
 
 def get_run_conclusion(run):
-    project_id = run.project.id
-    status = get_run_status(run)
-    compromised = is_run_compromised(run)
-    status_by_nok, unexpected_percent = get_run_status_by_nok(run)
-    driver_unload = get_driver_unload(run)
-    return RunConclusion.identify(
-        status,
-        status_by_nok,
-        unexpected_percent,
-        compromised,
-        driver_unload,
-        project_id,
-    )
+    summary = get_run_summary(run.id)
+    return summary.conclusion, summary.conclusion_reason
 
 
 def generate_all_run_details(run):
@@ -742,11 +773,12 @@ def generate_all_run_details(run):
 def generate_runs_details(runs):
     important_tags, relevant_tags = get_tags_by_runs(runs)
     metadata_by_runs = get_metadata_by_runs(runs)
+    summaries = get_runs_summaries(runs)
 
     runs_data = []
     for run in runs:
         run_id = run.id
-        conclusion, conclusion_reason = get_run_conclusion(run)
+        summary = summaries[run_id]
         runs_data.append(
             RunSummaryResult(
                 id=run_id,
@@ -755,15 +787,15 @@ def generate_runs_details(runs):
                 start=run.start,
                 finish=run.finish,
                 duration=run.duration,
-                status=get_run_status(run),
-                status_by_nok=get_run_status_by_nok(run)[0],
-                compromised=is_run_compromised(run),
-                conclusion=conclusion,
-                conclusion_reason=conclusion_reason,
+                status=summary.status,
+                status_by_nok=summary.status_by_nok,
+                compromised=summary.compromised,
+                conclusion=summary.conclusion,
+                conclusion_reason=summary.conclusion_reason,
                 metadata=metadata_by_runs.get(run_id, []),
                 important_tags=important_tags.get(run_id, []),
                 relevant_tags=relevant_tags.get(run_id, []),
-                stats=get_run_stats_summary(run_id),
+                stats=get_run_stats_summary(summary.stats),
             ),
         )
 
@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from django.db.models import Exists, OuterRef, Q, Subquery
+
+from bublik.core.config.services import ConfigServices
+from bublik.data.models import (
+    GlobalConfigs,
+    Meta,
+    MetaResult,
+    ResultStatus,
+    ResultType,
+    RunConclusion,
+    RunStatusByUnexpected,
+    RunSummary,
+    TestIterationResult,
+)
+
+
+def get_results_counters(run_id):
+    """
+    Count the test results of the run by the groups of their statuses and
+    collect the unexpected flags of them in the order of execution.
+    """
+    counters = dict.fromkeys(
+        ('total', 'unexpected', *ResultStatus.RESULT_STATUSES_BY_GROUPS),
+        0,
+    )
+    nok_distribution = []
+
+    test_type = ResultType.conv(ResultType.TEST)
+    groups_by_status = {
+        status: group
+        for group, statuses in ResultStatus.RESULT_STATUSES_BY_GROUPS.items()
+        for status in statuses
+    }
+    results = (
+        TestIterationResult.objects.filter(
+            Q(iteration__hash__isnull=False) | Q(iteration__test__result_type=test_type),
+            test_run=run_id,
+        )
+        .annotate(
+            obtained_result=Subquery(
+                MetaResult.objects.filter(result=OuterRef('id'), meta__type='result').values(
+                    'meta__value',
+                )[:1],
+            ),
+            has_error=Exists(
+                MetaResult.objects.filter(result=OuterRef('id'), meta__type='err'),
+            ),
+        )
+        .order_by('id')
+        .values_list(
+            'iteration__hash',
+            'iteration__test__result_type',
+            'obtained_result',
+            'has_error',
+        )
+    )
+
+    for iteration_hash, result_type, obtained_result, has_error in results:
+        if iteration_hash is not None:
+            counters['total'] += 1
+            counters['unexpected'] += has_error
+        if result_type == test_type:
+            nok_distribution.append(has_error)
+            group = groups_by_status.get(obtained_result)
+            if group:
+                counters[group] += 1
+
+    return counters, nok_distribution
+
+
+def get_run_progress(run_id, run_metas, total):
+    """
+    Return the number of tests in the execution plan and the part of
+    them which has been run, both are None if the plan is unknown.
+    """
+    expected_items = run_metas.get(('expected_items', 'count'))
+    if expected_items is None:
+        return None, None
+
+    total_expected = int(expected_items)
+    prologues_not_passed = Meta.objects.filter(
+        metaresult__result__test_run=run_id,
+        name='expected_items_prologue',
+    ).values_list('value', flat=True)
+    actual_tests_num = total + sum(int(value) for value in prologues_not_passed)
+    progress = actual_tests_num / total_expected if total_expected else None
+    return total_expected, progress
+
+
+def compute_run_summary(run):
+    """
+    Calculate the run summary fields by a fixed number of queries.
+    """
+    project_id = run.project_id
+    run_metas = {
+        (name, meta_type): value
+        for name, meta_type, value in MetaResult.objects.filter(result=run).values_list(
+            'meta__name',
+            'meta__type',
+            'meta__value',
+        )
+    }
+    metas_by_name = {name: value for (name, _), value in run_metas.items()}
+
+    counters, nok_distribution = get_results_counters(run.id)
+    total_expected, progress = get_run_progress(run.id, run_metas, counters['total'])
+
+    status_meta_name = ConfigServices.getattr_from_global(
+        GlobalConfigs.PER_CONF.name,
+        'RUN_STATUS_META',
+        project_id,
+    )
+    status = metas_by_name.get(status_meta_name)
+    compromised = 'compromised' in metas_by_name
+    status_by_nok, unexpected_percent = RunStatusByUnexpected.identify(counters, project_id)
+    conclusion, conclusion_reason = RunConclusion.identify(
+        status,
+        status_by_nok,
+        unexpected_percent,
+        compromised,
+        metas_by_name.get('driver_unload'),
+        project_id,
+    )
+
+    return {
+        'project_id': project_id,
+        **counters,
+        'total_expected': total_expected,
+        'progress': progress,
+        'status': status,
+        'status_by_nok': status_by_nok,
+        'unexpected_percent': unexpected_percent,
+        'compromised': compromised,
+        'conclusion': conclusion,
+        'conclusion_reason': conclusion_reason,
+        'nok_distribution': nok_distribution,
+    }
+
+
+def update_run_summary(run):
+    """
+    Recalculate the summary of the run and save it.
+    """
+    summary, _ = RunSummary.objects.update_or_create(
+        run=run,
+        defaults=compute_run_summary(run),
+    )
+    return summary
+
+
+def get_run_summary(run_id):
+    """
+    Return the summary of the run, calculate it if it hasn't been saved yet.
+    """
+    summary = RunSummary.objects.filter(run_id=run_id).first()
+    if summary is None:
+        summary = update_run_summary(TestIterationResult.objects.get(id=run_id))
+    return summary
+
+
+def get_runs_summaries(runs):
+    """
+    Return the summaries of the runs by their IDs loading them by one query,
+    the missing summaries are calculated and saved.
+    """
+    summaries = RunSummary.objects.defer('nok_distribution').in_bulk(
+        [run.id for run in runs],
+    )
+    for run in runs:
+        if run.id not in summaries:
+            summaries[run.id] = update_run_summary(run)
+    return summaries
+
+
+def drop_projects_summaries(project_id=None):
+    """
+    Drop the saved summaries of the project runs or of all runs if project_id
+    is None, they are recalculated on demand.
+    """
+    summaries = RunSummary.objects.all()
+    if project_id is not None:
+        summaries = summaries.filter(project_id=project_id)
+    summaries.delete()
@@ -4,30 +4,82 @@
 from collections import defaultdict, deque
 
 from django.db.models import Exists, F, OuterRef
-from treelib import Tree as TreeLib
 
 from bublik.core.queries import get_or_none
 from bublik.data.models import Meta, MetaResult, ResultType, TestIterationResult
 
 
-class Tree(TreeLib):
-    """The class for tree representation in different formats."""
+class CompactTree:
+    """
+    The tree of run results kept in parallel lists indexed by the node position,
+    the nodes are ordered by their IDs and reference their parents by positions.
+    It's much smaller to cache and faster to export than a tree of node objects.
+    """
 
-    def to_linear_dict(self, with_data=False):
+    def __init__(self, nodes=()):
+        self.ids = []
+        self.parents = []
+        self.starts = []
+        self.names = []
+        self.entities = []
+        self.has_error = []
+        self.skipped = []
+
+        parent_ids = []
+        for node in nodes:
+            self.ids.append(node['id'])
+            parent_ids.append(node['parent_id'])
+            self.starts.append(node['start'])
+            self.names.append(node['name'])
+            self.entities.append(node['entity'])
+            self.has_error.append(node['has_error'])
+            self.skipped.append(node['skipped'])
+
+        positions = {node_id: position for position, node_id in enumerate(self.ids)}
+        self.parents = [positions.get(parent_id, -1) for parent_id in parent_ids]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node_id):
+        return node_id in self.ids
+
+    def node_data(self, position):
+        return {
+            'id': self.ids[position],
+            'start': self.starts[position],
+            'name': self.names[position],
+            'entity': self.entities[position],
+            'has_error': self.has_error[position],
+            'skipped': self.skipped[position],
+        }
+
+    def to_linear_dict(self, root_id=None, with_data=False):
         """
-        Exports the tree in the linear format representing node children
-        as an adjacency list.
+        Exports the tree or the subtree of the given node in the linear format
+        representing node children as an adjacency list.
         """
+        children = defaultdict(list)
+        for position, parent in enumerate(self.parents):
+            children[parent].append(position)
+
+        if root_id is None:
+            queue = deque(children[-1])
+        elif root_id in self:
+            queue = deque([self.ids.index(root_id)])
+        else:
+            queue = deque()
+
         adjacency_list = defaultdict(dict)
-        if self.nodes:
-            for n in self.expand_tree(mode=self.WIDTH):
-                nid = self[n].identifier
-                adjacency_list[nid] = defaultdict(list)
-                if with_data:
-                    adjacency_list[nid].update(self[n].data)
-                for c in self.children(nid):
-                    cid = c.identifier
-                    adjacency_list[nid]['children'].append(cid)
+        while queue:
+            position = queue.popleft()
+            node = {'children': [self.ids[child] for child in children[position]]}
+            if not node['children']:
+                del node['children']
+            if with_data:
+                node = {**self.node_data(position), **node}
+            adjacency_list[self.ids[position]] = node
+            queue.extend(children[position])
         return adjacency_list
 
 
@@ -48,7 +100,7 @@ def path_to_node(result):
     return list(path)
 
 
-def tree_representation(result):
+def tree_nodes(result):
     skipped_meta_ids = list(
         Meta.objects.filter(value='SKIPPED').values_list('id', flat=True),
     )
@@ -71,9 +123,10 @@ def tree_representation(result):
         .order_by('id')
     )
 
-    tree = Tree()
     for node in result_nodes:
         node.update({'entity': ResultType.inv(node['entity'])})
-        tree.create_node(identifier=node['id'], parent=node.pop('parent_id'), data=node)
+        yield node
 
-    return tree
+
+def tree_representation(result):
+    return CompactTree(tree_nodes(result))
@@ -25,24 +25,22 @@ class TreeService:
         """
         result = ResultService.get_result(run_id)
 
-        # Try to get cached tree
-        cache = RunCache.by_obj(result, 'tree')
-        tree = cache.data
-        if not tree:
-            tree = tree_representation(result)
-            cache.data = tree
+        # The tree of the whole run is cached and serves its subtrees too
+        cache = RunCache.by_obj(result.root, 'tree')
+        tree = cache.get_or_set(lambda: tree_representation(result))
 
         main_package = None
         if result.main_package:
             main_package = result.main_package.id
 
         # Handle subtree if result is not root
+        root_id = None
         if result.root is not result:
-            tree = tree.subtree(result.id)
+            root_id = result.id
             main_package = result.id
 
         # Convert to linear dict format
-        tree_dict = tree.to_linear_dict(with_data=True)
+        tree_dict = tree.to_linear_dict(root_id=root_id, with_data=True)
 
         return {
             'tree': tree_dict,
@@ -1,10 +1,16 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
 
+import contextlib
 import os
+import threading
+from urllib.parse import urlparse
 
+from django.conf import settings
 import requests
+from requests.adapters import HTTPAdapter
 from requests_kerberos import DISABLED, HTTPKerberosAuth
+from requests_kerberos.exceptions import KerberosExchangeError
 
 from bublik.core.exceptions import URLFetchError
 from bublik.core.logging import get_task_or_server_logger
@@ -12,27 +18,111 @@ from bublik.core.logging import get_task_or_server_logger
 
 SAVE_URL_CHUNK_SIZE = 16384
 
-
-def get_url(url_str, raise_for_status=True, quiet_404=False, timeout=None):
-    kerberos_auth = HTTPKerberosAuth(mutual_authentication=DISABLED)
-    request_kwargs = {'auth': kerberos_auth}
+URL_SESSION_DEFAULTS = {
+    'pool_connections': 10,
+    'pool_maxsize': 16,
+    'max_retries': 0,
+}
+
+
+class PreemptiveKerberosAuth(HTTPKerberosAuth):
+    """
+    Kerberos authentication that remembers the hosts which have asked
+    for negotiation and authenticates the following requests to them
+    preemptively, saving a 401 round trip per request.
+    """
+
+    def __init__(self):
+        super().__init__(mutual_authentication=DISABLED)
+        self.negotiate_hosts = set()
+
+    def __call__(self, request):
+        host = urlparse(request.url).hostname
+        if host in self.negotiate_hosts:
+            with contextlib.suppress(KerberosExchangeError):
+                request.headers['Authorization'] = self.generate_request_header(
+                    None,
+                    host,
+                    is_preemptive=True,
+                )
+        return super().__call__(request)
+
+    def handle_401(self, response, **kwargs):
+        if 'negotiate' in response.headers.get('www-authenticate', '').lower():
+            self.negotiate_hosts.add(urlparse(response.url).hostname)
+        return super().handle_401(response, **kwargs)
+
+
+class URLSessions:
+    """
+    Per-process pool of keep-alive connections shared by all the threads.
+
+    Every thread gets its own session with its own Kerberos authentication
+    state, all the sessions use the same connection pool. The pool sizes
+    are taken from URL_SESSION in settings.py.
+    """
+
+    lock = threading.Lock()
+    local = threading.local()
+    adapter = None
+    adapter_pid = None
+
+    @classmethod
+    def get_adapter(cls):
+        with cls.lock:
+            # Connections must not be shared with the parent process after fork
+            if cls.adapter is None or cls.adapter_pid != os.getpid():
+                session_settings = {
+                    **URL_SESSION_DEFAULTS,
+                    **getattr(settings, 'URL_SESSION', {}),
+                }
+                cls.adapter = HTTPAdapter(**session_settings)
+                cls.adapter_pid = os.getpid()
+            return cls.adapter
+
+    @classmethod
+    def get(cls):
+        adapter = cls.get_adapter()
+        session = getattr(cls.local, 'session', None)
+        if session is None or session.get_adapter('http://') is not adapter:
+            session = requests.Session()
+            session.auth = PreemptiveKerberosAuth()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            cls.local.session = session
+        return session
+
+
+def get_url(url_str, raise_for_status=True, quiet_404=False, timeout=None, stream=False):
+    """
+    Request the URL using the pooled session of the current thread.
+    The response must be closed by the caller if stream is set.
+    """
+    session = URLSessions.get()
+    request_kwargs = {'stream': stream}
     if timeout is not None:
         request_kwargs['timeout'] = timeout
 
-    req = requests.get(url_str, **request_kwargs)
+    req = session.get(url_str, **request_kwargs)
 
     # CGI uses 302 status code for auto generated files and
     # requests lib doesn't authenticate on retry.
     # Do retry here when auto generated file is in place.
     not_auth = 401
     if req.status_code == not_auth:
-        req = requests.get(url_str, **request_kwargs)
+        req.close()
+        req = session.get(url_str, **request_kwargs)
 
     if raise_for_status:
         not_found_code = 404
         if quiet_404 and req.status_code == not_found_code:
+            req.close()
             return None
-        req.raise_for_status()
+        try:
+            req.raise_for_status()
+        except requests.exceptions.HTTPError:
+            req.close()
+            raise
     return req
 
 
@@ -49,18 +139,19 @@ def fetch_url(url_str, quiet_404=False):
 def save_url_to_fd(url_str, fd_out, quiet_404=False):
     logger = get_task_or_server_logger()
     try:
-        req = get_url(url_str, quiet_404=quiet_404)
+        req = get_url(url_str, quiet_404=quiet_404, stream=True)
         if req is None:
             return False
     except requests.exceptions.HTTPError as e:
         logger.error(e)
         return False
 
-    for blk in req.iter_content(SAVE_URL_CHUNK_SIZE):
-        if isinstance(fd_out, int):
-            os.write(fd_out, blk)
-        else:
-            fd_out.write(blk)
+    with req:
+        for blk in req.iter_content(SAVE_URL_CHUNK_SIZE):
+            if isinstance(fd_out, int):
+                os.write(fd_out, blk)
+            else:
+                fd_out.write(blk)
 
     return True
 
@@ -81,10 +81,8 @@ class TestIterationResultQuerySet(QuerySet):
             # Here a custom exception could be raised
             return self.model.objects.none()
 
-        # Apply filter by run metas
-        for meta in metas_filter:
-            self = self.filter(meta_results__meta=meta)
-        return self
+        # Apply filter by the index of run metas
+        return self.filter(meta_index__metas__contains=[meta.id for meta in metas_filter])
 
     def filter_runs_by_date(self, from_d: datetime, to_d: datetime) -> QuerySet:
         """
@@ -0,0 +1,126 @@
+# Generated by Django 5.2.14 on 2026-10-18 05:07
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0012_alter_testiterationresult_exec_seqno'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunSummary',
+            fields=[
+                (
+                    'run',
+                    models.OneToOneField(
+                        help_text='The test run identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='summary',
+                        serialize=False,
+                        to='data.testiterationresult',
+                    ),
+                ),
+                (
+                    'total',
+                    models.IntegerField(default=0, help_text='The number of test results.'),
+                ),
+                (
+                    'total_expected',
+                    models.IntegerField(
+                        help_text='The number of test results expected by the execution plan.',
+                        null=True,
+                    ),
+                ),
+                (
+                    'passed',
+                    models.IntegerField(default=0, help_text='The number of passed results.'),
+                ),
+                (
+                    'failed',
+                    models.IntegerField(default=0, help_text='The number of failed results.'),
+                ),
+                (
+                    'skipped',
+                    models.IntegerField(default=0, help_text='The number of skipped results.'),
+                ),
+                (
+                    'abnormal',
+                    models.IntegerField(default=0, help_text='The number of abnormal results.'),
+                ),
+                (
+                    'unexpected',
+                    models.IntegerField(
+                        default=0, help_text='The number of unexpected results.'
+                    ),
+                ),
+                (
+                    'progress',
+                    models.FloatField(
+                        help_text='The part of the execution plan which has been run.',
+                        null=True,
+                    ),
+                ),
+                (
+                    'status',
+                    models.TextField(help_text='The run status reported by TE.', null=True),
+                ),
+                (
+                    'status_by_nok',
+                    models.CharField(
+                        help_text='The run status by the rate of unexpected results.',
+                        max_length=16,
+                    ),
+                ),
+                (
+                    'unexpected_percent',
+                    models.IntegerField(
+                        default=0, help_text='The percent of unexpected results.'
+                    ),
+                ),
+                (
+                    'compromised',
+                    models.BooleanField(default=False, help_text='The run is compromised.'),
+                ),
+                (
+                    'conclusion',
+                    models.CharField(help_text='The run conclusion.', max_length=32),
+                ),
+                (
+                    'conclusion_reason',
+                    models.TextField(help_text='The reason of the conclusion.', null=True),
+                ),
+                (
+                    'nok_distribution',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BooleanField(),
+                        default=list,
+                        help_text='Unexpected flags of the test results in the order of their execution.',
+                        size=None,
+                    ),
+                ),
+                (
+                    'updated',
+                    models.DateTimeField(
+                        auto_now=True, help_text='Timestamp of the last update.'
+                    ),
+                ),
+                (
+                    'project',
+                    models.ForeignKey(
+                        help_text='The project identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='data.project',
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'bublik_runsummary',
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.14 on 2026-10-18 05:19
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0013_runsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunMetaIndex',
+            fields=[
+                (
+                    'run',
+                    models.OneToOneField(
+                        help_text='The test run identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='meta_index',
+                        serialize=False,
+                        to='data.testiterationresult',
+                    ),
+                ),
+                (
+                    'metas',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        default=list,
+                        help_text='IDs of the run metas.',
+                        size=None,
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'bublik_runmetaindex',
+                'indexes': [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=['metas'], name='bublik_runm_metas_1217c7_gin'
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO bublik_runmetaindex (run_id, metas)
+                SELECT metaresult.result_id, array_agg(DISTINCT metaresult.meta_id)
+                FROM bublik_metaresult metaresult
+                INNER JOIN bublik_testiterationresult result
+                    ON result.id = metaresult.result_id
+                WHERE result.test_run_id IS NULL
+                GROUP BY metaresult.result_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,159 @@
+# Generated by Django 5.2.14 on 2026-10-18 05:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0014_runmetaindex'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryResult',
+            fields=[
+                (
+                    'result',
+                    models.OneToOneField(
+                        help_text='The test iteration result identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='history',
+                        serialize=False,
+                        to='data.testiterationresult',
+                    ),
+                ),
+                (
+                    'run_start',
+                    models.DateTimeField(help_text='Timestamp of the test run start.'),
+                ),
+                (
+                    'iteration_hash',
+                    models.CharField(help_text='The test iteration hash.', max_length=64),
+                ),
+                (
+                    'start',
+                    models.DateTimeField(help_text='Timestamp of the test iteration start.'),
+                ),
+                (
+                    'finish',
+                    models.DateTimeField(
+                        help_text='Timestamp of the test iteration finish.', null=True
+                    ),
+                ),
+                (
+                    'obtained_result',
+                    models.TextField(help_text='The obtained result status.', null=True),
+                ),
+                (
+                    'verdicts_hash',
+                    models.CharField(
+                        help_text='MD5 of the obtained verdicts in their order, null if there are none.',
+                        max_length=32,
+                        null=True,
+                    ),
+                ),
+                (
+                    'unexpected',
+                    models.BooleanField(default=False, help_text='The result is unexpected.'),
+                ),
+                (
+                    'has_measurements',
+                    models.BooleanField(
+                        default=False, help_text='The result has measurements.'
+                    ),
+                ),
+                (
+                    'iteration',
+                    models.ForeignKey(
+                        db_index=False,
+                        help_text='The test iteration identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='data.testiteration',
+                    ),
+                ),
+                (
+                    'run',
+                    models.ForeignKey(
+                        help_text='The test run identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='data.testiterationresult',
+                    ),
+                ),
+                (
+                    'test',
+                    models.ForeignKey(
+                        db_index=False,
+                        help_text='The test identifier.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='data.test',
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'bublik_historyresult',
+                'indexes': [
+                    models.Index(
+                        fields=['test', '-start'], name='bublik_hist_test_id_712e50_idx'
+                    ),
+                    models.Index(
+                        fields=['test', 'run_start'], name='bublik_hist_test_id_5eab12_idx'
+                    ),
+                    models.Index(
+                        fields=['iteration_hash', '-start'],
+                        name='bublik_hist_iterati_90ac09_idx',
+                    ),
+                    models.Index(
+                        fields=['test', 'obtained_result', 'unexpected'],
+                        name='bublik_hist_test_id_c67669_idx',
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO bublik_historyresult (
+                    result_id, run_id, run_start, test_id, iteration_id, iteration_hash,
+                    start, finish, obtained_result, verdicts_hash, unexpected, has_measurements
+                )
+                SELECT
+                    result.id, result.test_run_id, run.start, iteration.test_id,
+                    iteration.id, iteration.hash, result.start, result.finish,
+                    (
+                        SELECT meta.value
+                        FROM bublik_metaresult metaresult
+                        INNER JOIN bublik_meta meta ON meta.id = metaresult.meta_id
+                        WHERE metaresult.result_id = result.id AND meta.type = 'result'
+                        LIMIT 1
+                    ),
+                    (
+                        SELECT md5(string_agg(meta.value, E'\\n' ORDER BY metaresult.serial))
+                        FROM bublik_metaresult metaresult
+                        INNER JOIN bublik_meta meta ON meta.id = metaresult.meta_id
+                        WHERE metaresult.result_id = result.id AND meta.type = 'verdict'
+                        GROUP BY metaresult.result_id
+                    ),
+                    EXISTS (
+                        SELECT 1
+                        FROM bublik_metaresult metaresult
+                        INNER JOIN bublik_meta meta ON meta.id = metaresult.meta_id
+                        WHERE metaresult.result_id = result.id AND meta.type = 'err'
+                    ),
+                    EXISTS (
+                        SELECT 1
+                        FROM bublik_measurementresult measurementresult
+                        WHERE measurementresult.result_id = result.id
+                    )
+                FROM bublik_testiterationresult result
+                INNER JOIN bublik_testiteration iteration ON iteration.id = result.iteration_id
+                INNER JOIN bublik_testiterationresult run ON run.id = result.test_run_id
+                WHERE iteration.hash IS NOT NULL
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
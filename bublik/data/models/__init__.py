@@ -48,13 +48,16 @@ from .meta import (
 from .project import Project
 from .reference import Reference
 from .result import (
+    HistoryResult,
     MetaResult,
     MetaTest,
     ResultStatus,
     ResultType,
     RunConclusion,
+    RunMetaIndex,
     RunStatus,
     RunStatusByUnexpected,
+    RunSummary,
     Test,
     TestArgument,
     TestIteration,
@@ -74,6 +77,7 @@ __all__ = [
     'ExpectMeta',
     'Expectation',
     'GlobalConfigs',
+    'HistoryResult',
     'ImportJob',
     'Job',
     'JobTaskExecution',
@@ -91,8 +95,10 @@ __all__ = [
     'ResultStatus',
     'ResultType',
     'RunConclusion',
+    'RunMetaIndex',
     'RunStatus',
     'RunStatusByUnexpected',
+    'RunSummary',
     'TaskExecution',
     'Test',
     'TestArgument',
@@ -65,9 +65,10 @@ class Measurement(models.Model):
         db_table = 'bublik_measurement'
 
     def get_multiplier(self):
-        meta = self.metas.get(name='multiplier')
-        if meta:
-            return meta.value
+        # Look through all metas to make use of the prefetched ones
+        for meta in self.metas.all():
+            if meta.name == 'multiplier':
+                return meta.value
         return None
 
     def representation(self):
@@ -106,6 +107,24 @@ class Measurement(models.Model):
 
         return data
 
+    def group_key(self):
+        """
+        This function returns a tuple containing key information about the measurement,
+        which allows grouping the measurement results.
+        """
+        mm_repr = self.representation()
+        mm_repr.pop('measurement_id')
+        mm_repr.pop('comments')
+
+        def make_hashable(mm_repr):
+            if isinstance(mm_repr, dict):
+                return tuple((k, make_hashable(v)) for k, v in mm_repr.items())
+            if isinstance(mm_repr, list):
+                return tuple(make_hashable(v) for v in mm_repr)
+            return mm_repr
+
+        return make_hashable(mm_repr)
+
 
 class MeasurementResult(models.Model):
     """
@@ -150,22 +169,7 @@ Serial number can be used to determine results order.""",
 
     @property
     def measurement_group_key(self):
-        """
-        This function returns a tuple containing key information about the measurement,
-        which allows grouping the measurement results.
-        """
-        mm_repr = self.measurement.representation()
-        mm_repr.pop('measurement_id')
-        mm_repr.pop('comments')
-
-        def make_hashable(mm_repr):
-            if isinstance(mm_repr, dict):
-                return tuple((k, make_hashable(v)) for k, v in mm_repr.items())
-            if isinstance(mm_repr, list):
-                return tuple(make_hashable(v) for v in mm_repr)
-            return mm_repr
-
-        return make_hashable(mm_repr)
+        return self.measurement.group_key()
 
 
 class MeasurementResultList(models.Model):
@@ -4,6 +4,8 @@
 from itertools import chain
 from typing import ClassVar
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.functional import cached_property
 
@@ -23,8 +25,10 @@ __all__ = [
     'ResultStatus',
     'ResultType',
     'RunConclusion',
+    'RunMetaIndex',
     'RunStatus',
     'RunStatusByUnexpected',
+    'RunSummary',
     'Test',
     'TestArgument',
     'TestIteration',
@@ -619,3 +623,178 @@ class MetaTest(models.Model):
             .last()
         )
         return latest_serial + 1 if latest_serial is not None else 0
+
+
+class RunSummary(models.Model):
+    """
+    Summary of a test run: counters of its test results, the run status and
+    conclusion. It is updated on import, so run lists are built without
+    going through the results of each run.
+    """
+
+    run = models.OneToOneField(
+        TestIterationResult,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary',
+        help_text='The test run identifier.',
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        help_text='The project identifier.',
+    )
+    total = models.IntegerField(default=0, help_text='The number of test results.')
+    total_expected = models.IntegerField(
+        null=True,
+        help_text='The number of test results expected by the execution plan.',
+    )
+    passed = models.IntegerField(default=0, help_text='The number of passed results.')
+    failed = models.IntegerField(default=0, help_text='The number of failed results.')
+    skipped = models.IntegerField(default=0, help_text='The number of skipped results.')
+    abnormal = models.IntegerField(default=0, help_text='The number of abnormal results.')
+    unexpected = models.IntegerField(default=0, help_text='The number of unexpected results.')
+    progress = models.FloatField(
+        null=True,
+        help_text='The part of the execution plan which has been run.',
+    )
+    status = models.TextField(null=True, help_text='The run status reported by TE.')
+    status_by_nok = models.CharField(
+        max_length=16,
+        help_text='The run status by the rate of unexpected results.',
+    )
+    unexpected_percent = models.IntegerField(
+        default=0,
+        help_text='The percent of unexpected results.',
+    )
+    compromised = models.BooleanField(default=False, help_text='The run is compromised.')
+    conclusion = models.CharField(max_length=32, help_text='The run conclusion.')
+    conclusion_reason = models.TextField(null=True, help_text='The reason of the conclusion.')
+    nok_distribution = ArrayField(
+        models.BooleanField(),
+        default=list,
+        help_text='Unexpected flags of the test results in the order of their execution.',
+    )
+    updated = models.DateTimeField(auto_now=True, help_text='Timestamp of the last update.')
+
+    class Meta:
+        db_table = 'bublik_runsummary'
+
+    def __repr__(self):
+        return (
+            f'RunSummary(run={self.run_id!r}, total={self.total!r}, '
+            f'unexpected={self.unexpected!r}, status={self.status!r}, '
+            f'conclusion={self.conclusion!r})'
+        )
+
+    @property
+    def stats(self):
+        """
+        Get the run counters in the format of the run stats:
+        total and unexpected counters, the expected total and progress
+        if the run has the execution plan.
+        """
+        stats = {'total': self.total, 'unexpected': self.unexpected}
+        if self.total_expected is not None:
+            stats['total_expected'] = self.total_expected
+            stats['progress'] = self.progress
+        return stats
+
+
+class RunMetaIndex(models.Model):
+    """
+    IDs of the metas of a test run. The GIN index on them allows to find
+    the runs having all the passed metas by array containment instead of
+    joining MetaResult once per meta.
+    """
+
+    run = models.OneToOneField(
+        TestIterationResult,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='meta_index',
+        help_text='The test run identifier.',
+    )
+    metas = ArrayField(
+        models.IntegerField(),
+        default=list,
+        help_text='IDs of the run metas.',
+    )
+
+    class Meta:
+        db_table = 'bublik_runmetaindex'
+        indexes: ClassVar[list] = [GinIndex(fields=['metas'])]
+
+    def __repr__(self):
+        return f'RunMetaIndex(run={self.run_id!r}, metas={self.metas!r})'
+
+
+class HistoryResult(models.Model):
+    """
+    Denormalized row of a test iteration result for the test history: the run,
+    the test and the obtained result are kept along with the result, so the
+    history is filtered and counted without joining the results metas.
+    The rows are written on import for the results of test iterations.
+    """
+
+    result = models.OneToOneField(
+        TestIterationResult,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='history',
+        help_text='The test iteration result identifier.',
+    )
+    run = models.ForeignKey(
+        TestIterationResult,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text='The test run identifier.',
+    )
+    run_start = models.DateTimeField(help_text='Timestamp of the test run start.')
+    test = models.ForeignKey(
+        Test,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+        help_text='The test identifier.',
+    )
+    iteration = models.ForeignKey(
+        TestIteration,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+        help_text='The test iteration identifier.',
+    )
+    iteration_hash = models.CharField(max_length=64, help_text='The test iteration hash.')
+    start = models.DateTimeField(help_text='Timestamp of the test iteration start.')
+    finish = models.DateTimeField(
+        null=True,
+        help_text='Timestamp of the test iteration finish.',
+    )
+    obtained_result = models.TextField(null=True, help_text='The obtained result status.')
+    verdicts_hash = models.CharField(
+        max_length=32,
+        null=True,
+        help_text='MD5 of the obtained verdicts in their order, null if there are none.',
+    )
+    unexpected = models.BooleanField(default=False, help_text='The result is unexpected.')
+    has_measurements = models.BooleanField(
+        default=False,
+        help_text='The result has measurements.',
+    )
+
+    class Meta:
+        db_table = 'bublik_historyresult'
+        indexes: ClassVar[list] = [
+            models.Index(fields=['test', '-start']),
+            models.Index(fields=['test', 'run_start']),
+            models.Index(fields=['iteration_hash', '-start']),
+            models.Index(fields=['test', 'obtained_result', 'unexpected']),
+        ]
+
+    def __repr__(self):
+        return (
+            f'HistoryResult(result={self.result_id!r}, run={self.run_id!r}, '
+            f'test={self.test_id!r}, obtained_result={self.obtained_result!r}, '
+            f'unexpected={self.unexpected!r})'
+        )
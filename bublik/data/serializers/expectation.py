@@ -5,7 +5,7 @@ from django.db import transaction
 from rest_framework.serializers import ModelSerializer
 
 from bublik.core.hash_system import HashedModelSerializer
-from bublik.core.meta.categorization import categorize_meta
+from bublik.core.meta.categorization import categorize_meta, categorize_metas_in_bulk
 from bublik.core.shortcuts import serialize
 from bublik.data.models import Expectation, ExpectMeta
 from bublik.data.serializers.meta import MetaSerializer
@@ -111,3 +111,73 @@ class ExpectationSerializer(HashedModelSerializer):
             em_serializer.get_or_create()
 
         return e, True
+
+    @classmethod
+    def bulk_queryset(cls):
+        return Expectation.objects.prefetch_related(
+            'expectmeta_set__meta',
+            'expectmeta_set__reference',
+        )
+
+    @classmethod
+    @transaction.atomic
+    def bulk_create_instances(cls, serializers):
+        """
+        Create expectations along with their expect metas by a fixed number
+        of queries. Expectations referring to references are rare, so they
+        are created one by one.
+        """
+        expectations = []
+        bulk_serializers = []
+        for serializer in serializers:
+            expect_metas = serializer.validated_data_and_hash['expectmeta_set']
+            if any(em_data.get('reference') for em_data in expect_metas):
+                expectations.append(serializer.get_or_create()[0])
+            else:
+                expectations.append(None)
+                bulk_serializers.append(serializer)
+
+        if not bulk_serializers:
+            return expectations
+
+        created = Expectation.objects.bulk_create(
+            [
+                Expectation(hash=serializer.validated_data_and_hash['hash'])
+                for serializer in bulk_serializers
+            ],
+        )
+
+        metas_data = {}
+        for serializer in bulk_serializers:
+            for em_data in serializer.validated_data_and_hash['expectmeta_set']:
+                meta_data = dict(em_data['meta'])
+                metas_data.setdefault(tuple(sorted(meta_data.items())), meta_data)
+
+        meta_keys = list(metas_data.keys())
+        metas = MetaSerializer.get_or_create_many(list(metas_data.values()))
+        categorize_metas_in_bulk([meta for meta, meta_created in metas if meta_created])
+        meta_ids = {key: meta.id for key, (meta, _) in zip(meta_keys, metas)}
+
+        expect_metas = []
+        for serializer, expectation in zip(bulk_serializers, created):
+            em_keys = set()
+            for em_data in serializer.validated_data_and_hash['expectmeta_set']:
+                meta_id = meta_ids[tuple(sorted(dict(em_data['meta']).items()))]
+                em_key = (meta_id, em_data['serial'])
+                if em_key in em_keys:
+                    continue
+                em_keys.add(em_key)
+                expect_metas.append(
+                    ExpectMeta(
+                        expectation=expectation,
+                        meta_id=meta_id,
+                        serial=em_data['serial'],
+                    ),
+                )
+        ExpectMeta.objects.bulk_create(expect_metas)
+
+        created = iter(created)
+        return [
+            expectation if expectation is not None else next(created)
+            for expectation in expectations
+        ]
@@ -24,7 +24,12 @@ from .importruns.views import ImportrunsViewSet
 from .index import render_docs, render_react
 from .job_task.views import JobTaskExecutionViewSet
 from .log import LogViewSet
-from .management import clear_all_runs_stats_cache, local_logs, meta_categorization
+from .management import (
+    clear_all_runs_stats_cache,
+    local_logs,
+    meta_categorization,
+    warm_up_runs_cache,
+)
 from .measurements import MeasurementViewSet
 from .outside_domains import OutsideDomainsViewSet
 from .performance import PerformanceCheckView
@@ -71,4 +76,5 @@ __all__ = [
     'meta_categorization',
     'render_docs',
     'render_react',
+    'warm_up_runs_cache',
 ]
@@ -1,15 +1,14 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright (C) 2016-2023 OKTET Labs Ltd. All rights reserved.
 
-from django.core.cache import cache
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from bublik.core.export import get_export_format, streaming_export_response
 from bublik.core.history import HistoryService
-from bublik.core.history.v2.utils import generate_hashkey
 
 
 __all__ = [
@@ -55,22 +54,15 @@ class HistoryViewSet(ListModelMixin, GenericViewSet):
         return HistoryService.get_history_grouped(**params)
 
     def list(self, request, pk=None):
-        return self._get_cached_response(request, self._get_history)
+        return self._get_response(request, self._get_history)
 
     @action(detail=False, methods=['get'])
     def grouped(self, request, pk=None):
-        return self._get_cached_response(request, self._get_history_grouped)
-
-    def _get_cached_response(self, request, service_func):
-        hashkey = generate_hashkey(request)
-        response_data = cache.get(hashkey)
-
-        if response_data is not None:
-            return Response(response_data)
+        return self._get_response(request, self._get_history_grouped)
 
+    def _get_response(self, request, service_func):
         params = self._extract_query_params(request)
         response_data = service_func(params)
-        cache.set(hashkey, response_data)
 
         add_context = getattr(self, 'add_context', None)
         if add_context:
@@ -78,6 +70,18 @@ class HistoryViewSet(ListModelMixin, GenericViewSet):
 
         return Response(response_data)
 
+    @action(detail=False, methods=['get'])
+    def export(self, request, pk=None):
+        export_format = get_export_format(request.query_params.get('export_format'))
+        params = self._extract_query_params(request)
+        del params['page'], params['page_size']
+        return streaming_export_response(
+            HistoryService.export_history(**params),
+            HistoryService.EXPORT_COLUMNS,
+            export_format,
+            'history',
+        )
+
     @action(detail=False, methods=['get'], renderer_classes=[JSONRenderer])
     def test_search_options(self, request, pk=None):
         project_id = request.query_params.get('project')
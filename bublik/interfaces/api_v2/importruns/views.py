@@ -13,7 +13,6 @@ from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
-from bublik.core.cache import RunCache
 from bublik.core.importruns.live.context import LiveLogContext, LiveLogError
 from bublik.core.importruns.source.run_traversal import schedule_runs
 from bublik.core.logging import get_task_or_server_logger
@@ -100,16 +99,13 @@ class ImportrunsViewSet(ViewSet):
     def init(self, request, format=None):
         """Starts live import initializing run. Returns run identifier."""
         try:
-            cache = None
+            ctx = None
             data = json.loads(request.body)
             ctx = LiveLogContext(data)
-
-            ctx.serialize()
-            cache = RunCache.by_id(ctx.run, 'livelog')
-            cache.data = ctx
+            ctx.save()
 
             return Response(
-                data={'runid': ctx.run},
+                data={'runid': ctx.run_id},
             )
         except json.decoder.JSONDecodeError:
             return Response(
@@ -120,8 +116,8 @@ class ImportrunsViewSet(ViewSet):
             traceback.print_exc()
             return e.to_response()
         except Exception:
-            if cache is not None:
-                del cache.data
+            if ctx is not None:
+                ctx.delete()
             traceback.print_exc()
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -131,34 +127,27 @@ class ImportrunsViewSet(ViewSet):
         """Accepts chunks of the run tree."""
         try:
             ctx = None
-            cache = None
-            run_id = request.query_params.get('run')
-            cache = RunCache.by_id(run_id, 'livelog')
+            run_id = int(request.query_params.get('run'))
             events = json.loads(request.body)
 
-            ctx = cache.data
+            ctx = LiveLogContext.load(run_id)
             if ctx is None:
                 return Response(
                     status=status.HTTP_400_BAD_REQUEST,
                     data={'message': 'unknown session'},
                 )
-            assert ctx.run == int(run_id)
 
             if not events:
                 return Response(status=status.HTTP_204_NO_CONTENT)
 
-            ctx.deserialize()
             ctx.feed(events)
-
-            ctx.serialize()
-            cache.data = ctx
+            ctx.save()
 
             return Response(status=status.HTTP_204_NO_CONTENT)
         except json.decoder.JSONDecodeError:
             if ctx is not None:
-                ctx.deserialize()
                 ctx.fatal_error()
-                del cache.data
+                ctx.delete()
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={'message': 'malformed JSON'},
@@ -166,16 +155,14 @@ class ImportrunsViewSet(ViewSet):
         except LiveLogError as e:
             traceback.print_exc()
             if ctx is not None:
-                ctx.deserialize()
                 ctx.fatal_error()
-                del cache.data
+                ctx.delete()
             return e.to_response()
         except Exception:
             traceback.print_exc()
             if ctx is not None:
-                ctx.deserialize()
                 ctx.fatal_error()
-                del cache.data
+                ctx.delete()
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @method_decorator(never_cache)
@@ -184,21 +171,17 @@ class ImportrunsViewSet(ViewSet):
         """Finish a live import session."""
         try:
             ctx = None
-            cache = None
-            run_id = request.query_params.get('run')
-            cache = RunCache.by_id(run_id, 'livelog')
+            run_id = int(request.query_params.get('run'))
             data = json.loads(request.body)
 
-            ctx = cache.data
+            ctx = LiveLogContext.load(run_id)
             if ctx is None:
                 return Response(
                     status=status.HTTP_400_BAD_REQUEST,
                     data={'message': 'unknown session'},
                 )
-            del cache.data
-            assert ctx.run == int(run_id)
+            ctx.delete()
 
-            ctx.deserialize()
             ctx.finish(data)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except json.decoder.JSONDecodeError:
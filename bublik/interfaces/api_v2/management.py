@@ -43,3 +43,11 @@ def local_logs(request, task_id):
 def clear_all_runs_stats_cache(request):
     task_id = tasks.clear_all_runs_stats_cache.delay()
     return HttpResponse(f'\nYour task id: {task_id}\n')
+
+
+@never_cache
+@api_view(['GET', 'POST'])
+def warm_up_runs_cache(request):
+    project_id = request.query_params.get('project', None)
+    task_id = tasks.warm_up_runs_cache.delay(project_id=project_id)
+    return HttpResponse(f'\nYour task id: {task_id}\n')
@@ -7,6 +7,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from bublik.core.export import get_export_format, streaming_export_response
 from bublik.core.result import ResultService
 from bublik.core.run.stats import (
     generate_results_details,
@@ -25,22 +26,18 @@ class ResultViewSet(ModelViewSet):
     serializer_class = TestIterationResultSerializer
     filter_backends: ClassVar[list] = []
 
+    def get_filters(self):
+        return {
+            'parent_id': self.request.query_params.get('parent_id'),
+            'test_name': self.request.query_params.get('test_name'),
+            'start_exec_seqno': self.request.query_params.get('start_exec_seqno'),
+            'results': self.request.query_params.get('results'),
+            'result_properties': self.request.query_params.get('result_properties'),
+            'requirements': self.request.query_params.get('requirements'),
+        }
+
     def get_queryset(self):
-        parent_id = self.request.query_params.get('parent_id')
-        test_name = self.request.query_params.get('test_name')
-        start_exec_seqno = self.request.query_params.get('start_exec_seqno')
-        results = self.request.query_params.get('results')
-        result_properties = self.request.query_params.get('result_properties')
-        requirements = self.request.query_params.get('requirements')
-
-        return ResultService.list_results(
-            parent_id=parent_id,
-            test_name=test_name,
-            start_exec_seqno=start_exec_seqno,
-            results=results,
-            result_properties=result_properties,
-            requirements=requirements,
-        )
+        return ResultService.list_results(**self.get_filters())
 
     def retrieve(self, request, pk=None):
         return Response(data={'result': ResultService.get_result_details(pk)})
@@ -50,6 +47,16 @@ class ResultViewSet(ModelViewSet):
             data={'results': generate_results_details(self.get_queryset())},
         )
 
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = get_export_format(request.query_params.get('export_format'))
+        return streaming_export_response(
+            ResultService.export_results(**self.get_filters()),
+            ResultService.EXPORT_COLUMNS,
+            export_format,
+            'results',
+        )
+
     @action(detail=True, methods=['get'])
     def artifacts_and_verdicts(self, request, pk=None):
         return Response(ResultService.get_result_artifacts_and_verdicts(pk))
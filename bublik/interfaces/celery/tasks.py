@@ -3,7 +3,6 @@
 
 from datetime import datetime
 import os
-import subprocess
 from urllib.parse import urljoin
 
 from celery.signals import (
@@ -18,6 +17,7 @@ from django.core.management import call_command
 import pendulum
 
 from bublik import settings
+from bublik.core.cache import RunCache
 from bublik.core.logging import get_task_or_server_logger, parse_log
 from bublik.core.mail import send_importruns_failed_mail
 from bublik.core.utils import create_event, get_import_job_task
@@ -25,6 +25,11 @@ from bublik.data.models import EventLog, Project, TaskExecution, TestIterationRe
 from bublik.interfaces.celery import app
 
 
+# Warming up the run cache is consumed by a separate worker (see scripts/runcelery),
+# so it doesn't hold back imports and other tasks
+RUN_CACHE_QUEUE = 'run_cache'
+
+
 @after_task_publish.connect()
 def add_received_import_task_event(sender=None, headers=None, body=None, **kwargs):
     task_id = headers['id']
@@ -312,37 +317,56 @@ def clear_all_runs_stats_cache(self):
     os.environ['TASK_ID'] = task_id
 
     logger = get_task_or_server_logger()
-    logpath = logger.handlers[0].logpath
 
     query_url = f"curl 'http://{settings.BUBLIK_HOST}/clear_all_runs_stats_cache/'"
 
     logger.info('clear all runs stats cache task started:')
     logger.info(f'[RUN]:  {query_url}')
 
-    test_run_ids = list(
-        TestIterationResult.objects.order_by('test_run_id')
-        .distinct('test_run_id')
-        .values_list('test_run_id', flat=True),
-    )
-    test_run_ids = [f'-i {trid}' for trid in test_run_ids if trid is not None]
-
-    with open(logpath, 'a') as log:
-        cmd_run_cache = [
-            './manage.py',
-            'run_cache',
-            'delete',
-            '-d',
-            'stats',
-            '--logger_out',
-            'True',
-        ]
-        subprocess.run(
-            [*cmd_run_cache, *test_run_ids],
-            stdout=log,
-            stderr=log,
-            shell=False,
-            check=True,
-        )
-        log.flush()
+    # All the runs stats are invalidated by incrementing their generation
+    RunCache.delete_data_for_all(data_keys=['stats'])
+    logger.info('the stats of all runs have been invalidated')
+
+    return task_id
+
+
+@app.task(bind=True, queue=RUN_CACHE_QUEUE)
+def warm_up_run_cache(self, run_id):
+    """Produce the cached data of a completed run in the background."""
+    task_id = self.request.id
+    os.environ['TASK_ID'] = task_id
+
+    # To avoid cyclic dependency between run.actions and this module
+    from bublik.core.run import actions
+
+    run = TestIterationResult.objects.filter(id=run_id, test_run=None).first()
+    if run is not None and run.finish:
+        actions.warm_up_run_cache(run)
+
+    return task_id
+
+
+@app.task(bind=True, queue=RUN_CACHE_QUEUE)
+def warm_up_runs_cache(self, project_id=None):
+    """Produce the cached data of all completed runs of the project, newest first."""
+    task_id = self.request.id
+    os.environ['TASK_ID'] = task_id
+
+    logger = get_task_or_server_logger()
+
+    # To avoid cyclic dependency between run.actions and this module
+    from bublik.core.run import actions
+
+    runs = TestIterationResult.objects.filter(test_run=None, finish__isnull=False)
+    if project_id is not None:
+        runs = runs.filter(project_id=project_id)
+
+    logger.info('warm up runs cache task started:')
+    logger.info(f'[PROJECT]: {project_id or ""}')
+
+    for run in runs.order_by('-start').iterator():
+        actions.warm_up_run_cache(run)
+
+    logger.info('the cache of the runs has been warmed up')
 
     return task_id
@@ -1,6 +1,7 @@
 """
 Management command: fix_result_timestamps
 Usage: python manage.py fix_result_timestamps [-i <id> ...] [-f <date>] [-t <date>]
+       [--skip-history-results]
 
 Repairs corrupted start/finish timestamps in TestIterationResult trees.
 
@@ -121,6 +122,7 @@ from django.db.models import F, Q
 
 from bublik.core.argparse import parser_type_date
 from bublik.core.exceptions import SanityError
+from bublik.core.history.results import update_run_history_results
 from bublik.core.logging import get_task_or_server_logger
 from bublik.data.models import TestIterationResult
 
@@ -498,12 +500,18 @@ class Command(BaseCommand):
             type=parser_type_date,
             help='Process runs with finish date <= this date (YYYY.MM.DD).',
         )
+        parser.add_argument(
+            '--skip-history-results',
+            action='store_true',
+            help='Do not rebuild the history results of the fixed runs.',
+        )
 
     def handle(self, *args, **options):
         # Get and validate options
         run_ids: list[int] = options['id']
         run_from = options['from']
         run_to = options['to']
+        skip_history_results = options['skip_history_results']
 
         if not run_ids and not run_from and not run_to:
             msg = 'Specify at least one of: -i, -f, -t.'
@@ -548,6 +556,13 @@ class Command(BaseCommand):
 
             result = self._fix_run(run)
 
+            # The history results copy the timestamps of the results
+            if not skip_history_results and 'fixed' in (
+                result.midnight_fix_status,
+                result.timezone_fix_status,
+            ):
+                update_run_history_results(run.pk)
+
             if in_task and result.error_msg:
                 raise CommandError(result.error_msg)
 
@@ -5,7 +5,17 @@ from django.core.cache import caches
 from django.core.management.base import BaseCommand
 
 
-UNUSED_CACHE_KEYS = ['dashboard', 'dashboard-next']
+# The run data of the former key format {run_id}.{data_key} have no expiration
+UNUSED_CACHE_KEYS = [
+    'dashboard',
+    'dashboard-next',
+    'stats',
+    'stats_sum',
+    'stats_reqs',
+    'dashboard-v2',
+    'livelog',
+    'tree',
+]
 
 
 class Command(BaseCommand):
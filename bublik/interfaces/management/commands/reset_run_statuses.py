@@ -7,6 +7,7 @@ from django.db.models import Q
 from bublik.core.argparse import parser_type_date
 from bublik.core.meta.categorization import get_metas_by_category
 from bublik.core.run.objects import set_run_status
+from bublik.core.run.summary import update_run_summary
 from bublik.core.utils import get_difference
 from bublik.data import models
 
@@ -127,6 +128,7 @@ class Command(BaseCommand):
         for run in runs:
             status_key = define_run_status(run)
             set_run_status(run, status_key)
+            update_run_summary(run)
 
         msg = self.style.SUCCESS(
             f'Run statuses were successfully updated for runs by ID: {run_ids_found}!',
@@ -115,11 +115,11 @@ class Command(BaseCommand):
                     kwargs.update({'run': run})
                     RunCache.delete_data_for_obj(**kwargs)
                 elif action == 'create':
-                    prepare_cache_for_completed_run(run)
+                    prepare_cache_for_completed_run(run, background=False)
                 elif action == 'update':
                     kwargs.update({'run': run})
                     RunCache.delete_data_for_obj(**kwargs)
-                    prepare_cache_for_completed_run(run)
+                    prepare_cache_for_completed_run(run, background=False)
 
             msg = (
                 f'Caches for {data} were successfully {action}d '
@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+import bz2
+import pickle
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bublik.core.cache import RunCache, RunCacheCodec, msgpack
+from bublik.core.run.stats import get_run_stats_detailed
+from bublik.core.tree.representation import tree_representation
+from bublik.data import models
+
+
+class LegacyCodec:
+    """
+    Pickle with bzip2 at level 9, the way the run cache was compressed before.
+    """
+
+    def __str__(self):
+        return 'pickle+bzip2:9 (legacy)'
+
+    def encode(self, data):
+        return bz2.compress(pickle.dumps(data), 9)
+
+    def decode(self, value):
+        return pickle.loads(bz2.decompress(value))
+
+
+class Command(BaseCommand):
+    help = """Compare the size and the encode/decode time of the run cache codecs
+              on the cached data of the given runs."""
+
+    CODECS = (
+        {'serializer': 'pickle', 'compressor': 'none'},
+        {'serializer': 'pickle', 'compressor': 'zlib', 'level': 1},
+        {'serializer': 'pickle', 'compressor': 'zlib', 'level': 6},
+        {'serializer': 'pickle', 'compressor': 'lzma', 'level': 0},
+        {'serializer': 'msgpack', 'compressor': 'none'},
+        {'serializer': 'msgpack', 'compressor': 'zlib', 'level': 1},
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'id',
+            type=int,
+            nargs='+',
+            help='IDs of the runs to take the data from',
+        )
+        parser.add_argument(
+            '-n',
+            '--number',
+            type=int,
+            default=10,
+            help='Number of times to encode and decode the data',
+        )
+
+    def get_payloads(self, run):
+        return {
+            'stats': get_run_stats_detailed(run.id),
+            'tree': tree_representation(run),
+        }
+
+    def get_codecs(self):
+        codecs = [LegacyCodec()]
+        for codec in self.CODECS:
+            if codec['serializer'] == 'msgpack' and msgpack is None:
+                continue
+            codecs.append(RunCacheCodec(**codec))
+        return codecs
+
+    def measure(self, codec, data, number):
+        start = time.perf_counter()
+        for _ in range(number):
+            value = codec.encode(data)
+        encode_time = (time.perf_counter() - start) / number
+
+        start = time.perf_counter()
+        for _ in range(number):
+            codec.decode(value)
+        decode_time = (time.perf_counter() - start) / number
+
+        return len(value), encode_time, decode_time
+
+    def handle(self, *args, **options):
+        runs = models.TestIterationResult.objects.filter(id__in=options['id'], test_run=None)
+        if not runs:
+            msg = 'Runs by specified IDs were not found!'
+            raise CommandError(msg)
+
+        line = '{:<8} {:<10} {:<26} {:>12} {:>12} {:>12}'
+        self.stdout.write(
+            line.format('run', 'data', 'codec', 'size, B', 'encode, ms', 'decode, ms'),
+        )
+        for run in runs:
+            for data_key, data in self.get_payloads(run).items():
+                for codec in self.get_codecs():
+                    try:
+                        size, encode_time, decode_time = self.measure(
+                            codec,
+                            data,
+                            options['number'],
+                        )
+                    except (TypeError, ValueError):
+                        # msgpack doesn't serialize arbitrary objects
+                        continue
+                    self.stdout.write(
+                        line.format(
+                            run.id,
+                            data_key,
+                            str(codec),
+                            size,
+                            f'{encode_time * 1000:.3f}',
+                            f'{decode_time * 1000:.3f}',
+                        ),
+                    )
+                self.stdout.write(
+                    f'{"":<8} {data_key:<10} configured: {RunCache.codec(data_key)}',
+                )
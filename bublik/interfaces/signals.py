@@ -4,10 +4,14 @@
 from contextlib import contextmanager
 
 from django.core.management import call_command
+from django.db import transaction
+from django.db.models import QuerySet
 from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from bublik.core.cache import ProjectCache, RunCache
+from bublik.core.cache import HistoryCache, ProjectCache, RunCache
+from bublik.core.run.meta_index import refresh_run_meta_index, update_run_meta_index
+from bublik.core.run.summary import drop_projects_summaries
 from bublik.data.models import (
     Config,
     ConfigTypes,
@@ -21,10 +25,16 @@ from bublik.data.models import (
 )
 
 
+def invalidate_history_cache(project_id):
+    # The history is produced again only after the changes are visible
+    transaction.on_commit(lambda: HistoryCache.invalidate(project_id))
+
+
 @receiver(pre_delete)
 def delete_run_cache(instance, sender, **kwargs):
-    if sender == TestIterationResult and instance.test_run is None:
+    if sender == TestIterationResult and instance.test_run_id is None:
         RunCache.delete_data_for_obj(instance)
+        invalidate_history_cache(instance.project_id)
 
 
 @receiver(post_save, sender=Config)
@@ -34,6 +44,26 @@ def update_config_cache(sender, instance, **kwargs):
         ProjectCache(project_id).configs.set(instance.name, instance.content)
 
 
+@receiver(post_save, sender=Config)
+def drop_run_summaries(sender, instance, **kwargs):
+    # Run statuses and conclusions depend on the project configuration
+    if (
+        instance.type == ConfigTypes.GLOBAL
+        and instance.name == GlobalConfigs.PER_CONF.name
+        and instance.is_active
+    ):
+        drop_projects_summaries(instance.project_id)
+
+
+@receiver(post_save, sender=Config)
+@receiver(post_delete, sender=Config)
+def delete_runs_reports_cache(sender, instance, **kwargs):
+    if instance.type == ConfigTypes.REPORT:
+        RunCache.delete_data_for_all(data_keys=['report'])
+        # The history refers to the report configs of the runs
+        HistoryCache.invalidate()
+
+
 @receiver(post_delete, sender=Config)
 def delete_config_cache(sender, instance, **kwargs):
     if instance.type == ConfigTypes.GLOBAL and instance.is_active:
@@ -80,6 +110,47 @@ def delete_orphan_meta(sender, instance, **kwargs):
         Meta.objects.filter(id=instance.meta_id).delete()
 
 
+def get_run_project_id(meta_result):
+    """
+    Return the project ID of the meta result's result if it is a run and None
+    otherwise. The result row is not loaded unless it is cached already.
+    """
+    if MetaResult.result.is_cached(meta_result):
+        result = meta_result.result
+        return result.project_id if result.test_run_id is None else None
+    return (
+        TestIterationResult.objects.filter(id=meta_result.result_id, test_run=None)
+        .values_list('project_id', flat=True)
+        .first()
+    )
+
+
+def is_deleted_with_results(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (TestIterationResult, Project))
+
+
+@receiver(post_save, sender=MetaResult)
+def update_run_meta_index_on_save(sender, instance, **kwargs):
+    run_project_id = get_run_project_id(instance)
+    if run_project_id is not None:
+        update_run_meta_index(instance.result_id)
+        # Run metas are filtered by and shown in the history
+        invalidate_history_cache(run_project_id)
+
+
+@receiver(post_delete, sender=MetaResult)
+def update_run_meta_index_on_delete(sender, instance, origin=None, **kwargs):
+    # The index of a run is deleted along with it, and the metas of the other
+    # results are not indexed
+    if origin is not None and is_deleted_with_results(origin):
+        return
+    run_project_id = get_run_project_id(instance)
+    if run_project_id is not None:
+        refresh_run_meta_index(instance.result_id)
+        invalidate_history_cache(run_project_id)
+
+
 @contextmanager
 def signal_disabled(signal, receiver, sender):
     signal.disconnect(receiver, sender=sender)
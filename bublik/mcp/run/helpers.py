@@ -52,8 +52,9 @@ def _list_unexpected_or_abnormal_results(
     queryset = queryset.filter(
         Q(meta_results__meta__type='err') | Q(meta_results__meta__in=models.Meta.abnormal),
     )
-    result_details = generate_results_details(queryset)
-    return PaginatedResult.paginate_queryset(result_details, page, page_size)
+    paginated_results = PaginatedResult.paginate_queryset(queryset, page, page_size)
+    paginated_results['results'] = generate_results_details(paginated_results['results'])
+    return paginated_results
 
 
 def _get_run_leaf_results(
@@ -4,6 +4,7 @@
 
 from django.conf import settings
 
+from bublik.core.cache import ProjectCache
 from bublik.core.config.services import ConfigServices
 from bublik.data.models import GlobalConfigs
 
@@ -13,6 +14,9 @@ class DynamicSettingsMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
+        # Configs changed since the previous request must be seen by this one
+        ProjectCache.start_request()
+
         project_id = request.GET.get('project', None)
 
         def get_setting(attr):
@@ -9,7 +9,12 @@ https://github.com/joke2k/faker
 https://factoryboy.readthedocs.io
 """
 
+import functools
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
 from bublik.core.argparse import parser_type_date
+from bublik.core.importruns.source.bulk import BulkIterationsImporter
 from bublik.data.models import TestIterationResult
 
 
@@ -39,3 +44,75 @@ def gen_expectation_data(n=2):
 def gen_test_iteration_result_simple(date):
     date = parser_type_date(date)
     return TestIterationResult.objects.create(start=date, finish=date)
+
+
+def iteration(name, test_type, seqno, iters=(), status='PASSED', params=None, err=None):
+    return {
+        'name': name,
+        'type': test_type,
+        'params': params or {},
+        'hash': f'{name}-hash' if test_type == 'test' else None,
+        'tin': seqno,
+        'test_id': seqno,
+        'plan_id': seqno,
+        'start_ts_utc': 1767225600 + seqno,
+        'end_ts_utc': 1767225600 + seqno + 1,
+        'objective': f'{name} objective',
+        'reqs': ['REQ-1'] if test_type == 'test' else [],
+        'err': err,
+        'obtained': {'result': {'status': status, 'verdicts': ['verdict']}},
+        'iters': list(iters),
+    }
+
+
+RUN_LOG = [
+    iteration(
+        'main',
+        'pkg',
+        1,
+        [
+            iteration('test_a', 'test', 2, params={'x': '1'}),
+            iteration(
+                'pkg',
+                'pkg',
+                3,
+                [iteration('test_b', 'test', 4, status='FAILED', err='Unexpected')],
+            ),
+            iteration('test_a', 'test', 5, params={'x': '1'}),
+        ],
+    ),
+]
+
+
+def import_test_run(project, start, finish=None):
+    """
+    Create a run of the project and import RUN_LOG into it by the bulk importer.
+    """
+    run = TestIterationResult.objects.create(start=start, finish=finish, project=project)
+    importer = BulkIterationsImporter(run, project.id, {})
+    for iteration_data in RUN_LOG:
+        importer.collect(iteration_data)
+    importer.flush()
+    return run
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_directory(test_case, directory):
+    """
+    Serve the directory by HTTP in a thread until the end of the test case,
+    return the URL of the directory.
+    """
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        functools.partial(_QuietHandler, directory=directory),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_case.addCleanup(server.server_close)
+    test_case.addCleanup(server.shutdown)
+    return f'http://127.0.0.1:{server.server_port}/'
@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timezone
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+
+from bublik.core.importruns.source.bulk import BulkIterationsImporter
+from bublik.core.importruns.source.execution import handle_iterations
+from bublik.core.importruns.telog import JSONLog
+from bublik.core.run.objects import add_expected_result
+from bublik.data.models import (
+    Expectation,
+    MetaResult,
+    Project,
+    TestIteration,
+    TestIterationRelation,
+    TestIterationResult,
+)
+from bublik.tests.fake_generator import RUN_LOG
+
+
+class BulkIterationsImporterTest(TestCase):
+    # The number of the results in RUN_LOG
+    RESULTS_NUM = 5
+
+    def setUp(self):
+        self.project = Project.objects.create(name='bulk')
+        self.run = TestIterationResult.objects.create(
+            start=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            project=self.project,
+        )
+
+    def import_log(self):
+        importer = BulkIterationsImporter(self.run, self.project.id, {})
+        for iteration_data in RUN_LOG:
+            importer.collect(iteration_data)
+        importer.flush()
+        return importer
+
+    def stream_log(self):
+        importer = BulkIterationsImporter(self.run, self.project.id, {})
+        main = dict(RUN_LOG[0])
+        test_a, pkg, test_a_again = main['iters']
+        # Children preceding the identifying fields are collected as a whole
+        main['iters'] = [test_a, {'iters': pkg['iters'], **pkg}, test_a_again]
+
+        with tempfile.TemporaryDirectory() as process_dir:
+            with open(os.path.join(process_dir, 'bublik.json'), 'w') as json_file:
+                json.dump({'version': 1, 'iters': [main], 'tags': ['tag']}, json_file)
+            json_log = JSONLog(streamed=True).convert_from_dir(process_dir, 'bublik.json')
+            assert json_log['tags'] == ['tag']
+            with mock.patch('bublik.core.importruns.source.bulk.BULK_BATCH_SIZE', 1):
+                handle_iterations(json_log['iters'], importer)
+        return importer
+
+    def test_import(self):
+        importer = self.import_log()
+        self.check_import(importer)
+
+    def test_streamed_import(self):
+        importer = self.stream_log()
+        self.check_import(importer)
+
+    def check_import(self, importer):
+        # Both test_a results are of the same iteration
+        assert importer.counter['iter_obj'] == self.RESULTS_NUM
+        assert importer.counter['created_iter_obj'] == self.RESULTS_NUM - 1
+
+        results = list(
+            TestIterationResult.objects.filter(test_run=self.run)
+            .order_by('id')
+            .values_list('exec_seqno', 'parent_package__exec_seqno', 'iteration__test__name'),
+        )
+        assert results == [
+            (1, None, 'main'),
+            (2, 1, 'test_a'),
+            (3, 1, 'pkg'),
+            (4, 3, 'test_b'),
+            (5, 1, 'test_a'),
+        ]
+
+        test_b = TestIterationResult.objects.get(test_run=self.run, exec_seqno=4)
+        assert set(test_b.meta_results.values_list('meta__type', 'meta__value')) == {
+            ('objective', 'test_b objective'),
+            ('requirement', 'REQ-1'),
+            ('verdict', 'verdict'),
+            ('result', 'FAILED'),
+            ('err', 'Unexpected'),
+        }
+        assert test_b.expectations.count() == 1
+        parents = test_b.iteration.parent_relations.values_list(
+            'parent_iteration__test__name',
+            'depth',
+        )
+        assert set(parents) == {('pkg', 1), ('main', 2)}
+
+        # Objects created in bulk are found by the regular hashed lookups
+        expectations = Expectation.objects.count()
+        expectation = add_expected_result(test_b, 'FAILED', ['verdict'])
+        assert list(test_b.expectations.all()) == [expectation]
+        assert Expectation.objects.count() == expectations
+
+        test_a = TestIteration.objects.get(test__name='test_a')
+        assert list(test_a.test_arguments.values_list('name', 'value')) == [('x', '1')]
+
+    def test_reimport_is_idempotent(self):
+        self.import_log()
+        counts = [
+            model.objects.count()
+            for model in (
+                TestIterationResult,
+                TestIteration,
+                TestIterationRelation,
+                MetaResult,
+                Expectation,
+            )
+        ]
+
+        importer = self.import_log()
+
+        assert importer.counter['created_iter_obj'] == 0
+        assert counts == [
+            model.objects.count()
+            for model in (
+                TestIterationResult,
+                TestIteration,
+                TestIterationRelation,
+                MetaResult,
+                Expectation,
+            )
+        ]
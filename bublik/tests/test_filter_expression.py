@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from bublik.core.run.filter_expression import (
+    TestRunMetasGroup,
+    compile_expression,
+    filter_by_expression,
+    normalize_expression,
+)
+from bublik.data.models import Meta, MetaResult, Project, TestIterationResult
+
+
+def compile_tags(expr_str):
+    return compile_expression(normalize_expression(expr_str, 'tag'), 'tag')
+
+
+def conjunctions_set(conjunctions):
+    return {frozenset(conjunction) for conjunction in conjunctions}
+
+
+class CompileExpressionTest(SimpleTestCase):
+    def test_dnf(self):
+        t1 = (('t1', None, None), False)
+        not_t1 = (('t1', None, None), True)
+        t3 = (('t3', None, None), False)
+        t3_gt_1 = (('t3', '1', '>'), False)
+
+        assert compile_tags('t1') == ((t1,),)
+        assert conjunctions_set(compile_tags('t1 & t3>1 | !t1')) == {
+            frozenset((t1, t3_gt_1)),
+            frozenset((not_t1,)),
+        }
+        # Not a DNF, it is simplified by sympy
+        assert conjunctions_set(compile_tags('t3 & (t1 | t3>1)')) == {
+            frozenset((t3, t1)),
+            frozenset((t3, t3_gt_1)),
+        }
+
+    def test_cache(self):
+        compile_tags('t1&t2')
+        hits = compile_expression.cache_info().hits
+
+        compile_tags('  t1 &  t2 ')
+
+        assert compile_expression.cache_info().hits == hits + 1
+
+    def test_metas_group(self):
+        group = TestRunMetasGroup()
+        [conjunction] = group.expr_str_to_dnf('x=1 & !y & x=1', 'test_argument')
+
+        assert [(str(meta), negation) for meta, negation in conjunction] == [
+            ('x=1', False),
+            ('y', True),
+        ]
+        assert [meta.alias for meta in group.metas] == ['talias0', 'talias1']
+
+
+class FilterByExpressionTest(TestCase):
+    RUNS_TAGS = (
+        ('t1',),
+        ('t2',),
+        ('t3=1',),
+        ('t1', 't3=1'),
+        ('t4', 't3=2'),
+        ('t5', 't3=3'),
+        ('t6', 't3=4'),
+        ('t1', 't4'),
+    )
+
+    def setUp(self):
+        project = Project.objects.create(name='tags')
+        self.runs = []
+        for run_tags in self.RUNS_TAGS:
+            run = TestIterationResult.objects.create(start=timezone.now(), project=project)
+            for tag in run_tags:
+                name, _, value = tag.partition('=')
+                meta, _ = Meta.objects.get_or_create(
+                    type='tag',
+                    name=name,
+                    value=value or None,
+                    hash=tag,
+                )
+                MetaResult.objects.create(result=run, meta=meta)
+            self.runs.append(run.id)
+
+    def filter_runs(self, expr_str):
+        with self.assertNumQueries(1):
+            runs = list(
+                filter_by_expression(TestIterationResult.objects.all(), expr_str).values_list(
+                    'id',
+                    flat=True,
+                ),
+            )
+        return sorted(self.runs.index(run) + 1 for run in runs)
+
+    def test_filter(self):
+        assert self.filter_runs('t1') == [1, 4, 8]
+        assert self.filter_runs('t2|t1') == [1, 2, 4, 8]
+        assert self.filter_runs('t1&t3') == [4]
+        assert self.filter_runs('t1|t3') == [1, 3, 4, 5, 6, 7, 8]
+        assert self.filter_runs('t1&t3=2') == []
+        assert self.filter_runs('t3>1') == [5, 6, 7]
+        assert self.filter_runs('!t1|!t2') == [1, 2, 3, 4, 5, 6, 7, 8]
+        assert self.filter_runs('t3&t3!=3') == [3, 4, 5, 7]
+        assert self.filter_runs('t3&!(t3=4|t1)') == [3, 5, 6]
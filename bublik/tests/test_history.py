@@ -0,0 +1,221 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from bublik.core.cache import HistoryCache
+from bublik.core.exceptions import NotFoundError
+from bublik.core.export import streaming_export_response
+from bublik.core.history.results import update_run_history_results
+from bublik.core.history.services import HistoryService
+from bublik.core.run.objects import add_tags
+from bublik.data.models import HistoryResult, Project, TestIterationResult
+from bublik.tests.fake_generator import import_test_run
+
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'run': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'project': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'history': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+# The number of the test_a results of an imported run
+RUN_TEST_A_RESULTS = 2
+
+
+def import_run(project, day):
+    run = import_test_run(
+        project,
+        datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=day),
+    )
+    update_run_history_results(run.id)
+    return run
+
+
+class HistoryPaginationTest(TestCase):
+    RUNS_NUM = 3
+    RESULTS_NUM = RUNS_NUM * RUN_TEST_A_RESULTS
+    PAGE_SIZE = 4
+
+    def setUp(self):
+        project = Project.objects.create(name='history')
+        for day in range(self.RUNS_NUM):
+            import_run(project, day)
+
+    def get_history(self, method, page):
+        return method(
+            'test_a',
+            page=page,
+            page_size=self.PAGE_SIZE,
+            from_date='2026-01-01',
+            to_date='2026-01-31',
+        )
+
+    def test_history(self):
+        first_page = self.get_history(HistoryService.get_history, 1)
+        second_page = self.get_history(HistoryService.get_history, 2)
+
+        assert first_page['counts'] == {
+            'runs': self.RUNS_NUM,
+            'iterations': 1,
+            'total_results': self.RESULTS_NUM,
+            'expected_results': self.RESULTS_NUM,
+            'unexpected_results': 0,
+        }
+        assert first_page['pagination']['count'] == self.RESULTS_NUM
+        assert len(first_page['results']) == self.PAGE_SIZE
+        assert len(second_page['results']) == self.RESULTS_NUM - self.PAGE_SIZE
+        result_ids = [
+            result['result_id'] for result in first_page['results'] + second_page['results']
+        ]
+        assert sorted(result_ids) == sorted(first_page['results_ids'])
+
+        with pytest.raises(NotFoundError):
+            self.get_history(HistoryService.get_history, 3)
+
+    def test_constant_number_of_queries(self):
+        # Warm up the lookups cached by the process
+        HistoryService.get_history('test_a', page_size=1)
+
+        with CaptureQueriesContext(connection) as one_row_queries:
+            HistoryService.get_history('test_a', page_size=1)
+        with CaptureQueriesContext(connection) as all_rows_queries:
+            history = HistoryService.get_history('test_a', page_size=self.RESULTS_NUM)
+
+        assert len(history['results']) == self.RESULTS_NUM
+        assert len(all_rows_queries) == len(one_row_queries)
+
+    def test_history_grouped(self):
+        history = self.get_history(HistoryService.get_history_grouped, 1)
+
+        assert history['pagination']['count'] == 1
+        assert len(history['results']) == 1
+        assert history['counts']['total_results'] == self.RESULTS_NUM
+        [group] = history['results'][0]['results_by_verdicts']
+        assert group['result_type'] == 'PASSED'
+        assert len(group['results_data']) == self.RESULTS_NUM
+
+    def test_period(self):
+        history = HistoryService.get_history(
+            'test_a',
+            from_date='2026-01-02',
+            to_date='2026-01-02',
+        )
+        run = TestIterationResult.objects.get(test_run=None, start__date='2026-01-02')
+
+        assert {result['run_id'] for result in history['results']} == {run.id}
+
+    def test_history_results(self):
+        run = TestIterationResult.objects.filter(test_run=None).first()
+        test_b = HistoryResult.objects.get(run=run, test__name='test_b')
+
+        assert (test_b.obtained_result, test_b.unexpected) == ('FAILED', True)
+
+        rows = HistoryResult.objects.filter(run=run).count()
+        update_run_history_results(run.id, finished_only=True)
+        assert HistoryResult.objects.filter(run=run).count() == rows
+
+        history = HistoryService.get_history('test_b', result_types='unexpected')
+        assert history['counts']['unexpected_results'] == self.RUNS_NUM
+
+    def test_export(self):
+        history = HistoryService.export_history('test_a')
+        response = streaming_export_response(
+            history,
+            HistoryService.EXPORT_COLUMNS,
+            'csv',
+            'history',
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+        assert lines[0].split(',') == list(HistoryService.EXPORT_COLUMNS)
+        assert len(lines) == 1 + self.RESULTS_NUM
+        assert all(',PASSED,' in line for line in lines[1:])
+
+        with pytest.raises(NotFoundError):
+            HistoryService.export_history('test_c')
+
+    def test_history_results_timestamps(self):
+        run = TestIterationResult.objects.filter(test_run=None).first()
+        # Make the packages span their children
+        results = TestIterationResult.objects.filter(test_run=run)
+        results.filter(iteration__test__name='pkg').update(
+            finish=results.get(iteration__test__name='test_b').finish,
+        )
+        results.filter(iteration__test__name='main').update(
+            finish=max(result.finish for result in results),
+        )
+        # The results are logged in the timezone 3 hours behind the run
+        run.start += timedelta(hours=3)
+        run.finish = run.start + timedelta(hours=1)
+        run.save()
+
+        call_command('fix_result_timestamps', '-i', run.id, stdout=StringIO())
+
+        history_results = HistoryResult.objects.filter(run=run).select_related('result')
+        assert history_results
+        for history_result in history_results:
+            assert history_result.start == history_result.result.start >= run.start
+
+
+@override_settings(CACHES=CACHES)
+class HistoryCacheTest(TestCase):
+    def setUp(self):
+        caches['project'].clear()
+        caches['history'].clear()
+        self.project = Project.objects.create(name='history')
+        import_run(self.project, 0)
+
+    def get_history(self, page):
+        return HistoryService.get_history('test_a', page=page, page_size=1)
+
+    def test_pages(self):
+        with CaptureQueriesContext(connection) as first_page_queries:
+            first_page = self.get_history(1)
+        with CaptureQueriesContext(connection) as second_page_queries:
+            second_page = self.get_history(2)
+        with self.assertNumQueries(0):
+            assert self.get_history(1) == first_page
+
+        # The results of the history are taken from the cache for the next page
+        assert len(second_page_queries) < len(first_page_queries)
+        assert first_page['results'][0]['result_id'] != second_page['results'][0]['result_id']
+
+        grouped = HistoryService.get_history_grouped('test_a', page=1, page_size=1)
+        assert grouped['pagination']['count'] == 1
+        assert grouped['counts'] == first_page['counts']
+
+    def test_invalidation(self):
+        assert self.get_history(1)['counts']['total_results'] == RUN_TEST_A_RESULTS
+
+        with self.captureOnCommitCallbacks(execute=True):
+            import_run(self.project, 1)
+
+        assert self.get_history(1)['counts']['total_results'] == 2 * RUN_TEST_A_RESULTS
+
+        HistoryCache.invalidate()
+        with CaptureQueriesContext(connection) as queries:
+            self.get_history(1)
+        assert queries
+
+    def test_run_changes_invalidation(self):
+        run = TestIterationResult.objects.get(test_run=None)
+        self.get_history(1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            add_tags(run, {'tag': None})
+        with CaptureQueriesContext(connection) as queries:
+            self.get_history(1)
+        assert queries
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run.delete()
+        assert self.get_history(1)['counts']['total_results'] == 0
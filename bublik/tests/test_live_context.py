@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from django.test import SimpleTestCase
+
+from bublik.core.importruns.live.context import TestStackItem
+from bublik.core.importruns.live.plan_tracking import PlanItem, PlanTracker
+
+
+PLAN = {
+    'name': 'main',
+    'type': 'pkg',
+    'prologue': {'name': 'prologue', 'type': 'test'},
+    'children': [
+        {'name': 'test_a', 'type': 'test', 'iterations': 2},
+        {
+            'name': 'pkg',
+            'type': 'pkg',
+            'children': [{'name': 'test_b', 'type': 'test'}],
+        },
+    ],
+}
+# main, the prologue, the test_a iterations, pkg and test_b
+PLAN_ITEMS_NUM = 6
+
+
+class PlanCursorTest(SimpleTestCase):
+    def events(self, tracker):
+        events = []
+        while not tracker.finished():
+            item, enter = tracker.peek_event()
+            events.append((item.id, item.name, enter))
+            tracker.next_event()
+        return events
+
+    def test_restore_from_cursor(self):
+        expected = self.events(PlanTracker(PlanItem(PLAN)))
+
+        # Restore the tracker at every step, sharing the plan items
+        # the same way the restored contexts do
+        plan_root = PlanItem(PLAN)
+        tracker = PlanTracker(PlanItem(PLAN))
+        events = []
+        while not tracker.finished():
+            tracker = PlanTracker.from_cursor(plan_root, tracker.cursor(), tracker.next_id)
+            item, enter = tracker.peek_event()
+            events.append((item.id, item.name, enter))
+            tracker.next_event()
+
+        assert events == expected
+        # Every item is entered and left
+        assert len(events) == 2 * PLAN_ITEMS_NUM
+
+
+class TestStackItemTest(SimpleTestCase):
+    def test_state(self):
+        item = TestStackItem.from_state(['test', 3, 7, 5, 11, 12, 13])
+
+        assert item.to_state() == ['test', 3, 7, 5, 11, 12, 13]
+        assert (item.test_id, item.iteration_id, item.result_id) == (11, 12, 13)
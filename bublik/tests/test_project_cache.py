@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from bublik.core.cache import ProjectCache, _project_local_cache
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        'project': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    },
+)
+class ProjectLocalCacheTest(SimpleTestCase):
+    def setUp(self):
+        _project_local_cache.clear()
+        self.addCleanup(_project_local_cache.clear)
+
+    def test_local_layer(self):
+        ProjectCache(1).configs.set('per_conf', {'key': 'value'})
+        ProjectCache(1).configs.get('per_conf')
+
+        with mock.patch.object(caches['project'], 'get') as redis_get:
+            assert ProjectCache(1).configs.get('per_conf') == {'key': 'value'}
+        redis_get.assert_not_called()
+
+    def test_value_copies(self):
+        per_conf = {'DASHBOARD_COLUMNS': [{'key': 'name'}]}
+        ProjectCache(1).configs.set('per_conf', per_conf)
+
+        # The callers may change the values they get
+        for _ in range(2):
+            columns = ProjectCache(1).configs.get('per_conf')['DASHBOARD_COLUMNS']
+            assert {item.pop('key'): item for item in columns} == {'name': {}}
+
+    def test_generation_change(self):
+        ProjectCache(1).configs.set('per_conf', {'key': 'value'})
+        ProjectCache(2).configs.set('per_conf', {'key': 'value'})
+        ProjectCache(1).configs.get('per_conf')
+        ProjectCache(2).configs.get('per_conf')
+
+        # Another process changes the configuration of the first project
+        caches['project'].set('project:1:configs:per_conf', {'key': 'changed'})
+        caches['project'].incr(_project_local_cache.generation_key(1))
+
+        assert ProjectCache(1).configs.get('per_conf') == {'key': 'value'}
+        ProjectCache.start_request()
+        with mock.patch.object(caches['project'], 'get', wraps=caches['project'].get) as get:
+            assert ProjectCache(1).configs.get('per_conf') == {'key': 'changed'}
+            assert ProjectCache(2).configs.get('per_conf') == {'key': 'value'}
+        # The generations of both projects and the changed config are read
+        assert get.call_args_list == [
+            mock.call(_project_local_cache.generation_key(1)),
+            mock.call('project:1:configs:per_conf'),
+            mock.call(_project_local_cache.generation_key(2)),
+        ]
+
+    @override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            'project': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        },
+    )
+    def test_no_generation(self):
+        ProjectCache(1).configs.set('per_conf', {'key': 'value'})
+
+        assert ProjectCache(1).configs.get('per_conf') is None
@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from bublik.core.report.services import load_report_measurement_results
+from bublik.data.models import (
+    Measurement,
+    MeasurementResult,
+    Meta,
+    Project,
+    TestIterationResult,
+)
+from bublik.tests.fake_generator import import_test_run
+
+
+class LoadReportMeasurementResultsTest(TestCase):
+    def setUp(self):
+        project = Project.objects.create(name='report')
+        import_test_run(project, datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+        self.measurement = Measurement.objects.create(hash='measurement')
+        self.measurement.metas.set(
+            Meta.objects.create(name=name, type=meta_type, value=value, hash=name)
+            for name, meta_type, value in (
+                ('type', 'measurement_subject', 'throughput'),
+                ('name', 'measurement_subject', 'rx'),
+                ('base_units', 'measurement_subject', 'bps'),
+                ('multiplier', 'measurement_subject', '1e+6'),
+            )
+        )
+        self.results = TestIterationResult.objects.filter(
+            iteration__test__name__in=['test_a', 'test_b'],
+        ).order_by('id')
+        for value, result in enumerate(self.results):
+            MeasurementResult.objects.create(
+                measurement=self.measurement,
+                value=value,
+                result=result,
+            )
+
+    def test_load(self):
+        mmrs = MeasurementResult.objects.filter(result__iteration__test__name='test_a')
+        mmrs = mmrs.union(
+            MeasurementResult.objects.filter(result__iteration__test__name='test_b'),
+        )
+
+        with self.assertNumQueries(6):
+            report_mmrs = load_report_measurement_results(mmrs)
+
+        assert [mmr.result_id for mmr in report_mmrs] == [result.id for result in self.results]
+        assert [(mmr.test_name, mmr.has_error) for mmr in report_mmrs] == [
+            ('test_a', False),
+            ('test_b', True),
+            ('test_a', False),
+        ]
+        assert [mmr.args for mmr in report_mmrs] == [[('x', '1')], [], [('x', '1')]]
+        assert all(mmr.measurement == self.measurement for mmr in report_mmrs)
+        assert report_mmrs[0].measurement_key == self.measurement.group_key()
+        assert dict(report_mmrs[0].measurement_key)['units'] == 'Mbps'
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timezone
+import json
+
+from django.test import TestCase
+
+from bublik.core.export import EXPORT_CHUNK_SIZE, get_csv_value, streaming_export_response
+from bublik.core.result import ResultService
+from bublik.core.run.objects import add_expected_result
+from bublik.core.run.stats import generate_results_details
+from bublik.data.models import (
+    Measurement,
+    MeasurementResult,
+    Project,
+    TestIterationResult,
+)
+from bublik.tests.fake_generator import import_test_run
+
+
+class ResultsListTest(TestCase):
+    # The number of the test_a results of the run
+    TEST_A_RESULTS = 2
+
+    def setUp(self):
+        self.project = Project.objects.create(name='results')
+        self.run = import_test_run(self.project, datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+        self.test_b = TestIterationResult.objects.get(iteration__test__name='test_b')
+        add_expected_result(self.test_b, 'PASSED', ['second', 'first'])
+        MeasurementResult.objects.create(
+            measurement=Measurement.objects.create(hash='measurement'),
+            value=1,
+            result=self.test_b,
+        )
+
+    def test_results_details(self):
+        results = ResultService.list_results(parent_id=self.test_b.parent_package_id)
+
+        [details] = generate_results_details(results)
+
+        assert (details['name'], details['run_id']) == ('test_b', self.run.id)
+        assert details['has_error']
+        assert details['has_measurements']
+        assert [
+            (expected['result_type'], expected['verdicts'])
+            for expected in details['expected_results']
+        ] == [('FAILED', ['verdict']), ('PASSED', ['second', 'first'])]
+
+    def test_constant_number_of_queries(self):
+        results = ResultService.list_results(test_name='test_a')
+
+        with self.assertNumQueries(10):
+            page = ResultService.list_results_paginated(test_name='test_a', page_size=1)
+        with self.assertNumQueries(10):
+            all_results = ResultService.list_results_paginated(test_name='test_a')
+
+        assert page['pagination']['count'] == self.TEST_A_RESULTS
+        assert len(page['results']) == 1
+        assert len(all_results['results']) == results.count() == self.TEST_A_RESULTS
+        assert not any(result['has_error'] for result in all_results['results'])
+
+    def test_export(self):
+        results = ResultService.export_results(test_name='test_a')
+        response = streaming_export_response(
+            results,
+            ResultService.EXPORT_COLUMNS,
+            'ndjson',
+            'results',
+        )
+
+        # The results are read and hydrated by one chunk
+        with self.assertNumQueries(8):
+            lines = list(response.streaming_content)
+
+        assert len(lines) == self.TEST_A_RESULTS < EXPORT_CHUNK_SIZE
+        assert {json.loads(line)['name'] for line in lines} == {'test_a'}
+
+    def test_csv_value(self):
+        assert get_csv_value(['a', 1, None, [2.5, True]]) == 'a; 1; ; 2.5; True'
+        assert get_csv_value({'a': 1}) == '{"a": 1}'
@@ -0,0 +1,182 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from bublik.core.cache import RunCache, RunCacheCodec
+from bublik.core.run.actions import prepare_cache_for_completed_run, warm_up_run_cache
+from bublik.core.run.stats import get_run_stats_detailed
+from bublik.data.models import HistoryResult, Project, TestIterationResult
+from bublik.tests.fake_generator import import_test_run
+
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'run': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'project': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+@override_settings(CACHES=CACHES)
+class RunCacheTest(SimpleTestCase):
+    def setUp(self):
+        caches['run'].clear()
+        now = datetime.now(tz=timezone.utc)
+        self.runs = [TestIterationResult(id=run_id, finish=now) for run_id in (1, 2)]
+        for run in self.runs:
+            for data_key in ('stats', 'tree'):
+                RunCache.by_obj(run, data_key).data = f'{data_key} {run.id}'
+
+    def get_data(self, data_key):
+        return [RunCache.by_obj(run, data_key).data for run in self.runs]
+
+    def test_codecs(self):
+        data = {'results': [{'name': 'test', 'stats': (1, 2)}] * 100}
+
+        for compressor in RunCacheCodec.COMPRESSORS:
+            value = RunCacheCodec(compressor=compressor).encode(data)
+            assert RunCacheCodec.decode(value) == data
+
+        with self.settings(
+            RUN_CACHE={'codecs': {'stats': {'serializer': 'pickle', 'compressor': 'lzma'}}},
+        ):
+            RunCache.by_obj(self.runs[0], 'stats').data = data
+
+            assert str(RunCache.codec('stats')) == 'pickle+lzma:0'
+            assert str(RunCache.codec('stats_reqs')) == 'pickle+zlib:1'
+
+        assert RunCache.by_obj(self.runs[0], 'stats').data == data
+
+    def test_cache(self):
+        with mock.patch.object(caches['run'], 'get_many') as get_many:
+            RunCache.by_obj(self.runs[0], 'stats')
+        get_many.assert_not_called()
+
+        assert self.get_data('stats') == ['stats 1', 'stats 2']
+
+    def test_delete_run_data(self):
+        with mock.patch.object(caches['run'], 'delete') as delete:
+            RunCache.delete_data_for_obj(self.runs[0])
+        delete.assert_not_called()
+
+        assert self.get_data('stats') == [None, 'stats 2']
+        assert self.get_data('tree') == [None, 'tree 2']
+
+        RunCache.delete_data_for_obj(self.runs[1], data_keys=['tree'])
+
+        assert self.get_data('stats') == [None, 'stats 2']
+        assert self.get_data('tree') == [None, None]
+
+    def test_delete_all_runs_data(self):
+        RunCache.delete_data_for_all(data_keys=['stats'])
+
+        assert self.get_data('stats') == [None, None]
+        assert self.get_data('tree') == ['tree 1', 'tree 2']
+
+    def test_variants(self):
+        for config_id in (1, 2):
+            cache = RunCache.by_obj(self.runs[0], 'report', variant=config_id)
+            cache.data = f'report {config_id}'
+
+        assert RunCache.by_obj(self.runs[0], 'report', variant=1).data == 'report 1'
+        assert RunCache.by_obj(self.runs[0], 'report', variant=2).data == 'report 2'
+
+        RunCache.delete_data_for_obj(self.runs[0], data_keys=['report'])
+
+        assert RunCache.by_obj(self.runs[0], 'report', variant=1).data is None
+        assert RunCache.by_obj(self.runs[0], 'report', variant=2).data is None
+        assert self.get_data('stats') == ['stats 1', 'stats 2']
+
+    def test_single_flight(self):
+        calls = []
+        started = threading.Event()
+
+        def produce():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return 'stats'
+
+        def get_data():
+            started.wait(1)
+            return RunCache.by_obj(self.runs[0], 'stats').get_or_set(produce)
+
+        RunCache.delete_data_for_obj(self.runs[0])
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first = executor.submit(RunCache.by_obj(self.runs[0], 'stats').get_or_set, produce)
+            others = [executor.submit(get_data) for _ in range(2)]
+
+        assert [first.result()] + [other.result() for other in others] == ['stats'] * 3
+        assert len(calls) == 1
+
+    def test_lock_expiration(self):
+        cache = RunCache.by_obj(self.runs[0], 'tree')
+        del cache.data
+        caches['run'].add(f'{cache.key}.lock', 'token')
+
+        with self.settings(RUN_CACHE={'lock_timeout': 0.2, 'lock_poll_interval': 0.05}):
+            assert cache.get_or_set(lambda: 'tree') == 'tree'
+
+        assert RunCache.by_obj(self.runs[0], 'tree').data == 'tree'
+
+
+@override_settings(CACHES=CACHES)
+class RunCacheWarmUpTest(TestCase):
+    def setUp(self):
+        caches['run'].clear()
+        project = Project.objects.create(name='warm-up')
+        self.run = import_test_run(
+            project,
+            datetime(2026, 1, 1, tzinfo=timezone.utc),
+            datetime(2026, 1, 2, tzinfo=timezone.utc),
+        )
+
+    def test_schedule(self):
+        task_patch = mock.patch('bublik.core.run.actions.tasks.warm_up_run_cache')
+        with task_patch as task, self.captureOnCommitCallbacks(execute=True):
+            prepare_cache_for_completed_run(self.run)
+
+        task.delay.assert_called_once_with(run_id=self.run.id)
+
+    def test_failed_step(self):
+        def update_run_summary(run):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT * FROM unknown_table')
+
+        with mock.patch('bublik.core.run.actions.update_run_summary', update_run_summary):
+            prepare_cache_for_completed_run(self.run, background=False)
+
+        assert HistoryResult.objects.filter(run=self.run).exists()
+        assert RunCache.by_obj(self.run, 'stats').data
+
+    def test_warm_up(self):
+        warm_up_run_cache(self.run)
+
+        assert RunCache.by_obj(self.run, 'stats').data
+        assert RunCache.by_obj(self.run, 'tree').data
+
+    def test_stats_by_requirements(self):
+        def build_run_stats_detailed(run_id, requirements=()):
+            return sorted(requirements)
+
+        build_patch = mock.patch(
+            'bublik.core.run.stats.build_run_stats_detailed',
+            side_effect=build_run_stats_detailed,
+        )
+        with build_patch as build:
+            for requirements in ('a;b', 'c', 'b;a', 'c'):
+                get_run_stats_detailed(self.run.id, requirements)
+
+        # The statistics by both sets of requirements stay cached
+        assert build.call_args_list == [
+            mock.call(self.run.id, {'a', 'b'}),
+            mock.call(self.run.id, {'c'}),
+        ]
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from bublik.core.run.objects import add_tags, clear_meta_result
+from bublik.data.models import MetaResult, Project, RunMetaIndex, TestIterationResult
+
+
+class RunMetaIndexTest(TestCase):
+    def setUp(self):
+        project = Project.objects.create(name='metas')
+        self.runs = [
+            TestIterationResult.objects.create(start=timezone.now(), project=project)
+            for _ in range(3)
+        ]
+        add_tags(self.runs[0], {'t1': None, 't2': '1'})
+        add_tags(self.runs[1], {'t1': None, 't2': '2'})
+        add_tags(self.runs[2], {'t2': '1'})
+
+    def filter_runs(self, metas):
+        runs = TestIterationResult.objects.filter(test_run__isnull=True)
+        return sorted(self.runs.index(run) for run in runs.filter_by_run_metas(metas))
+
+    def test_filter_by_run_metas(self):
+        assert self.filter_runs(['t1']) == [0, 1]
+        assert self.filter_runs(['t1', 't2=1']) == [0]
+        assert self.filter_runs(['t2=1']) == [0, 2]
+        assert self.filter_runs(['t3']) == []
+
+    def test_index_update(self):
+        clear_meta_result(
+            m_data={'name': 't1', 'type': 'tag', 'value': None},
+            mr_data={'result': self.runs[0]},
+        )
+
+        assert self.filter_runs(['t1']) == [1]
+        assert sorted(RunMetaIndex.objects.get(run=self.runs[0]).metas) == list(
+            MetaResult.objects.filter(result=self.runs[0]).values_list('meta_id', flat=True),
+        )
+
+        self.runs[1].delete()
+
+        assert set(RunMetaIndex.objects.values_list('run', flat=True)) == {
+            self.runs[0].id,
+            self.runs[2].id,
+        }
+
+    def test_run_deletion(self):
+        result = TestIterationResult.objects.create(
+            start=timezone.now(),
+            project=self.runs[0].project,
+            test_run=self.runs[0],
+            parent_package=self.runs[0],
+        )
+        add_tags(result, {'t3': None})
+
+        with CaptureQueriesContext(connection) as context:
+            self.runs[0].delete()
+
+        assert not [
+            query
+            for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "bublik_runmetaindex"')
+        ]
+        assert self.filter_runs(['t2=1']) == [2]
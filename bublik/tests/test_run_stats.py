@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timedelta, timezone
+
+from django.test import SimpleTestCase
+
+from bublik.core.run.stats import RunStatsBuilder
+
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def row(
+    result_id,
+    parent_id,
+    name,
+    test_type='T',
+    offset=0,
+    result='PASSED',
+    has_error=False,
+    meets_reqs=True,
+):
+    return {
+        'id': result_id,
+        'parent_package_id': parent_id,
+        'iteration_id': result_id,
+        'exec_seqno': result_id,
+        'start': START + timedelta(seconds=offset),
+        'finish': START + timedelta(seconds=offset + 1),
+        'obtained_result': result,
+        'has_error': has_error,
+        'meets_reqs': meets_reqs,
+        'test_id': name,
+        'test_name': name,
+        'test_type': test_type,
+    }
+
+
+class RunStatsBuilderTest(SimpleTestCase):
+    def build(self, rows):
+        return RunStatsBuilder(rows, {}).build()
+
+    def test_consecutive_iterations_are_merged(self):
+        main = row(1, None, 'main', 'P', 0)
+        main['finish'] = START + timedelta(seconds=100)
+        stats = self.build(
+            [
+                main,
+                row(2, 1, 'test_a', offset=1),
+                row(3, 1, 'test_a', offset=2, result='FAILED', has_error=True),
+                row(4, 1, 'test_b', offset=3, result='SKIPPED'),
+                row(5, 1, 'test_a', offset=4, result='KILLED'),
+            ],
+        )
+
+        assert [child['test_name'] for child in stats['children']] == [
+            'test_a',
+            'test_b',
+            'test_a',
+        ]
+        assert stats['children'][0]['stats']['passed'] == 1
+        assert stats['children'][0]['stats']['failed_unexpected'] == 1
+        assert stats['stats'] == {
+            'passed': 1,
+            'failed': 0,
+            'passed_unexpected': 0,
+            'failed_unexpected': 1,
+            'skipped': 1,
+            'skipped_unexpected': 0,
+            'abnormal': 1,
+        }
+
+    def test_nodes_without_results_are_dropped(self):
+        main = row(1, None, 'main', 'P', 0)
+        main['finish'] = START + timedelta(seconds=100)
+        stats = self.build(
+            [
+                main,
+                row(2, 1, 'pkg', 'P', 1),
+                row(3, 2, 'test_a', offset=2, meets_reqs=False),
+                row(4, 1, 'test_b', offset=3),
+            ],
+        )
+
+        assert [child['test_name'] for child in stats['children']] == ['test_b']
+        assert stats['children'][0]['path'] == ['main', 'test_b']
+        assert stats['children'][0]['parent_id'] == 1
+
+    def test_empty_run(self):
+        assert self.build([]) is None
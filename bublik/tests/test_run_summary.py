@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import TestCase
+
+from bublik.core.run.compromised import mark_run_compromised
+from bublik.core.run.objects import set_run_count, set_run_status
+from bublik.core.run.stats import generate_runs_details
+from bublik.core.run.summary import get_runs_summaries, update_run_summary
+from bublik.data.models import (
+    Project,
+    RunConclusion,
+    RunStatus,
+    RunStatusByUnexpected,
+    RunSummary,
+)
+from bublik.tests.fake_generator import import_test_run
+
+
+class RunSummaryTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name='summary')
+        self.run = import_test_run(self.project, datetime(2026, 1, 1, tzinfo=timezone.utc))
+        set_run_count(self.run, 'expected_items', 4)
+        set_run_status(self.run, 'RUN_STATUS_DONE')
+
+    def test_summary(self):
+        summary = update_run_summary(self.run)
+
+        assert summary.stats == {
+            'total': 3,
+            'unexpected': 1,
+            'total_expected': 4,
+            'progress': 0.75,
+        }
+        assert (summary.passed, summary.failed, summary.skipped, summary.abnormal) == (
+            2,
+            1,
+            0,
+            0,
+        )
+        assert summary.nok_distribution == [False, True, False]
+        assert summary.status == RunStatus.DONE
+        assert (summary.status_by_nok, summary.unexpected_percent) == (
+            RunStatusByUnexpected.WARNING,
+            33,
+        )
+        assert summary.conclusion == RunConclusion.WARNING
+
+    def test_missing_summaries_are_calculated(self):
+        [run_details] = generate_runs_details([self.run])
+
+        assert list(get_runs_summaries([self.run])) == [self.run.id]
+        stats = run_details.stats
+        assert (
+            stats.tests_total,
+            stats.tests_total_nok,
+            stats.tests_total_plan_percent,
+        ) == (3, 1, 75)
+
+    def test_compromised_run(self):
+        update_run_summary(self.run)
+        with mock.patch('bublik.core.run.compromised.meta_categorization'):
+            mark_run_compromised(self.run.id, 'comment', None, None)
+
+        summary = RunSummary.objects.get(run=self.run)
+        assert summary.compromised
+        assert summary.conclusion == RunConclusion.COMPROMISED
@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from bublik.core.exceptions import RunCompromisedError, TraversalLimitError
+from bublik.core.importruns.source.run_traversal import HTTPDirectoryTraverser
+from bublik.data.models import Job
+from bublik.tests.fake_generator import serve_directory
+
+
+class HTTPDirectoryTraverserTest(TestCase):
+    FILES = (
+        'a/meta_data.json',
+        'b/c/meta_data.json',
+        'b/c/d/meta_data.json',
+        'e/trc_compromised.js',
+        'f/g/',
+    )
+
+    def setUp(self):
+        self.logs_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.logs_dir)
+        for path in self.FILES:
+            path = os.path.join(self.logs_dir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if not path.endswith('/'):
+                open(path, 'w').close()
+
+        self.url = serve_directory(self, self.logs_dir)
+        self.job = Job.objects.create(name=Job.NameChoices.IMPORTRUNS)
+
+    def find_runs(self):
+        traverser = HTTPDirectoryTraverser(self.url, self.job.id)
+        return {
+            url[len(self.url) :]: type(error) if error else None
+            for url, error in traverser.find_runs()
+        }
+
+    def test_find_runs(self):
+        assert self.find_runs() == {
+            'a/': None,
+            'b/c/': None,
+            'e/': RunCompromisedError,
+        }
+
+    @override_settings(RUNS_TRAVERSAL={'workers': 2, 'max_depth': 1})
+    def test_depth_limit(self):
+        assert self.find_runs() == {
+            'a/': None,
+            'b/c/': TraversalLimitError,
+            'e/': RunCompromisedError,
+            'f/g/': TraversalLimitError,
+        }
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+import pytest
+
+from bublik.core.importruns.telog import (
+    BZip2Log,
+    ConverterError,
+    GZipLog,
+    JSONLog,
+    StreamedIterations,
+    XZLog,
+)
+
+
+LOG = {'version': 1, 'tags': ['tag'], 'iters': [], 'plan': {'entity': 'pkg'}}
+
+
+class TELogConvertersTest(SimpleTestCase):
+    def setUp(self):
+        self.process_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.process_dir)
+
+    def write(self, filename, compress):
+        path = os.path.join(self.process_dir, filename)
+        with open(path, 'wb') as log_file:
+            log_file.write(compress(json.dumps(LOG).encode()))
+        return path
+
+    def test_decompress(self):
+        for converter, compress, extension in [
+            (GZipLog, gzip.compress, '.gz'),
+            (BZip2Log, bz2.compress, '.bz2'),
+            (XZLog, lzma.compress, '.xz'),
+        ]:
+            path = self.write(f'log.json{extension}', compress)
+            path_out = converter(path_in=path).convert().path_out
+            with open(path_out) as json_file:
+                assert json.load(json_file) == LOG
+
+    def test_load_xz_json_log_without_decompressed_file(self):
+        self.write('log.json.xz', lzma.compress)
+
+        assert JSONLog().convert_from_dir(self.process_dir) == LOG
+
+        json_log = JSONLog(streamed=True).convert_from_dir(self.process_dir)
+        assert json_log['tags'] == LOG['tags']
+        assert json_log['plan'] == LOG['plan']
+        assert isinstance(json_log['iters'], StreamedIterations)
+
+        assert not os.path.exists(os.path.join(self.process_dir, 'log.json'))
+
+    def test_corrupted_log(self):
+        self.write('log.json.xz', lambda data: data)
+
+        with pytest.raises(ConverterError):
+            JSONLog().convert_from_dir(self.process_dir)
@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from bublik.core.tree.services import TreeService
+from bublik.data.models import Project, TestIterationResult
+from bublik.tests.fake_generator import import_test_run
+
+
+class TreeServiceTest(TestCase):
+    def setUp(self):
+        project = Project.objects.create(name='tree')
+        self.run = import_test_run(project, datetime(2026, 1, 1, tzinfo=timezone.utc))
+        self.results = {
+            result.exec_seqno: result
+            for result in TestIterationResult.objects.filter(test_run=self.run)
+        }
+
+    def get_tree(self, result):
+        tree = TreeService.get_tree(result.id)['tree']
+        by_seqno = {result.id: seqno for seqno, result in self.results.items()}
+        return {
+            by_seqno[node_id]: [by_seqno[child] for child in node.get('children', [])]
+            for node_id, node in tree.items()
+        }
+
+    def test_tree(self):
+        assert self.get_tree(self.run) == {1: [2, 3, 5], 2: [], 3: [4], 5: [], 4: []}
+        assert self.get_tree(self.results[3]) == {3: [4], 4: []}
+
+        test_b = TreeService.get_tree(self.results[4].id)['tree'][self.results[4].id]
+        assert (test_b['name'], test_b['entity'], test_b['has_error']) == (
+            'test_b',
+            'test',
+            True,
+        )
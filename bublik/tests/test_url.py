@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright (C) 2026 OKTET Labs Ltd. All rights reserved.
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+from urllib3.connection import HTTPConnection
+
+from bublik.core.checks import check_run_file
+from bublik.core.url import URLSessions, fetch_url, save_url_to_dir
+from bublik.tests.fake_generator import serve_directory
+
+
+class URLTest(SimpleTestCase):
+    def setUp(self):
+        self.logs_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.logs_dir)
+        with open(os.path.join(self.logs_dir, 'log.json'), 'wb') as log_file:
+            log_file.write(os.urandom(100000))
+
+        self.url = serve_directory(self, self.logs_dir)
+
+    def test_save_url_to_dir(self):
+        save_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, save_dir)
+
+        assert save_url_to_dir(self.url, save_dir, 'log.json')
+        assert not save_url_to_dir(self.url, save_dir, 'missing.json')
+
+        source_path = os.path.join(self.logs_dir, 'log.json')
+        saved_path = os.path.join(save_dir, 'log.json')
+        with open(source_path, 'rb') as source, open(saved_path, 'rb') as saved:
+            assert source.read() == saved.read()
+        assert not os.path.exists(os.path.join(save_dir, 'missing.json'))
+
+    def test_connections_are_reused(self):
+        session = URLSessions.get()
+        assert URLSessions.get() is session
+
+        # The sockets are opened by the connections of the pools
+        new_conn = mock.patch.object(
+            HTTPConnection,
+            '_new_conn',
+            autospec=True,
+            side_effect=HTTPConnection._new_conn,
+        )
+        with new_conn as new_conn_mock:
+            assert check_run_file('log.json', self.url)
+            assert fetch_url(self.url)
+            # The server closes the connection after an error
+            assert not check_run_file('missing.json', self.url)
+
+        new_conn_mock.assert_called_once()
@@ -62,6 +62,7 @@ urlpatterns = [
         api_v2.clear_all_runs_stats_cache,
         name='clear_all_runs_stats_cache',
     ),
+    path('warm_up_runs_cache/', api_v2.warm_up_runs_cache, name='warm_up_runs_cache'),
     re_path(
         r'importlog/(?:(?P<task_id>[a-fA-F-\d]{36})?)$',
         cache_page(60 * 20)(api_v2.local_logs),